@@ -0,0 +1,1010 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Almacenamiento de Datos.
+
+Motor único de persistencia para citas, médicos y pacientes. Cada entidad
+se describe con un esquema (sus campos, la tabla e índices de SQLite y, si
+admite partición por mes, el campo de fecha) y los gestor_datos de cada
+entidad ligan estas funciones a su esquema. La lectura con caché, los
+índices, las escrituras atómicas, los anexos, los bloqueos entre procesos
+y los drivers de cada formato (CSV, JSON, JSON-lines, SQLite y carpeta
+particionada por mes) están implementados una sola vez aquí.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import contextlib
+import csv
+import functools
+import itertools
+import json
+import os
+import re
+import threading
+from collections.abc import Container
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from Controlador import (
+    bloqueo,
+    cache_datos,
+    compactos,
+    escritura,
+    gestor_sqlite,
+    lectura,
+    particiones,
+    secuencia,
+)
+
+Esquema = Dict[str, Any]
+
+# Estructuras derivadas del almacenamiento particionado por mes:
+# (carpeta, nombre) → (firma de los segmentos, estructura, actualizador,
+# retirador).
+_derivados_particionados: Dict[Tuple[str, Any], Tuple[Any, Any, Any, Any]] = {}
+_candado_derivados = threading.Lock()
+
+# Línea del parámetro esquema en la documentación de las funciones del motor.
+_ARG_ESQUEMA = re.compile(r'^[ \t]*esquema \(Esquema\):.*\n', re.MULTILINE)
+
+
+def esquema(
+    nombre: str,
+    campos: Sequence[str],
+    tabla: str,
+    indices_sqlite: Sequence[Tuple[str, ...]],
+    campo_particion: Optional[str] = None
+    ) -> Esquema:
+    """
+        Describe una entidad para el motor de almacenamiento.
+        Args:
+            nombre (str): Nombre de la entidad (ej. 'Cita'); también es el
+            nombre de su tipo compacto en memoria.
+            campos (Sequence[str]): Orden de las columnas en los archivos.
+            tabla (str): Tabla usada cuando el almacenamiento es SQLite (.db).
+            indices_sqlite (Sequence[Tuple[str, ...]]): Índices de esa tabla.
+            campo_particion (Optional[str]): Campo de fecha por el que se
+            reparten los registros en el almacenamiento por mes; None si la
+            entidad no admite partición.
+        Returns:
+            Esquema: El esquema de la entidad.
+    """
+    return {
+        'nombre': nombre,
+        'campos': list(campos),
+        'tabla': tabla,
+        'indices_sqlite': list(indices_sqlite),
+        'campo_particion': campo_particion,
+        'tipo': compactos.tipo(nombre, campos),
+        }
+
+
+def ligar(esquema: Esquema, funcion: Callable[..., Any]) -> Callable[..., Any]:
+    """
+        Función del motor con el esquema ya fijado, para exponerla desde el
+        gestor_datos de la entidad (conserva nombre y documentación).
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            funcion (Callable): Función de este módulo.
+        Returns:
+            Callable: La función sin el parámetro esquema.
+    """
+    @functools.wraps(funcion)
+    def ligada(*args, **kwargs):
+        return funcion(esquema, *args, **kwargs)
+    if funcion.__doc__:
+        ligada.__doc__ = _ARG_ESQUEMA.sub('', funcion.__doc__)
+    return ligada
+
+
+class ArchivoDanado(ValueError):
+    """El archivo de datos no se puede interpretar (ej. JSON cortado)."""
+
+
+def leer(filepath: Any) -> List[Dict[str, Any]]:
+    """
+        Lee un archivo CSV, JSON o JSON-lines de cualquier entidad usando la
+        caché, sin crearlo si no existe (para las vistas que solo consultan).
+        Args:
+            filepath (Any): Ruta al archivo.
+        Returns:
+            List[Dict[str, Any]]: Copia de los registros; lista vacía si el
+            archivo no existe, está dañado o el formato no es de archivo plano.
+    """
+    filepath = os.fspath(filepath)
+    if not os.path.isfile(filepath) or not filepath.endswith(('.csv', '.json', '.jsonl')):
+        return []
+    try:
+        return cache_datos.obtener(filepath, _leer_archivo)
+    except ArchivoDanado:
+        # Solo consulta: no se escribe nada a partir de esta lista.
+        return []
+
+
+def leer_indice(filepath: Any, campo: str = 'documento') -> Dict[str, List[Dict[str, Any]]]:
+    """
+        Índice por campo de un archivo CSV, JSON o JSON-lines de cualquier
+        entidad, sin crearlo si no existe (la versión de solo consulta de
+        indice, para quien no tiene un esquema a mano).
+        Args:
+            filepath (Any): Ruta al archivo.
+            campo (str): Campo por el que se indexa.
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: valor → registros (solo lectura);
+            vacío si el archivo no existe, está dañado o no es de archivo plano.
+    """
+    filepath = os.fspath(filepath)
+    if not os.path.isfile(filepath) or not filepath.endswith(('.csv', '.json', '.jsonl')):
+        return {}
+    try:
+        return cache_datos.indice(filepath, campo, _leer_archivo)
+    except ArchivoDanado:
+        return {}
+
+
+def _particionado(esquema: Esquema, filepath: str) -> bool:
+    return esquema['campo_particion'] is not None and particiones.es_particionado(filepath)
+
+
+def inicializar_archivo(esquema: Esquema, filepath: str) -> None:
+    """
+        Verifica si un archivo de datos existe. Si no, lo crea con las cabeceras.
+        Esta función es clave para evitar errores en la primera ejecución del programa.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta completa al archivo de datos (e.g., 'data/citas.csv').
+        Returns:
+            None
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        gestor_sqlite.inicializar(
+            filepath, esquema['tabla'], esquema['campos'], esquema['indices_sqlite']
+            )
+        return
+    if _particionado(esquema, filepath):
+        particiones.inicializar(filepath)
+        return
+
+    directorio = os.path.dirname(filepath)
+    if directorio and not os.path.exists(directorio):
+        os.makedirs(directorio)
+
+    if not os.path.exists(filepath):
+        # Otro proceso puede estar creándolo a la vez: se vuelve a
+        # comprobar con el bloqueo tomado para no pisar sus datos.
+        with bloqueo.exclusivo(filepath):
+            if os.path.exists(filepath):
+                return
+            if filepath.endswith('.csv'):
+                escritura.guardar_csv(filepath, esquema['campos'], [])
+            elif filepath.endswith('.json'):
+                escritura.guardar_json(filepath, [], indent=None)
+            elif filepath.endswith('.jsonl'):
+                escritura.guardar_jsonl(filepath, [])
+
+
+def cargar_datos(esquema: Esquema, filepath: str) -> List[Dict[str, Any]]:
+    """
+        Carga los datos desde un archivo (CSV, JSON o JSON-lines)
+        y los retorna como una lista de diccionarios.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+        Returns:
+            List[Dict[str, Any]]: Una lista de diccionarios con los
+            datos de la entidad.
+    """
+    inicializar_archivo(esquema, filepath)
+    if gestor_sqlite.es_sqlite(filepath):
+        return gestor_sqlite.cargar(filepath, esquema['tabla'], esquema['campos'])
+    if _particionado(esquema, filepath):
+        return [
+            registro
+            for mes, segmento, archivado in _segmentos(filepath)
+            for registro in _registros_mes(esquema, filepath, mes, segmento, archivado)
+            ]
+    return cache_datos.obtener(filepath, _leer_archivo)
+
+
+def cargar_mes(esquema: Esquema, filepath: str, año: int, mes: int) -> List[Dict[str, Any]]:
+    """
+        Carga solo los registros de un mes. En el almacenamiento particionado
+        se lee únicamente el segmento de ese mes; en los demás formatos se
+        recorre el archivo filtrando por el campo de partición.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo (o carpeta) de datos.
+            año (int): Año buscado.
+            mes (int): Mes buscado (1-12).
+        Returns:
+            List[Dict[str, Any]]: Los registros del mes, en orden del archivo.
+    """
+    clave = f"{año:04d}-{mes:02d}"
+    if _particionado(esquema, filepath):
+        inicializar_archivo(esquema, filepath)
+        return [
+            registro
+            for mes_segmento, segmento, archivado in _segmentos(filepath, clave, clave)
+            for registro in _registros_mes(esquema, filepath, mes_segmento, segmento, archivado)
+            ]
+    campo = esquema['campo_particion']
+    return list(iterar_datos(
+        esquema, filepath,
+        predicado=lambda registro: particiones.mes_de_fecha(registro.get(campo)) == clave
+        ))
+
+
+def iterar_datos(
+    esquema: Esquema,
+    filepath: str,
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Callable[[Dict[str, Any]], bool]] = None
+    ) -> Iterator[Dict[str, Any]]:
+    """
+        Recorre los registros de a uno sin cargar el archivo completo en
+        memoria (si ya está en caché, se recorre la caché). Los filtros se
+        aplican durante la lectura; en SQLite se resuelven con la consulta.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto.
+            predicado (Optional[Callable]): Condición adicional por registro.
+        Returns:
+            Iterator[Dict[str, Any]]: Los registros que cumplen, en orden.
+    """
+    inicializar_archivo(esquema, filepath)
+    if gestor_sqlite.es_sqlite(filepath):
+        registros = gestor_sqlite.iterar(filepath, esquema['tabla'], esquema['campos'], filtros)
+        return lectura.filtrar(registros, predicado=predicado)
+    if _particionado(esquema, filepath):
+        # Con un filtro por fecha solo se recorre el segmento de ese mes.
+        mes = _mes_filtrado(esquema, filtros)
+        return itertools.chain.from_iterable(
+            iterar_datos(esquema, segmento, filtros, predicado) if not archivado
+            else lectura.filtrar(
+                iter(particiones.leer_archivado(filepath, mes_segmento)), filtros, predicado
+                )
+            for mes_segmento, segmento, archivado in _segmentos(filepath, mes, mes)
+            )
+    en_cache = cache_datos.vigentes(filepath)
+    if en_cache is not None:
+        return (
+            compactos.a_dict(registro)
+            for registro in lectura.filtrar(iter(en_cache), filtros, predicado)
+            )
+    return lectura.iterar(filepath, filtros, predicado)
+
+
+def _leer_archivo(filepath: str) -> List[Dict[str, Any]]:
+    """
+        Lee y parsea el archivo completo (sin caché). Un JSON vacío es un
+        archivo sin registros; uno dañado no se toma como vacío, porque la
+        próxima escritura lo reemplazaría y se perderían los datos.
+        Args:
+            filepath (str): La ruta al archivo de datos.
+        Returns:
+            List[Dict[str, Any]]: Registros del archivo.
+        Raises:
+            ArchivoDanado: Si el JSON no se puede interpretar como un arreglo.
+    """
+    try:
+        # Bloqueo compartido: no se lee mientras otro proceso anexa.
+        with bloqueo.compartido(filepath):
+            if filepath.endswith('.csv'):
+                with open(filepath, mode='r', newline='', encoding='utf-8') as csv_file:
+                    lector = csv.DictReader(csv_file)
+                    return list(lector)
+            elif filepath.endswith('.json'):
+                with open(filepath, mode='r', encoding='utf-8') as json_file:
+                    contenido = json_file.read()
+                if not contenido.strip():
+                    return []
+                datos = json.loads(contenido)
+                if not isinstance(datos, list):
+                    raise ArchivoDanado(f"{filepath} no contiene un arreglo de registros.")
+                return datos
+            elif filepath.endswith('.jsonl'):
+                return list(lectura.iterar_jsonl(filepath))
+    except FileNotFoundError:
+        return []
+    except json.JSONDecodeError as error:
+        raise ArchivoDanado(f"{filepath} está dañado: {error}") from error
+    return []
+
+
+def guardar_datos(
+    esquema: Esquema,
+    filepath: str,
+    datos: List[Dict[str, Any]],
+    version_esperada: Optional[cache_datos.Firma] = None
+    ) -> None:
+    """
+        Guarda una lista de diccionarios en un archivo (CSV, JSON o JSON-lines),
+        sobrescribiendo el contenido.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo donde se guardarán los datos.
+            datos (List[Dict[str, Any]]): La lista de registros a guardar.
+            version_esperada (Optional[Firma]): Versión del archivo con la
+            que se leyeron los datos (bloqueo.version). Si se indica y el
+            archivo cambió desde entonces, no se escribe. En SQLite y en el
+            almacenamiento particionado se ignora.
+        Returns:
+            None
+        Raises:
+            bloqueo.VersionObsoleta: Si otro proceso escribió antes.
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        inicializar_archivo(esquema, filepath)
+        with bloqueo.exclusivo(filepath):
+            gestor_sqlite.guardar(filepath, esquema['tabla'], esquema['campos'], datos)
+        return
+    if _particionado(esquema, filepath):
+        _guardar_particionado(esquema, filepath, datos)
+        return
+    with bloqueo.exclusivo(filepath):
+        if version_esperada is not None:
+            bloqueo.verificar_version(filepath, version_esperada)
+        _escribir(esquema, filepath, datos)
+        cache_datos.invalidar(filepath)
+
+
+def _escribir(esquema: Esquema, filepath: str, datos: List[Dict[str, Any]]) -> None:
+    # Escritura atómica: ante una interrupción queda el archivo anterior.
+    if filepath.endswith('.csv'):
+        escritura.guardar_csv(filepath, esquema['campos'], datos)
+    elif filepath.endswith('.json'):
+        escritura.guardar_json(filepath, datos)
+    elif filepath.endswith('.jsonl'):
+        escritura.guardar_jsonl(filepath, datos)
+
+
+def _reescribir_registro(
+    esquema: Esquema,
+    filepath: str,
+    datos: List[Dict[str, Any]],
+    version: Optional[cache_datos.Firma],
+    posicion: int,
+    *,
+    nuevo: Optional[Dict[str, Any]]
+    ) -> None:
+    # Reescribe el archivo con un solo registro cambiado (o eliminado, si
+    # nuevo es None). La caché se ajusta en lugar de invalidarse, así las
+    # estructuras derivadas que saben retirar un registro no se reconstruyen.
+    with bloqueo.exclusivo(filepath):
+        if version is not None:
+            bloqueo.verificar_version(filepath, version)
+        _escribir(esquema, filepath, datos)
+        if nuevo is not None:
+            nuevo = _como_se_lee(esquema, filepath, nuevo)
+        cache_datos.registrar_cambio(filepath, version, posicion, nuevo)
+
+
+def _como_se_lee(esquema: Esquema, filepath: str, registro: Dict[str, Any]) -> Dict[str, Any]:
+    # El registro tal como se leerá luego del archivo (en CSV, todo texto).
+    if filepath.endswith('.csv'):
+        return escritura.fila_csv(esquema['campos'], registro)
+    return json.loads(json.dumps(registro))
+
+
+def agregar_registro(esquema: Esquema, filepath: str, registro: Dict[str, Any]) -> None:
+    """
+        Agrega un único registro al final del archivo (modo solo-anexar),
+        sin leer ni reescribir los registros existentes.
+        En CSV se escribe una fila nueva; en JSON se inserta el elemento
+        antes del ']' de cierre; en JSON-lines se escribe una línea. En ambos casos se hace fsync.
+        En SQLite es un INSERT de una fila. Se hace con bloqueo exclusivo.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            registro (Dict[str, Any]): El registro a agregar.
+        Returns:
+            None
+    """
+    inicializar_archivo(esquema, filepath)
+    if _particionado(esquema, filepath):
+        # Se anexa al segmento del mes del registro (se crea si es nuevo).
+        with bloqueo.exclusivo(filepath):
+            firma_anterior = _firma_particion(filepath)
+            segmento = particiones.registrar_mes(
+                filepath, particiones.mes_de_fecha(registro.get(esquema['campo_particion']))
+                )
+            agregar_registro(esquema, segmento, registro)
+            _actualizar_derivados(filepath, firma_anterior, None, _como_se_lee(esquema, segmento, registro))
+        return
+    with bloqueo.exclusivo(filepath):
+        if gestor_sqlite.es_sqlite(filepath):
+            gestor_sqlite.insertar(filepath, esquema['tabla'], esquema['campos'], registro)
+            return
+        firma_anterior = cache_datos.firma_archivo(filepath)
+        desplazamiento = None
+
+        if filepath.endswith('.csv'):
+            registro = escritura.anexar_csv(filepath, esquema['campos'], registro)
+        elif filepath.endswith('.jsonl'):
+            desplazamiento = escritura.anexar_jsonl(filepath, registro)
+        elif filepath.endswith('.json'):
+            try:
+                anexado = escritura.anexar_json(filepath, registro)
+            except ValueError as error:
+                raise ArchivoDanado(str(error)) from error
+            if not anexado:
+                # Archivo vacío: se escribe el arreglo con el registro. Si
+                # está dañado no se toca (se reescribiría sin sus datos).
+                guardar_datos(esquema, filepath, [registro])
+                return
+        cache_datos.registrar_anexo(filepath, registro, firma_anterior, desplazamiento)
+
+
+def agregar_registros(esquema: Esquema, filepath: str, registros: List[Dict[str, Any]]) -> int:
+    """
+        Agrega varios registros al final del archivo como una sola escritura
+        (ej. importaciones masivas): el archivo se reescribe una vez, de forma
+        atómica, en lugar de anexar y sincronizar registro por registro; si
+        algo falla no queda ninguno. En SQLite se insertan en una sola
+        transacción y en el almacenamiento particionado se reescriben solo los
+        segmentos de los meses que reciben registros.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            registros (List[Dict[str, Any]]): Los registros a agregar.
+        Returns:
+            int: Cantidad de registros agregados.
+    """
+    if not registros:
+        return 0
+    inicializar_archivo(esquema, filepath)
+    with bloqueo.exclusivo(filepath):
+        if gestor_sqlite.es_sqlite(filepath):
+            gestor_sqlite.insertar_varios(filepath, esquema['tabla'], esquema['campos'], registros)
+        else:
+            guardar_datos(esquema, filepath, cargar_datos(esquema, filepath) + list(registros))
+    return len(registros)
+
+
+def indice(esquema: Esquema, filepath: str, campo: str = 'documento') -> Dict[str, List[Dict[str, Any]]]:
+    """
+        Índice en memoria de los registros por un campo (documento, id, ...).
+        Se construye una vez por lectura del archivo y se mantiene al anexar.
+        En SQLite se arma con una lectura completa de la tabla; para buscar
+        un valor conviene usar buscar_registro, que consulta el índice SQL.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo por el que se indexa.
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: valor → registros (solo lectura).
+    """
+    inicializar_archivo(esquema, filepath)
+    if gestor_sqlite.es_sqlite(filepath) or _particionado(esquema, filepath):
+        estructura: Dict[str, List[Dict[str, Any]]] = {}
+        for registro in cargar_datos(esquema, filepath):
+            clave = str(registro.get(campo) or '').strip()
+            estructura.setdefault(clave, []).append(registro)
+        return estructura
+    return cache_datos.indice(filepath, campo, _leer_archivo)
+
+
+def buscar_registro(esquema: Esquema, filepath: str, campo: str, valor: Any) -> Optional[Dict[str, Any]]:
+    """
+        Busca el primer registro cuyo campo tenga el valor dado, en tiempo
+        constante usando el índice.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo a comparar (ej. 'documento' o 'id').
+            valor (Any): Valor buscado.
+        Returns:
+            Optional[Dict[str, Any]]: Copia del registro o None si no existe.
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        inicializar_archivo(esquema, filepath)
+        encontrados = gestor_sqlite.buscar(filepath, esquema['tabla'], esquema['campos'], {campo: valor}, 1)
+        return encontrados[0] if encontrados else None
+    if _particionado(esquema, filepath):
+        # Se consulta el índice de cada segmento, mes por mes.
+        inicializar_archivo(esquema, filepath)
+        for mes, segmento, archivado in _segmentos(filepath):
+            if archivado:
+                encontrado = next(lectura.filtrar(
+                    iter(particiones.leer_archivado(filepath, mes)), {campo: valor}
+                    ), None)
+            else:
+                encontrado = buscar_registro(esquema, segmento, campo, valor)
+            if encontrado is not None:
+                return encontrado
+        return None
+    if _usar_desplazamientos(filepath):
+        inicializar_archivo(esquema, filepath)
+        with bloqueo.compartido(filepath):
+            posiciones = _posiciones_jsonl(filepath, campo, valor)
+            return lectura.leer_linea(filepath, posiciones[0]) if posiciones else None
+    coincidencias = indice(esquema, filepath, campo).get(str(valor).strip())
+    return compactos.a_dict(coincidencias[0]) if coincidencias else None
+
+
+def _usar_desplazamientos(filepath: str) -> bool:
+    # En JSON-lines, si el archivo no está en caché, se busca con el índice
+    # de posiciones y se lee solo la línea, sin parsear el archivo completo.
+    return filepath.endswith('.jsonl') and cache_datos.vigentes(filepath) is None
+
+
+def _posiciones_jsonl(filepath: str, campo: str, valor: Any) -> List[int]:
+    posiciones = cache_datos.indice_desplazamientos(
+        filepath, campo, lectura.iterar_posiciones_jsonl
+        )
+    return posiciones.get(str(valor).strip(), [])
+
+
+def derivado(
+    esquema: Esquema,
+    filepath: str,
+    nombre: Any,
+    constructor: Callable[[List[Dict[str, Any]]], Any],
+    actualizador: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+    *,
+    retirador: Optional[Callable[[Any, Dict[str, Any]], None]] = None
+    ) -> Any:
+    """
+        Estructura calculada a partir de todos los registros (ej. mapas de
+        ocupación), construida una vez por lectura del archivo y mantenida
+        con el actualizador al anexar. Con retirador también se mantiene al
+        actualizar o eliminar un registro (se retira la versión anterior y se
+        agrega la nueva). En SQLite se construye en cada llamada.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            nombre (Any): Identificador de la estructura.
+            constructor (Callable): Recibe la lista de registros y la construye.
+            actualizador (Optional[Callable]): Recibe (estructura, registro)
+            cuando se anexa un registro.
+            retirador (Optional[Callable]): Recibe (estructura, registro)
+            cuando un registro se modifica o se elimina.
+        Returns:
+            Any: La estructura derivada (solo lectura).
+    """
+    inicializar_archivo(esquema, filepath)
+    if gestor_sqlite.es_sqlite(filepath):
+        return constructor(gestor_sqlite.cargar(filepath, esquema['tabla'], esquema['campos']))
+    if _particionado(esquema, filepath):
+        return _derivado_particionado(
+            esquema, filepath, nombre, constructor, actualizador, retirador=retirador
+            )
+    return cache_datos.derivado(
+        filepath, nombre, constructor, _leer_archivo, actualizador, retirador=retirador
+        )
+
+
+def buscar_registros(esquema: Esquema, filepath: str, filtros: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+        Registros cuyos campos coinciden con todos los filtros, usando un
+        índice compuesto por esos campos (ej. documento_medico, fecha, hora).
+        El índice se construye una vez por lectura del archivo y se mantiene
+        al anexar; en SQLite la consulta usa los índices de la tabla.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            filtros (Dict[str, Any]): campo → valor buscado.
+        Returns:
+            List[Dict[str, Any]]: Copias de los registros, en orden del archivo.
+    """
+    inicializar_archivo(esquema, filepath)
+    if gestor_sqlite.es_sqlite(filepath):
+        return gestor_sqlite.buscar(filepath, esquema['tabla'], esquema['campos'], filtros)
+    if _particionado(esquema, filepath):
+        # Con un filtro por fecha solo se consulta el segmento de ese mes.
+        mes = _mes_filtrado(esquema, filtros)
+        encontrados: List[Dict[str, Any]] = []
+        for mes_segmento, segmento, archivado in _segmentos(filepath, mes, mes):
+            if archivado:
+                encontrados.extend(lectura.filtrar(
+                    iter(particiones.leer_archivado(filepath, mes_segmento)), filtros
+                    ))
+            else:
+                encontrados.extend(buscar_registros(esquema, segmento, filtros))
+        return encontrados
+    campos = tuple(filtros)
+    clave = tuple(str(valor).strip() for valor in filtros.values())
+    coincidencias = cache_datos.indice(filepath, campos, _leer_archivo).get(clave, [])
+    return [compactos.a_dict(registro) for registro in coincidencias]
+
+
+def bloqueo_escritura(filepath: str) -> contextlib.AbstractContextManager:
+    """
+        Bloqueo exclusivo del archivo para validar y escribir como una sola
+        operación (ej. comprobar duplicados, generar el id y anexar) sin que
+        otra terminal escriba en medio.
+        Args:
+            filepath (str): La ruta al archivo de datos.
+        Returns:
+            contextlib.AbstractContextManager: Contexto del bloqueo.
+    """
+    return bloqueo.exclusivo(filepath)
+
+
+def siguiente_id(esquema: Esquema, filepath: str) -> int:
+    """
+        Asigna el próximo id del archivo sin recorrer sus registros, usando
+        la secuencia persistente guardada junto al archivo.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+        Returns:
+            int: El id asignado.
+    """
+    return reservar_ids(esquema, filepath, 1)[0]
+
+
+def reservar_ids(esquema: Esquema, filepath: str, cantidad: int) -> range:
+    """
+        Reserva un bloque de ids consecutivos (ej. para importaciones).
+        Si la secuencia no existe, se reconstruye desde el mayor id actual.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            cantidad (int): Cantidad de ids a reservar.
+        Returns:
+            range: Los ids reservados.
+    """
+    inicializar_archivo(esquema, filepath)
+    return secuencia.reservar(
+        filepath, lambda: secuencia.maximo_id(cargar_datos(esquema, filepath)), cantidad
+        )
+
+
+def existe_valor(esquema: Esquema, filepath: str, campo: str, valor: Any) -> bool:
+    """
+        Indica si algún registro tiene el valor dado en el campo.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo a comparar.
+            valor (Any): Valor buscado.
+        Returns:
+            bool: True si existe al menos un registro con ese valor.
+    """
+    if gestor_sqlite.es_sqlite(filepath) or _particionado(esquema, filepath):
+        return buscar_registro(esquema, filepath, campo, valor) is not None
+    if _usar_desplazamientos(filepath):
+        inicializar_archivo(esquema, filepath)
+        with bloqueo.compartido(filepath):
+            return bool(_posiciones_jsonl(filepath, campo, valor))
+    return str(valor).strip() in indice(esquema, filepath, campo)
+
+
+class Valores(Container):
+    """
+        Conjunto de solo lectura de los valores de un campo en un archivo
+        (ej. los documentos registrados). No copia nada: cada consulta con
+        'in' usa existe_valor, así siempre refleja el archivo actual (la
+        caché se invalida cuando otro proceso lo modifica) y cuesta tiempo
+        constante en todos los formatos.
+    """
+
+    __slots__ = ('_esquema', '_filepath', '_campo')
+
+    def __init__(self, esquema: Esquema, filepath: str, campo: str) -> None:
+        self._esquema = esquema
+        self._filepath = filepath
+        self._campo = campo
+
+    def __contains__(self, valor: object) -> bool:
+        return existe_valor(self._esquema, self._filepath, self._campo, valor)
+
+    def __repr__(self) -> str:
+        return f"Valores({self._esquema['nombre']}, {self._filepath!r}, {self._campo!r})"
+
+
+def valores(esquema: Esquema, filepath: str, campo: str = 'documento') -> Valores:
+    """
+        Vista de los valores de un campo para comprobar pertenencia (ej. si
+        una cédula ya está registrada) sin leer el archivo en cada consulta.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo consultado.
+        Returns:
+            Valores: Admite 'valor in vista'.
+    """
+    return Valores(esquema, filepath, campo)
+
+
+def actualizar_registro(
+    esquema: Esquema,
+    filepath: str, campo: str, valor: Any, cambios: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+    """
+        Actualiza el primer registro cuyo campo tenga el valor dado.
+        En SQLite se modifica solo esa fila; en CSV y JSON se reescribe
+        el archivo, reintentando si otro proceso lo modificó entretanto.
+        En el almacenamiento particionado se reescribe solo el segmento del
+        mes (si cambia la fecha a otro mes, el registro se mueve de segmento).
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo que identifica el registro (ej. 'documento').
+            valor (Any): Valor del campo en el registro buscado.
+            cambios (Dict[str, Any]): Campos a modificar con su nuevo valor.
+        Returns:
+            Optional[Dict[str, Any]]: El registro actualizado o None si no existe.
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        inicializar_archivo(esquema, filepath)
+        return gestor_sqlite.actualizar(filepath, esquema['tabla'], esquema['campos'], {campo: valor}, cambios)
+    if _particionado(esquema, filepath):
+        return _actualizar_particionado(esquema, filepath, campo, valor, cambios)
+
+    buscado = str(valor).strip()
+
+    def intento():
+        version = bloqueo.version(filepath)
+        datos = cargar_datos(esquema, filepath)
+        for posicion, registro in enumerate(datos):
+            if str(registro.get(campo) or '').strip() == buscado:
+                registro.update(cambios)
+                _reescribir_registro(esquema, filepath, datos, version, posicion, nuevo=registro)
+                return registro
+        return None
+
+    return bloqueo.reintentar(filepath, intento)
+
+
+def eliminar_registro(esquema: Esquema, filepath: str, campo: str, valor: Any) -> bool:
+    """
+        Elimina el primer registro cuyo campo tenga el valor dado.
+        En SQLite se borra solo esa fila; en CSV y JSON se reescribe
+        el archivo, reintentando si otro proceso lo modificó entretanto.
+        En el almacenamiento particionado se reescribe solo el segmento del mes.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+            campo (str): Campo que identifica el registro (ej. 'documento').
+            valor (Any): Valor del campo en el registro buscado.
+        Returns:
+            bool: True si se eliminó un registro.
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        inicializar_archivo(esquema, filepath)
+        return gestor_sqlite.eliminar(filepath, esquema['tabla'], {campo: valor})
+    if _particionado(esquema, filepath):
+        return _eliminar_particionado(esquema, filepath, campo, valor)
+
+    buscado = str(valor).strip()
+
+    def intento():
+        version = bloqueo.version(filepath)
+        datos = cargar_datos(esquema, filepath)
+        for posicion, registro in enumerate(datos):
+            if str(registro.get(campo) or '').strip() == buscado:
+                del datos[posicion]
+                _reescribir_registro(esquema, filepath, datos, version, posicion, nuevo=None)
+                return True
+        return False
+
+    return bloqueo.reintentar(filepath, intento)
+
+
+def compactar_datos(esquema: Esquema, filepath: str) -> int:
+    """
+        Compacta el archivo de datos generando una instantánea nueva.
+        Si un mismo id aparece varias veces (por anexos repetidos), se
+        conserva solo su última versión, en la posición de la primera.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            filepath (str): La ruta al archivo de datos.
+        Returns:
+            int: Cantidad de registros descartados durante la compactación.
+    """
+    if gestor_sqlite.es_sqlite(filepath):
+        # En SQLite no hay versiones anexadas: solo se recupera espacio.
+        inicializar_archivo(esquema, filepath)
+        gestor_sqlite.compactar(filepath)
+        return 0
+    if _particionado(esquema, filepath):
+        # Se compacta cada segmento; los meses archivados no se tocan.
+        inicializar_archivo(esquema, filepath)
+        with bloqueo.exclusivo(filepath):
+            return sum(
+                compactar_datos(esquema, segmento)
+                for _, segmento, archivado in _segmentos(filepath) if not archivado
+                )
+    with bloqueo.exclusivo(filepath):
+        datos = cargar_datos(esquema, filepath)
+        vigentes: Dict[Any, Dict[str, Any]] = {}
+        for posicion, registro in enumerate(datos):
+            id_registro = str(registro.get('id', '')).strip()
+            # Los registros sin id no se pueden fusionar: se conservan todos.
+            vigentes[id_registro or ('sin_id', posicion)] = registro
+        guardar_datos(esquema, filepath, list(vigentes.values()))
+    return len(datos) - len(vigentes)
+
+
+def particionar(esquema: Esquema, origen: str, destino: str, formato: Optional[str] = None) -> int:
+    """
+        Migra los registros de un archivo (CSV, JSON, JSON-lines o SQLite) a un
+        almacenamiento particionado por mes. El archivo de origen no se modifica.
+        Args:
+            esquema (Esquema): Esquema de la entidad.
+            origen (str): Ruta del archivo actual.
+            destino (str): Carpeta del almacenamiento particionado.
+            formato (Optional[str]): Formato de los segmentos (csv, json o
+            jsonl; por defecto jsonl).
+        Returns:
+            int: Cantidad de registros migrados.
+    """
+    datos = cargar_datos(esquema, origen)
+    particiones.inicializar(destino, formato)
+    guardar_datos(esquema, destino, datos)
+    return len(datos)
+
+
+# ---------------------------------
+# Almacenamiento particionado por mes
+# ---------------------------------
+def _segmentos(
+    filepath: str, desde: Optional[str] = None, hasta: Optional[str] = None
+    ) -> List[Tuple[str, str, bool]]:
+    # (mes, ruta del segmento, archivado) de los meses del manifiesto.
+    manifiesto = particiones.leer_manifiesto(filepath)
+    return [
+        (mes, particiones.ruta_segmento(filepath, mes, manifiesto['formato']),
+         bool(datos_mes.get('archivado')))
+        for mes, datos_mes in sorted(manifiesto['meses'].items())
+        if (desde is None or mes >= desde) and (hasta is None or mes <= hasta)
+        ]
+
+
+def _registros_mes(
+    esquema: Esquema,
+    filepath: str, mes: str, segmento: str, archivado: bool
+    ) -> List[Dict[str, Any]]:
+    if archivado:
+        return particiones.leer_archivado(filepath, mes)
+    return cargar_datos(esquema, segmento)
+
+
+def _mes_filtrado(esquema: Esquema, filtros: Optional[Dict[str, Any]]) -> Optional[str]:
+    # Mes al que se limita una consulta con filtro por fecha (None: todos).
+    campo = esquema['campo_particion']
+    if not filtros or campo not in filtros:
+        return None
+    return particiones.mes_de_fecha(filtros[campo])
+
+
+def _guardar_mes(esquema: Esquema, filepath: str, mes: str, registros: List[Dict[str, Any]]) -> None:
+    # Reescribe el segmento de un mes; si queda vacío, se quita el mes.
+    if registros:
+        guardar_datos(esquema, particiones.registrar_mes(filepath, mes), registros)
+    else:
+        particiones.quitar_mes(filepath, mes)
+
+
+def _guardar_particionado(esquema: Esquema, filepath: str, datos: List[Dict[str, Any]]) -> None:
+    # Reparte los registros por mes y reescribe solo los segmentos que cambiaron
+    # (los meses archivados sin cambios siguen comprimidos).
+    inicializar_archivo(esquema, filepath)
+    por_mes: Dict[str, List[Dict[str, Any]]] = {}
+    for registro in datos:
+        por_mes.setdefault(particiones.mes_de_fecha(registro.get(esquema['campo_particion'])), []).append(registro)
+    with bloqueo.exclusivo(filepath):
+        for mes, segmento, archivado in _segmentos(filepath):
+            registros = por_mes.pop(mes, [])
+            if registros != _registros_mes(esquema, filepath, mes, segmento, archivado):
+                _guardar_mes(esquema, filepath, mes, registros)
+        for mes, registros in por_mes.items():
+            _guardar_mes(esquema, filepath, mes, registros)
+
+
+def _ubicar(
+    esquema: Esquema,
+    filepath: str, campo: str, valor: Any
+    ) -> Optional[Tuple[str, List[Dict[str, Any]], int]]:
+    # (mes, registros del mes, posición) del primer registro con ese valor.
+    buscado = str(valor).strip()
+    for mes, segmento, archivado in _segmentos(filepath):
+        registros = _registros_mes(esquema, filepath, mes, segmento, archivado)
+        for posicion, registro in enumerate(registros):
+            if lectura.valor_campo(registro, campo) == buscado:
+                return mes, registros, posicion
+    return None
+
+
+def _actualizar_particionado(
+    esquema: Esquema,
+    filepath: str, campo: str, valor: Any, cambios: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+    inicializar_archivo(esquema, filepath)
+    with bloqueo.exclusivo(filepath):
+        firma_anterior = _firma_particion(filepath)
+        ubicacion = _ubicar(esquema, filepath, campo, valor)
+        if ubicacion is None:
+            return None
+        mes, registros, posicion = ubicacion
+        registro = registros[posicion]
+        anterior = dict(registro)
+        registro.update(cambios)
+        nuevo_mes = particiones.mes_de_fecha(registro.get(esquema['campo_particion']))
+        if nuevo_mes == mes:
+            _guardar_mes(esquema, filepath, mes, registros)
+        else:
+            # La fecha pasó a otro mes: se mueve el registro de segmento.
+            del registros[posicion]
+            _guardar_mes(esquema, filepath, mes, registros)
+        segmento = particiones.registrar_mes(filepath, nuevo_mes)
+        if nuevo_mes != mes:
+            agregar_registro(esquema, segmento, registro)
+        _actualizar_derivados(
+            filepath, firma_anterior, anterior, _como_se_lee(esquema, segmento, registro)
+            )
+        return registro
+
+
+def _eliminar_particionado(esquema: Esquema, filepath: str, campo: str, valor: Any) -> bool:
+    inicializar_archivo(esquema, filepath)
+    with bloqueo.exclusivo(filepath):
+        firma_anterior = _firma_particion(filepath)
+        ubicacion = _ubicar(esquema, filepath, campo, valor)
+        if ubicacion is None:
+            return False
+        mes, registros, posicion = ubicacion
+        anterior = registros.pop(posicion)
+        _guardar_mes(esquema, filepath, mes, registros)
+        _actualizar_derivados(filepath, firma_anterior, anterior, None)
+        return True
+
+
+def _firma_particion(filepath: str) -> Tuple[Any, ...]:
+    # Cambia si cambia el manifiesto o cualquier segmento (comprimido o no).
+    firmas: List[Any] = [cache_datos.firma_archivo(
+        os.path.join(filepath, particiones.MANIFIESTO)
+        )]
+    for _, segmento, archivado in _segmentos(filepath):
+        firmas.append(cache_datos.firma_archivo(f"{segmento}.gz" if archivado else segmento))
+    return tuple(firmas)
+
+
+def _derivado_particionado(
+    esquema: Esquema,
+    filepath: str,
+    nombre: Any,
+    constructor: Callable[[List[Dict[str, Any]]], Any],
+    actualizador: Optional[Callable[[Any, Dict[str, Any]], None]],
+    *,
+    retirador: Optional[Callable[[Any, Dict[str, Any]], None]]
+    ) -> Any:
+    clave = (os.path.abspath(filepath), nombre)
+    firma = _firma_particion(filepath)
+    with _candado_derivados:
+        guardado = _derivados_particionados.get(clave)
+        if guardado is not None and guardado[0] == firma:
+            return guardado[1]
+    estructura = constructor(cargar_datos(esquema, filepath))
+    with _candado_derivados:
+        _derivados_particionados[clave] = (firma, estructura, actualizador, retirador)
+    return estructura
+
+
+def _actualizar_derivados(
+    filepath: str,
+    firma_anterior: Tuple[Any, ...],
+    retirado: Optional[Dict[str, Any]],
+    agregado: Optional[Dict[str, Any]]
+    ) -> None:
+    # Tras anexar, modificar o eliminar un registro, las estructuras vigentes se
+    # ajustan (se retira la versión anterior y se agrega la nueva) en lugar de
+    # reconstruirse; las que no saben hacerlo se descartan.
+    ruta = os.path.abspath(filepath)
+    firma = _firma_particion(filepath)
+    with _candado_derivados:
+        for clave, (firma_guardada, estructura, actualizador, retirador) in list(
+            _derivados_particionados.items()):
+            if clave[0] != ruta:
+                continue
+            if firma_guardada == firma_anterior and actualizador is not None and (
+                retirado is None or retirador is not None):
+                if retirado is not None:
+                    retirador(estructura, retirado)
+                if agregado is not None:
+                    actualizador(estructura, agregado)
+                _derivados_particionados[clave] = (
+                    firma, estructura, actualizador, retirador)
+            else:
+                del _derivados_particionados[clave]
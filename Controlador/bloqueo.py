@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Bloqueo de Archivos.
+
+Coordina varios procesos (por ejemplo, varias terminales de recepción) que
+trabajan sobre la misma carpeta data/. Cada archivo de datos tiene un
+archivo de bloqueo al lado (.citas.csv.lock) sobre el que se toman bloqueos
+consultivos con fcntl.flock: compartidos para leer y exclusivos para
+escribir. Se usa un archivo aparte porque las escrituras atómicas reemplazan
+el archivo de datos (y su inodo) en cada guardado.
+
+Además ofrece control de versiones optimista: quien leyó los datos guarda la
+versión (firma) del archivo y, al escribir, se verifica que no haya cambiado;
+si cambió, se lanza VersionObsoleta y la operación se reintenta con datos
+frescos en lugar de sobrescribir lo que escribió otro proceso (y, si la
+contención persiste, se termina con el bloqueo exclusivo tomado).
+
+En sistemas sin fcntl (Windows) los bloqueos solo coordinan los hilos del
+mismo proceso.
+"""
+
+import contextlib
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar
+
+from Controlador import cache_datos
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Intentos optimistas antes de pasar a bloqueo exclusivo.
+REINTENTOS = 5
+
+T = TypeVar('T')
+
+_locales = threading.local()
+_candados_hilos: Dict[str, threading.RLock] = {}
+_candado_registro = threading.Lock()
+
+
+class VersionObsoleta(Exception):
+    """El archivo cambió desde que se leyó: otro proceso escribió antes."""
+
+
+def ruta_bloqueo(filepath: str) -> str:
+    """
+        Ruta del archivo de bloqueo asociado a un archivo de datos.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            str: Ruta del archivo de bloqueo (oculto, en la misma carpeta).
+    """
+    ruta = os.path.abspath(filepath)
+    return os.path.join(os.path.dirname(ruta), f".{os.path.basename(ruta)}.lock")
+
+
+def _estados() -> Dict[str, Dict[str, Any]]:
+    # Bloqueos que tiene el hilo actual: ruta → modo y nivel de anidamiento.
+    estados = getattr(_locales, 'estados', None)
+    if estados is None:
+        estados = _locales.estados = {}
+    return estados
+
+
+def _candado_hilos(ruta: str) -> threading.RLock:
+    with _candado_registro:
+        return _candados_hilos.setdefault(ruta, threading.RLock())
+
+
+@contextlib.contextmanager
+def _bloquear(filepath: str, exclusivo: bool) -> Iterator[None]:
+    ruta = os.path.abspath(filepath)
+    estados = _estados()
+    estado = estados.get(ruta)
+    if estado is not None:
+        # Bloqueo anidado en el mismo hilo: se reutiliza el que ya se tiene.
+        if exclusivo and not estado['exclusivo']:
+            raise RuntimeError(
+                f"No se puede pasar de bloqueo compartido a exclusivo: {filepath}"
+                )
+        estado['nivel'] += 1
+        try:
+            yield
+        finally:
+            estado['nivel'] -= 1
+        return
+
+    if fcntl is None:
+        with _candado_hilos(ruta):
+            estados[ruta] = {'exclusivo': exclusivo, 'nivel': 1}
+            try:
+                yield
+            finally:
+                del estados[ruta]
+        return
+
+    directorio = os.path.dirname(ruta)
+    os.makedirs(directorio, exist_ok=True)
+    descriptor = os.open(ruta_bloqueo(ruta), os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(descriptor, fcntl.LOCK_EX if exclusivo else fcntl.LOCK_SH)
+        estados[ruta] = {'exclusivo': exclusivo, 'nivel': 1}
+        try:
+            yield
+        finally:
+            del estados[ruta]
+    finally:
+        # Cerrar el descriptor libera el bloqueo.
+        os.close(descriptor)
+
+
+def compartido(filepath: str) -> contextlib.AbstractContextManager:
+    """
+        Bloqueo compartido (lectura) sobre un archivo de datos. Varios
+        lectores pueden tenerlo a la vez; espera mientras alguien escribe.
+        Dentro de un bloqueo exclusivo del mismo hilo no hace nada.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            contextlib.AbstractContextManager: Contexto del bloqueo.
+    """
+    return _bloquear(filepath, False)
+
+
+def exclusivo(filepath: str) -> contextlib.AbstractContextManager:
+    """
+        Bloqueo exclusivo (escritura) sobre un archivo de datos. Es
+        reentrante dentro del mismo hilo.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            contextlib.AbstractContextManager: Contexto del bloqueo.
+    """
+    return _bloquear(filepath, True)
+
+
+def version(filepath: str) -> Optional[cache_datos.Firma]:
+    """
+        Versión actual de un archivo de datos, para el control optimista.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            Optional[cache_datos.Firma]: Firma del archivo o None si no existe.
+    """
+    return cache_datos.firma_archivo(filepath)
+
+
+def verificar_version(filepath: str, esperada: Optional[cache_datos.Firma]) -> None:
+    """
+        Verifica que el archivo siga en la versión con la que se leyó.
+        Debe llamarse con el bloqueo exclusivo tomado.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            esperada (Optional[cache_datos.Firma]): Versión leída antes.
+        Returns:
+            None
+        Raises:
+            VersionObsoleta: Si otro proceso modificó el archivo.
+    """
+    actual = version(filepath)
+    if actual != esperada:
+        raise VersionObsoleta(
+            f"El archivo '{filepath}' fue modificado por otro proceso."
+            )
+
+
+def reintentar(
+    filepath: str, operacion: Callable[[], T], intentos: int = REINTENTOS
+    ) -> T:
+    """
+        Ejecuta una operación optimista, repitiéndola con una pequeña espera
+        aleatoria cada vez que falla por VersionObsoleta. Si se agotan los
+        intentos (mucha contención), se ejecuta una última vez con el
+        bloqueo exclusivo tomado, de modo que la operación siempre termina.
+        Args:
+            filepath (str): Ruta del archivo de datos que se modifica.
+            operacion (Callable[[], T]): Lee, calcula y escribe verificando
+            la versión.
+            intentos (int): Intentos optimistas antes de bloquear.
+        Returns:
+            T: Lo que retorne la operación.
+    """
+    for intento in range(intentos):
+        try:
+            return operacion()
+        except VersionObsoleta:
+            time.sleep(random.uniform(0, 0.002 * (intento + 1)))
+    with exclusivo(filepath):
+        return operacion()
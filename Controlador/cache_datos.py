@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Caché de Datos.
+
+Guarda en memoria los registros ya leídos de cada archivo para no volver a
+abrirlo y parsearlo mientras no cambie en disco. Un archivo se considera sin
+cambios si su firma (mtime_ns, tamaño, inodo) es la misma que cuando se leyó.
+Es compartido por los tres módulos gestor_datos.
+
+Los registros se guardan compactos (Controlador.compactos): objetos de solo
+lectura con __slots__ y textos repetidos compartidos, que ocupan una
+fracción de lo que ocupan los diccionarios.
+
+Además de los registros, cada entrada puede guardar estructuras derivadas
+(índices por documento, por id, etc.) que se construyen una sola vez por
+lectura y se actualizan al anexar registros (y, si saben retirar un
+registro, también al modificar o eliminar uno).
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from Controlador import compactos
+
+# Límite de registros retenidos entre todos los archivos (desalojo LRU).
+MAX_REGISTROS = 500_000
+
+Firma = Tuple[int, int, int]
+
+_entradas: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_total_registros = 0
+_contadores = {'aciertos': 0, 'fallos': 0, 'desalojos': 0}
+_candado = threading.RLock()
+# Índices de posiciones de los archivos JSON-lines: ruta → campo → entrada.
+_desplazamientos: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+
+def firma_archivo(filepath: str) -> Optional[Firma]:
+    """
+        Obtiene la firma de un archivo para detectar si cambió.
+        Args:
+            filepath (str): Ruta del archivo.
+        Returns:
+            Optional[Firma]: (mtime_ns, tamaño, inodo) o None si no existe.
+    """
+    try:
+        info = os.stat(filepath)
+    except OSError:
+        return None
+    return (info.st_mtime_ns, info.st_size, info.st_ino)
+
+
+def _clave(filepath: str) -> str:
+    return os.path.abspath(filepath)
+
+
+def _copiar(filas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Copia superficial: quien llama puede modificar la lista y los
+    # diccionarios sin alterar lo que queda en caché.
+    return [compactos.a_dict(fila) for fila in filas]
+
+
+def _quitar(clave: str) -> None:
+    global _total_registros
+    entrada = _entradas.pop(clave, None)
+    if entrada is not None:
+        _total_registros -= len(entrada['filas'])
+
+
+def _guardar(clave: str, firma: Firma, filas: List[Dict[str, Any]]) -> None:
+    global _total_registros
+    _quitar(clave)
+    if len(filas) > MAX_REGISTROS:
+        return
+    _entradas[clave] = {
+        'firma': firma, 'filas': compactos.compactar(filas), 'derivados': {}}
+    _total_registros += len(filas)
+    while _total_registros > MAX_REGISTROS and len(_entradas) > 1:
+        antigua, _ = next(iter(_entradas.items()))
+        _quitar(antigua)
+        _contadores['desalojos'] += 1
+
+
+def _entrada_vigente(
+    filepath: str, cargador: Callable[[str], List[Dict[str, Any]]]
+    ) -> Tuple[Optional[Dict[str, Any]], Any]:
+    """
+        Devuelve la entrada vigente del archivo, leyéndolo si hace falta.
+        Si el resultado no se puede guardar en caché, la entrada es None y
+        se retorna lo que produjo el cargador.
+    """
+    clave = _clave(filepath)
+    firma = firma_archivo(filepath)
+    entrada = _entradas.get(clave)
+    if entrada is not None and firma is not None and entrada['firma'] == firma:
+        _entradas.move_to_end(clave)
+        _contadores['aciertos'] += 1
+        return entrada, entrada['filas']
+
+    _contadores['fallos'] += 1
+    filas = cargador(filepath)
+    # La firma se toma antes de leer: si el archivo cambia durante la
+    # lectura, la siguiente llamada verá otra firma y lo volverá a leer.
+    firma = firma or firma_archivo(filepath)
+    if firma is None or not isinstance(filas, list):
+        _quitar(clave)
+        return None, filas
+    _guardar(clave, firma, filas)
+    entrada = _entradas.get(clave)
+    return entrada, filas if entrada is None else entrada['filas']
+
+
+def obtener(
+    filepath: str, cargador: Callable[[str], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+    """
+        Retorna los registros de un archivo usando la caché si sigue vigente.
+        Si no hay entrada o la firma del archivo cambió, se llama al cargador
+        y el resultado queda guardado para las siguientes llamadas.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            cargador (Callable): Función que lee y parsea el archivo.
+        Returns:
+            List[Dict[str, Any]]: Copia de los registros del archivo.
+    """
+    with _candado:
+        _, filas = _entrada_vigente(filepath, cargador)
+        return _copiar(filas) if isinstance(filas, list) else filas
+
+
+def vigentes(filepath: str) -> Optional[List[Dict[str, Any]]]:
+    """
+        Registros del archivo que ya están en caché, sin leerlo si no están.
+        La lista es compartida: quien llama no debe modificarla.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            Optional[List[Dict[str, Any]]]: Los registros o None si el
+            archivo no está en caché o cambió desde que se leyó.
+    """
+    with _candado:
+        entrada = _entradas.get(_clave(filepath))
+        if entrada is None or entrada['firma'] != firma_archivo(filepath):
+            return None
+        return entrada['filas']
+
+
+def derivado(
+    filepath: str,
+    nombre: Any,
+    constructor: Callable[[List[Dict[str, Any]]], Any],
+    cargador: Callable[[str], List[Dict[str, Any]]],
+    actualizador: Optional[Callable[[Any, Dict[str, Any]], None]] = None,
+    *,
+    retirador: Optional[Callable[[Any, Dict[str, Any]], None]] = None
+    ) -> Any:
+    """
+        Retorna una estructura calculada a partir de los registros del archivo
+        (por ejemplo un índice), construyéndola solo la primera vez para cada
+        versión del archivo. Si se da un actualizador, la estructura se
+        mantiene al anexar registros en lugar de reconstruirse; si además se
+        da un retirador, también al modificar o eliminar un registro
+        (registrar_cambio). Si no, se reconstruye desde la caché.
+        La estructura es compartida: quien llama no debe modificarla.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            nombre (Any): Identificador de la estructura dentro de la entrada.
+            constructor (Callable): Recibe la lista de registros y la construye.
+            cargador (Callable): Función que lee y parsea el archivo.
+            actualizador (Optional[Callable]): Recibe (estructura, registro)
+            cuando se anexa un registro al archivo.
+            retirador (Optional[Callable]): Recibe (estructura, registro)
+            cuando un registro deja de estar en el archivo.
+        Returns:
+            Any: La estructura derivada.
+    """
+    with _candado:
+        entrada, filas = _entrada_vigente(filepath, cargador)
+        if entrada is None:
+            return constructor(filas if isinstance(filas, list) else [])
+        if nombre not in entrada['derivados']:
+            entrada['derivados'][nombre] = (
+                constructor(entrada['filas']), actualizador, retirador)
+        return entrada['derivados'][nombre][0]
+
+
+def _valor_clave(registro: Dict[str, Any], campo: str) -> str:
+    valor = registro.get(campo)
+    return '' if valor is None else str(valor).strip()
+
+
+def indice(
+    filepath: str,
+    campos: Union[str, Tuple[str, ...]],
+    cargador: Callable[[str], List[Dict[str, Any]]]
+    ) -> Dict[Any, List[Dict[str, Any]]]:
+    """
+        Índice hash de los registros por uno o varios campos.
+        Las claves son el valor del campo como texto sin espacios (o una tupla
+        de ellos si se indican varios campos) y cada una apunta a la lista de
+        registros que la tienen, en el orden del archivo. Se mantiene al
+        anexar, modificar y eliminar registros sin reconstruirse (un
+        registro modificado pasa al final de la lista de su clave).
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            campos (Union[str, Tuple[str, ...]]): Campo o campos a indexar.
+            cargador (Callable): Función que lee y parsea el archivo.
+        Returns:
+            Dict[Any, List[Dict[str, Any]]]: Índice compartido (solo lectura).
+    """
+    if isinstance(campos, str):
+        def clave(registro):
+            return _valor_clave(registro, campos)
+    else:
+        def clave(registro):
+            return tuple(_valor_clave(registro, campo) for campo in campos)
+
+    def agregar(estructura, registro):
+        estructura.setdefault(clave(registro), []).append(registro)
+
+    def retirar(estructura, registro):
+        # Se quita el mismo objeto (no uno igual) y la clave si queda vacía.
+        valor = clave(registro)
+        registros = estructura.get(valor, [])
+        for posicion, existente in enumerate(registros):
+            if existente is registro:
+                del registros[posicion]
+                break
+        if not registros:
+            estructura.pop(valor, None)
+
+    def construir(filas):
+        estructura: Dict[Any, List[Dict[str, Any]]] = {}
+        for registro in filas:
+            agregar(estructura, registro)
+        return estructura
+
+    return derivado(
+        filepath, ('indice', campos), construir, cargador, agregar, retirador=retirar
+        )
+
+
+def indice_desplazamientos(
+    filepath: str,
+    campo: str,
+    recorrer: Callable[[str], Iterable[Tuple[int, Dict[str, Any]]]]
+    ) -> Dict[str, List[int]]:
+    """
+        Índice de un archivo JSON-lines por campo: a cada valor le asigna
+        las posiciones (en bytes) de las líneas que lo tienen. Guarda solo
+        enteros, no los registros, y se mantiene al anexar registros
+        (registrar_anexo con el desplazamiento).
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            campo (str): Campo a indexar.
+            recorrer (Callable): Recibe la ruta y entrega pares
+            (posición, registro).
+        Returns:
+            Dict[str, List[int]]: Índice compartido (solo lectura).
+    """
+    clave = _clave(filepath)
+    with _candado:
+        firma = firma_archivo(filepath)
+        entrada = _desplazamientos.get(clave, {}).get(campo)
+        if entrada is not None and firma is not None and entrada['firma'] == firma:
+            return entrada['indice']
+        estructura: Dict[str, List[int]] = {}
+        for posicion, registro in recorrer(filepath):
+            estructura.setdefault(_valor_clave(registro, campo), []).append(posicion)
+        if firma is not None:
+            _desplazamientos.setdefault(clave, {})[campo] = {
+                'firma': firma, 'indice': estructura}
+        return estructura
+
+
+def _anexar_desplazamiento(
+    clave: str,
+    registro: Dict[str, Any],
+    firma_anterior: Optional[Firma],
+    firma_nueva: Optional[Firma],
+    desplazamiento: Optional[int]
+    ) -> None:
+    indices = _desplazamientos.get(clave)
+    if not indices:
+        return
+    for campo, entrada in list(indices.items()):
+        if desplazamiento is None or firma_nueva is None or (
+            entrada['firma'] != firma_anterior):
+            del indices[campo]
+            continue
+        entrada['indice'].setdefault(_valor_clave(registro, campo), []).append(desplazamiento)
+        entrada['firma'] = firma_nueva
+
+
+def registrar_anexo(
+    filepath: str,
+    registro: Dict[str, Any],
+    firma_anterior: Optional[Firma],
+    desplazamiento: Optional[int] = None
+    ) -> None:
+    """
+        Actualiza la entrada en caché tras anexar un registro al archivo,
+        evitando releerlo. Solo se aplica si la entrada correspondía al
+        archivo tal como estaba antes del anexo; si no, se invalida.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            registro (Dict[str, Any]): Registro anexado.
+            firma_anterior (Optional[Firma]): Firma del archivo antes de anexar.
+            desplazamiento (Optional[int]): Posición de la línea anexada, para
+            los índices de JSON-lines.
+        Returns:
+            None
+    """
+    global _total_registros
+    clave = _clave(filepath)
+    with _candado:
+        entrada = _entradas.get(clave)
+        firma_nueva = firma_archivo(filepath)
+        _anexar_desplazamiento(clave, registro, firma_anterior, firma_nueva, desplazamiento)
+        if entrada is None:
+            return
+        if firma_anterior is None or entrada['firma'] != firma_anterior or (
+            firma_nueva is None):
+            _quitar(clave)
+            return
+        registro = compactos.compactar_registro(registro)
+        entrada['filas'].append(registro)
+        entrada['firma'] = firma_nueva
+        _total_registros += 1
+        for nombre, (estructura, actualizador, _) in list(entrada['derivados'].items()):
+            if actualizador is None:
+                del entrada['derivados'][nombre]
+            else:
+                actualizador(estructura, registro)
+
+
+def registrar_cambio(
+    filepath: str,
+    firma_anterior: Optional[Firma],
+    posicion: int,
+    nuevo: Optional[Dict[str, Any]]
+    ) -> None:
+    """
+        Actualiza la entrada en caché tras reescribir el archivo cambiando un
+        solo registro, evitando releerlo. Las estructuras derivadas con
+        retirador y actualizador se ajustan (se retira el registro anterior
+        y se agrega el nuevo); las demás se descartan y se reconstruyen desde
+        la caché cuando se pidan. Si la entrada no correspondía al archivo
+        tal como estaba antes, se invalida.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            firma_anterior (Optional[Firma]): Firma del archivo antes de escribir.
+            posicion (int): Posición del registro cambiado.
+            nuevo (Optional[Dict[str, Any]]): El registro tal como se leerá
+            del archivo, o None si se eliminó.
+        Returns:
+            None
+    """
+    global _total_registros
+    clave = _clave(filepath)
+    with _candado:
+        # Las posiciones en bytes cambian al reescribir el archivo.
+        _desplazamientos.pop(clave, None)
+        entrada = _entradas.get(clave)
+        if entrada is None:
+            return
+        firma_nueva = firma_archivo(filepath)
+        if firma_anterior is None or entrada['firma'] != firma_anterior or (
+            firma_nueva is None) or not 0 <= posicion < len(entrada['filas']):
+            _quitar(clave)
+            return
+        anterior = entrada['filas'][posicion]
+        if nuevo is None:
+            del entrada['filas'][posicion]
+            _total_registros -= 1
+        else:
+            nuevo = compactos.compactar_registro(nuevo)
+            entrada['filas'][posicion] = nuevo
+        entrada['firma'] = firma_nueva
+        for nombre, (estructura, actualizador, retirador) in list(
+            entrada['derivados'].items()):
+            if actualizador is None or retirador is None:
+                del entrada['derivados'][nombre]
+                continue
+            retirador(estructura, anterior)
+            if nuevo is not None:
+                actualizador(estructura, nuevo)
+
+
+def invalidar(filepath: Optional[str] = None) -> None:
+    """
+        Descarta la entrada de un archivo, o toda la caché si no se indica ruta.
+        Args:
+            filepath (Optional[str]): Ruta del archivo a invalidar.
+        Returns:
+            None
+    """
+    global _total_registros
+    with _candado:
+        if filepath is None:
+            _entradas.clear()
+            _desplazamientos.clear()
+            _total_registros = 0
+        else:
+            _quitar(_clave(filepath))
+            _desplazamientos.pop(_clave(filepath), None)
+
+
+def estadisticas() -> Dict[str, int]:
+    """
+        Contadores de diagnóstico de la caché.
+        Returns:
+            Dict[str, int]: aciertos, fallos, desalojos, archivos y registros
+            actualmente retenidos.
+    """
+    with _candado:
+        return {
+            **_contadores,
+            'archivos': len(_entradas),
+            'registros': _total_registros,
+        }
+
+
+def reiniciar_estadisticas() -> None:
+    """
+        Pone en cero los contadores de aciertos, fallos y desalojos.
+        Returns:
+            None
+    """
+    with _candado:
+        for nombre in _contadores:
+            _contadores[nombre] = 0
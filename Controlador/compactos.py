@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Registros Compactos.
+
+Los registros que quedan en memoria (la caché de datos y las estructuras
+derivadas de ella) se guardan como objetos con __slots__ en lugar de
+diccionarios: un tipo por cada disposición de campos (los de Cita, Paciente
+y Médico se declaran en sus gestores), sin diccionario por instancia, y con
+los textos repetidos (estados, especialidades, fechas, horas, documentos)
+compartidos entre registros. Se leen como un diccionario de solo lectura
+(registro['campo'], registro.get('campo'), dict(registro)), así el resto
+del código no cambia; para modificarlos se copia a un diccionario.
+No contiene lógica de negocio, solo representación de datos.
+"""
+
+import collections
+import operator
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Disposición de campos → tipo de registro, para los tipos declarados con
+# tipo() (los de las entidades); se conservan siempre.
+_tipos: Dict[Tuple[Any, ...], type] = {}
+# Tipos de disposiciones no declaradas (archivos con columnas distintas,
+# importaciones con cabeceras arbitrarias): solo se guardan los usados más
+# recientemente, así no crecen sin límite durante la vida del proceso.
+MAX_TIPOS_DINAMICOS = 64
+_dinamicos: 'collections.OrderedDict[Tuple[Any, ...], type]' = collections.OrderedDict()
+_candado = threading.Lock()
+
+
+class Registro(Mapping):
+    """
+        Registro compacto de solo lectura. Cada subclase (creada con tipo())
+        fija sus campos; los valores viven en slots.
+    """
+
+    __slots__ = ()
+    _campos: Tuple[Any, ...] = ()
+    _lectores: Dict[Any, Any] = {}
+    _asignadores: Tuple[Any, ...] = ()
+    _valores = staticmethod(lambda registro: ())
+
+    def __getitem__(self, campo: Any) -> Any:
+        lector = self._lectores.get(campo)
+        if lector is None:
+            raise KeyError(campo)
+        return lector(self)
+
+    def get(self, campo: Any, defecto: Any = None) -> Any:
+        lector = self._lectores.get(campo)
+        return defecto if lector is None else lector(self)
+
+    def __contains__(self, campo: object) -> bool:
+        return campo in self._lectores
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._campos)
+
+    def __len__(self) -> int:
+        return len(self._campos)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({a_dict(self)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (dict, (a_dict(self),))
+
+
+def _nuevo_tipo(nombre: str, campos: Tuple[Any, ...]) -> type:
+    # Los slots se numeran: los campos pueden no ser identificadores
+    # válidos o coincidir con métodos (ej. 'get').
+    slots = tuple(f'_{posicion}' for posicion in range(len(campos)))
+    nuevo = type(nombre, (Registro,), {'__slots__': slots, '_campos': campos})
+    nuevo._lectores = {
+        campo: operator.attrgetter(slot) for campo, slot in zip(campos, slots)
+        }
+    nuevo._asignadores = tuple(nuevo.__dict__[slot].__set__ for slot in slots)
+    if len(slots) == 1:
+        nuevo._valores = staticmethod(lambda registro, slot=slots[0]: (getattr(registro, slot),))
+    elif slots:
+        nuevo._valores = staticmethod(operator.attrgetter(*slots))
+    return nuevo
+
+
+def tipo(nombre: str, campos: Sequence[Any]) -> type:
+    """
+        Declara el tipo de registro compacto de una disposición de campos;
+        la misma disposición siempre da el mismo tipo.
+        Args:
+            nombre (str): Nombre del tipo (ej. 'Cita').
+            campos (Sequence[Any]): Campos en orden.
+        Returns:
+            type: Subclase de Registro con un slot por campo.
+    """
+    campos = tuple(campos)
+    with _candado:
+        existente = _tipos.get(campos)
+        if existente is None:
+            existente = _tipos[campos] = _nuevo_tipo(nombre, campos)
+            _dinamicos.pop(campos, None)
+        return existente
+
+
+def _tipo_dinamico(campos: Tuple[Any, ...]) -> type:
+    # Tipo de una disposición no declarada, con desalojo LRU. Un tipo
+    # desalojado sigue funcionando para los registros que ya lo usan.
+    with _candado:
+        existente = _tipos.get(campos) or _dinamicos.get(campos)
+        if existente is not None:
+            if campos in _dinamicos:
+                _dinamicos.move_to_end(campos)
+            return existente
+        nuevo = _dinamicos[campos] = _nuevo_tipo('Registro', campos)
+        if len(_dinamicos) > MAX_TIPOS_DINAMICOS:
+            _dinamicos.popitem(last=False)
+        return nuevo
+
+
+def _crear(
+    registro: Dict[Any, Any],
+    compartidos: Optional[Dict[str, str]],
+    clases: Optional[Dict[Tuple[Any, ...], type]] = None
+    ) -> Registro:
+    campos = tuple(registro)
+    clase = _tipos.get(campos)
+    if clase is None:
+        # En una misma conversión se consulta la caché LRU una vez por
+        # disposición, no una vez por registro.
+        if clases is None:
+            clase = _tipo_dinamico(campos)
+        else:
+            clase = clases.get(campos)
+            if clase is None:
+                clase = clases[campos] = _tipo_dinamico(campos)
+    compacto = object.__new__(clase)
+    for asignar, valor in zip(clase._asignadores, registro.values()):
+        if compartidos is not None and type(valor) is str:
+            valor = compartidos.setdefault(valor, valor)
+        asignar(compacto, valor)
+    return compacto
+
+
+def compactar(filas: Iterable[Any]) -> List[Any]:
+    """
+        Convierte registros (diccionarios) en registros compactos. Los textos
+        iguales quedan como un único objeto compartido. Los elementos que no
+        son diccionarios se dejan como están.
+        Args:
+            filas (Iterable[Any]): Registros leídos del archivo.
+        Returns:
+            List[Any]: Registros compactos, en el mismo orden.
+    """
+    compartidos: Dict[str, str] = {}
+    clases: Dict[Tuple[Any, ...], type] = {}
+    return [
+        _crear(fila, compartidos, clases) if type(fila) is dict else fila
+        for fila in filas
+        ]
+
+
+def compactar_registro(registro: Any) -> Any:
+    """
+        Registro compacto a partir de un diccionario (si ya es compacto, el
+        mismo registro: es de solo lectura).
+        Args:
+            registro (Any): Registro a convertir.
+        Returns:
+            Any: El registro compacto, o una copia si no es un diccionario.
+    """
+    if isinstance(registro, Registro):
+        return registro
+    if type(registro) is dict:
+        return _crear(registro, None)
+    return dict(registro)
+
+
+def a_dict(registro: Any) -> Dict[Any, Any]:
+    """
+        Copia del registro como diccionario modificable.
+        Args:
+            registro (Any): Registro compacto o diccionario.
+        Returns:
+            Dict[Any, Any]: Diccionario nuevo con los mismos campos y valores.
+    """
+    if isinstance(registro, Registro):
+        return dict(zip(registro._campos, registro._valores(registro)))
+    return dict(registro)
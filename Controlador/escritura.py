@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Escritura de Archivos.
+
+Primitivas de escritura compartidas por los módulos gestor_datos:
+anexar un registro a un CSV, a un arreglo JSON o a un JSON-lines sin
+reescribir el archivo,
+y reescribir un archivo completo de forma atómica (archivo temporal en la
+misma carpeta + fsync + rename), de modo que una interrupción a mitad de la
+escritura nunca deja el archivo truncado ni a medio escribir.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import contextlib
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Permisos de los archivos nuevos (los existentes conservan los suyos).
+PERMISOS_POR_DEFECTO = 0o644
+
+_grupo = threading.local()
+
+
+def _pendientes() -> Optional[Dict[str, None]]:
+    # Rutas cuyo fsync quedó diferido por agrupar_sincronizacion, o None
+    # si no hay un grupo abierto en este hilo.
+    return getattr(_grupo, 'pendientes', None)
+
+
+@contextlib.contextmanager
+def agrupar_sincronizacion() -> Iterator[None]:
+    """
+        Agrupa las escrituras del bloque para hacer un solo fsync por archivo
+        al salir (group commit). Cada escritura sigue siendo atómica y
+        visible de inmediato para otros procesos; lo que se difiere es la
+        garantía de durabilidad ante un corte de energía, que se obtiene al
+        cerrar el bloque. Los bloques pueden anidarse.
+        Returns:
+            Iterator[None]: Contexto del grupo.
+    """
+    if _pendientes() is not None:
+        yield
+        return
+    _grupo.pendientes = {}
+    try:
+        yield
+    finally:
+        pendientes = _grupo.pendientes
+        _grupo.pendientes = None
+        directorios = {}
+        for ruta in pendientes:
+            try:
+                with open(ruta, 'rb') as archivo:
+                    os.fsync(archivo.fileno())
+            except FileNotFoundError:
+                pass
+            directorios[os.path.dirname(os.path.abspath(ruta))] = None
+        for directorio in directorios:
+            _sincronizar_directorio(directorio)
+
+
+def sincronizar(archivo, filepath: Optional[str] = None) -> None:
+    """
+        Fuerza que el contenido escrito llegue al disco (flush + fsync).
+        Dentro de agrupar_sincronizacion el fsync se difiere hasta el final
+        del grupo.
+        Args:
+            archivo: Objeto de archivo abierto en modo escritura.
+            filepath (Optional[str]): Ruta del archivo, necesaria para
+            diferir el fsync (por defecto archivo.name).
+        Returns:
+            None
+    """
+    archivo.flush()
+    pendientes = _pendientes()
+    if pendientes is None:
+        os.fsync(archivo.fileno())
+    else:
+        pendientes[filepath or archivo.name] = None
+
+
+def _sincronizar_directorio(directorio: str) -> None:
+    # Persiste la entrada del directorio tras un rename. En Windows no se
+    # pueden abrir directorios; ahí os.replace ya es suficiente.
+    if os.name == 'nt':
+        return
+    try:
+        descriptor = os.open(directorio, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
+def escribir_atomico(
+    filepath: str,
+    escritor: Callable[[IO[Any]], None],
+    newline: Optional[str] = None,
+    binario: bool = False
+    ) -> None:
+    """
+        Reescribe un archivo completo de forma atómica: se escribe en un
+        archivo temporal de la misma carpeta, se hace fsync y se reemplaza
+        el original con os.replace. Quien lea el archivo ve siempre la
+        versión anterior o la nueva completa, nunca una a medias.
+        Args:
+            filepath (str): Ruta del archivo a escribir.
+            escritor (Callable[[IO[Any]], None]): Recibe el archivo temporal
+            abierto (en modo texto utf-8 o binario) y escribe el contenido.
+            newline (Optional[str]): Igual que en open() ('' para CSV).
+            binario (bool): Abrir el temporal en modo binario (ej. gzip).
+        Returns:
+            None
+    """
+    ruta = os.path.abspath(filepath)
+    directorio = os.path.dirname(ruta)
+    os.makedirs(directorio, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(
+        prefix=f".{os.path.basename(ruta)}.", suffix='.tmp', dir=directorio
+        )
+    try:
+        if binario:
+            archivo = os.fdopen(descriptor, 'wb')
+        else:
+            archivo = os.fdopen(descriptor, 'w', encoding='utf-8', newline=newline)
+        with archivo:
+            escritor(archivo)
+            sincronizar(archivo, ruta)
+        try:
+            anterior = os.stat(ruta)
+        except FileNotFoundError:
+            anterior = None
+        os.chmod(temporal, anterior.st_mode & 0o777 if anterior else PERMISOS_POR_DEFECTO)
+        if anterior is not None:
+            # La versión nueva siempre tiene un mtime mayor que la anterior,
+            # aunque el sistema reutilice el inodo y el tamaño coincida.
+            # Así la firma (mtime, tamaño, inodo) nunca se repite.
+            mtime = max(time.time_ns(), anterior.st_mtime_ns + 1)
+            os.utime(temporal, ns=(mtime, mtime))
+        os.replace(temporal, ruta)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporal)
+        raise
+    if _pendientes() is None:
+        _sincronizar_directorio(directorio)
+
+
+def guardar_csv(
+    filepath: str, campos: List[str], datos: Iterable[Dict[str, Any]]
+    ) -> None:
+    """
+        Reescribe un CSV completo (cabecera + filas) de forma atómica.
+        Las filas pueden venir de un generador (ej. iterar_datos), así
+        una exportación no necesita tenerlas todas en memoria.
+        Args:
+            filepath (str): Ruta al archivo CSV.
+            campos (List[str]): Orden de las columnas.
+            datos (Iterable[Dict[str, Any]]): Filas a escribir.
+        Returns:
+            None
+    """
+    def escribir(csv_file):
+        writer = csv.DictWriter(csv_file, fieldnames=campos)
+        writer.writeheader()
+        writer.writerows(datos)
+
+    escribir_atomico(filepath, escribir, newline='')
+
+
+def guardar_json(filepath: str, datos: Any, **opciones: Any) -> None:
+    """
+        Reescribe un archivo JSON completo de forma atómica.
+        Args:
+            filepath (str): Ruta al archivo JSON.
+            datos (Any): Contenido a serializar.
+            **opciones (Any): Argumentos para json.dump (por defecto indent=4).
+        Returns:
+            None
+    """
+    opciones.setdefault('indent', 4)
+    escribir_atomico(filepath, lambda json_file: json.dump(datos, json_file, **opciones))
+
+
+def linea_jsonl(registro: Dict[str, Any]) -> str:
+    """
+        Serializa un registro como una línea JSON-lines (compacta, sin
+        escapar acentos, terminada en salto de línea).
+        Args:
+            registro (Dict[str, Any]): Registro a serializar.
+        Returns:
+            str: La línea.
+    """
+    return json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def guardar_jsonl(filepath: str, datos: Iterable[Dict[str, Any]]) -> None:
+    """
+        Reescribe un archivo JSON-lines completo (un registro por línea) de
+        forma atómica.
+        Args:
+            filepath (str): Ruta al archivo .jsonl.
+            datos (Iterable[Dict[str, Any]]): Registros a escribir.
+        Returns:
+            None
+    """
+    escribir_atomico(
+        filepath,
+        lambda jsonl_file: jsonl_file.writelines(linea_jsonl(r) for r in datos),
+        newline=''
+        )
+
+
+def anexar_csv(
+    filepath: str, campos: List[str], registro: Dict[str, Any]
+    ) -> Dict[str, str]:
+    """
+        Escribe una fila al final de un CSV (y la cabecera si está vacío).
+        Args:
+            filepath (str): Ruta al archivo CSV.
+            campos (List[str]): Orden de las columnas.
+            registro (Dict[str, Any]): Registro a escribir.
+        Returns:
+            Dict[str, str]: La fila tal como se leerá luego del archivo
+            (todas las columnas, como texto).
+    """
+    with open(filepath, mode='a', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=campos)
+        if csv_file.tell() == 0:
+            writer.writeheader()
+        writer.writerow(registro)
+        sincronizar(csv_file, filepath)
+    return fila_csv(campos, registro)
+
+
+def fila_csv(campos: List[str], registro: Dict[str, Any]) -> Dict[str, str]:
+    """
+        Un registro tal como se leerá luego de un CSV: todas las columnas,
+        como texto (None se escribe como celda vacía).
+        Args:
+            campos (List[str]): Orden de las columnas.
+            registro (Dict[str, Any]): Registro escrito.
+        Returns:
+            Dict[str, str]: La fila.
+    """
+    return {
+        campo: '' if registro.get(campo) is None else str(registro[campo])
+        for campo in campos
+        }
+
+
+def anexar_json(filepath: str, registro: Dict[str, Any]) -> bool:
+    """
+        Inserta un registro al final del arreglo JSON sin reescribir el archivo.
+        Se ubica el ']' de cierre y se escribe el nuevo elemento en su lugar,
+        con la misma indentación que produce json.dump(..., indent=4).
+        Args:
+            filepath (str): Ruta al archivo JSON.
+            registro (Dict[str, Any]): Registro a insertar.
+        Returns:
+            bool: True si se anexó, False si el archivo está vacío (hay que
+            escribirlo completo).
+        Raises:
+            ValueError: Si el archivo no termina en un arreglo cerrado (ej.
+            quedó cortado por una escritura interrumpida); no se modifica.
+    """
+    bloque = json.dumps(registro, indent=4).replace('\n', '\n    ')
+    with open(filepath, mode='r+b') as json_file:
+        json_file.seek(0, os.SEEK_END)
+        posicion = json_file.tell()
+        # Buscar el ']' final y el carácter significativo que lo precede.
+        cierre_encontrado = False
+        anterior = None
+        fin_anterior = 0
+        paso = min(posicion, 4096)
+        while posicion > 0 and anterior is None:
+            inicio = posicion - paso
+            json_file.seek(inicio)
+            trozo = json_file.read(posicion - inicio)
+            for i in range(len(trozo) - 1, -1, -1):
+                if trozo[i:i + 1].isspace():
+                    continue
+                if not cierre_encontrado:
+                    if trozo[i:i + 1] != b']':
+                        raise ValueError(f"{filepath} no termina en ']': el archivo está dañado.")
+                    cierre_encontrado = True
+                else:
+                    anterior = trozo[i:i + 1]
+                    fin_anterior = inicio + i + 1
+                    break
+            posicion = inicio
+            paso = min(posicion, 4096)
+
+        if not cierre_encontrado:
+            return False
+        if anterior is None:
+            raise ValueError(f"{filepath} no empieza con '[': el archivo está dañado.")
+        separador = '\n    ' if anterior == b'[' else ',\n    '
+        json_file.seek(fin_anterior)
+        json_file.write(f"{separador}{bloque}\n]".encode('utf-8'))
+        json_file.truncate()
+        sincronizar(json_file, filepath)
+    return True
+
+
+def anexar_jsonl(filepath: str, registro: Dict[str, Any]) -> int:
+    """
+        Escribe un registro como una línea nueva al final de un JSON-lines.
+        Si la última línea quedó sin terminar (ej. por un corte), se cierra
+        antes para no mezclarla con el registro nuevo.
+        Args:
+            filepath (str): Ruta al archivo .jsonl.
+            registro (Dict[str, Any]): Registro a escribir.
+        Returns:
+            int: Posición (en bytes) donde empieza la línea escrita.
+    """
+    linea = linea_jsonl(registro).encode('utf-8')
+    with open(filepath, mode='r+b') as jsonl_file:
+        posicion = jsonl_file.seek(0, os.SEEK_END)
+        if posicion > 0:
+            jsonl_file.seek(posicion - 1)
+            if jsonl_file.read(1) != b'\n':
+                jsonl_file.write(b'\n')
+                posicion += 1
+        jsonl_file.write(linea)
+        sincronizar(jsonl_file, filepath)
+    return posicion
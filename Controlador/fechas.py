@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Normalización de Fechas.
+
+Lleva las fechas de las citas a la forma canónica YYYY-MM-DD. Las fechas
+que ya están en esa forma (el caso común) se reconocen comparando
+caracteres y cortando la cadena, sin strptime ni excepciones. Las demás
+(DD/MM/YYYY, DD-MM-YYYY, YYYY/MM/DD, YYYY-DD-MM, DD/MM/YY) se interpretan
+una sola vez por texto distinto: el resultado queda en caché, ya que en un
+historial de citas las mismas fechas se repiten muchas veces.
+No contiene lógica de negocio, solo conversión de datos.
+"""
+
+import calendar
+import functools
+import re
+from typing import Any, Optional, Tuple
+
+# Cantidad de textos distintos cuya interpretación se recuerda.
+TAMANO_CACHE = 4096
+
+Partes = Tuple[int, int, int]
+
+_DIA_MES_AÑO = re.compile(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})")
+
+
+def _valida(año: int, mes: int, dia: int) -> bool:
+    return año >= 1 and 1 <= mes <= 12 and 1 <= dia <= calendar.monthrange(año, mes)[1]
+
+
+def _iso(texto: str) -> Optional[Partes]:
+    # Camino rápido: YYYY-MM-DD exacto, leído por posiciones.
+    if len(texto) != 10 or texto[4] != '-' or texto[7] != '-' or not texto.isascii():
+        return None
+    año, mes, dia = texto[:4], texto[5:7], texto[8:]
+    if not (año.isdigit() and mes.isdigit() and dia.isdigit()):
+        return None
+    valores = (int(año), int(mes), int(dia))
+    return valores if _valida(*valores) else None
+
+
+def _numeros(texto: str, separador: str) -> Optional[Tuple[str, str, str]]:
+    trozos = texto.split(separador)
+    if len(trozos) != 3 or not all(t.isascii() and t.isdigit() for t in trozos):
+        return None
+    return trozos[0], trozos[1], trozos[2]
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE)
+def _interpretar(texto: str) -> Optional[Partes]:
+    # Formatos aceptados, en orden de preferencia: (separador, año primero,
+    # día antes que mes).
+    for separador, año_primero, dia_primero in (
+        ('-', True, False),   # YYYY-MM-DD (con o sin ceros a la izquierda)
+        ('/', False, True),   # DD/MM/YYYY
+        ('-', False, True),   # DD-MM-YYYY
+        ('/', True, False),   # YYYY/MM/DD
+        ('-', True, True),    # YYYY-DD-MM
+        ):
+        numeros = _numeros(texto, separador)
+        if numeros is None:
+            continue
+        if año_primero:
+            año, primero, segundo = numeros
+        else:
+            primero, segundo, año = numeros
+        if len(año) != 4 or len(primero) > 2 or len(segundo) > 2:
+            continue
+        dia, mes = (primero, segundo) if dia_primero else (segundo, primero)
+        valores = (int(año), int(mes), int(dia))
+        if _valida(*valores):
+            return valores
+    # Último intento: DD/MM/YY al inicio del texto (año de dos dígitos:
+    # siglo XXI), aunque siga otro contenido (ej. una hora).
+    coincidencia = _DIA_MES_AÑO.match(texto)
+    if coincidencia:
+        dia, mes, año = coincidencia.groups()
+        valores = (int(año) + 2000 if len(año) == 2 else int(año), int(mes), int(dia))
+        if _valida(*valores):
+            return valores
+    return None
+
+
+def partes(fecha: Any) -> Optional[Partes]:
+    """
+        Año, mes y día de una fecha en cualquiera de los formatos aceptados.
+        Args:
+            fecha (Any): Fecha a interpretar.
+        Returns:
+            Optional[Partes]: (año, mes, día) o None si no es una fecha válida.
+    """
+    texto = '' if fecha is None else str(fecha).strip()
+    if not texto:
+        return None
+    return _iso(texto) or _interpretar(texto)
+
+
+def normalizar(fecha: Any) -> str:
+    """
+        Fecha en forma canónica YYYY-MM-DD. Si ya está en esa forma se
+        retorna el mismo texto sin convertir.
+        Args:
+            fecha (Any): Fecha a normalizar.
+        Returns:
+            str: La fecha canónica; '' si está vacía, o el texto original
+            (sin espacios) si no se puede interpretar.
+    """
+    texto = '' if fecha is None else str(fecha).strip()
+    if not texto or _iso(texto) is not None:
+        return texto
+    encontradas = _interpretar(texto)
+    if encontradas is None:
+        return texto
+    return f"{encontradas[0]:04d}-{encontradas[1]:02d}-{encontradas[2]:02d}"
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Vista Unificada de Citas.
+
+Las citas pueden estar repartidas entre la carpeta por mes (data/citas/),
+citas.json, citas.csv, citas.jsonl y citas.db (todos los almacenamientos
+que ofrece el menú de citas). Este módulo las carga en paralelo (un hilo por
+archivo), las une en una sola lista sin ids repetidos según un orden de
+precedencia entre archivos y recuerda en qué archivos está cada id, así
+borrar o actualizar una cita reescribe solo los archivos que la contienen.
+También informa cuántas citas se leyeron de cada archivo y cuántas se
+descartaron por repetidas.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from Controlador import gestor_datos_citas
+
+ORIGENES = ('mensual', 'json', 'csv', 'jsonl', 'db')
+# Si un id está en varios archivos, gana el primero de esta lista.
+PRECEDENCIA_POR_DEFECTO = ORIGENES
+
+
+def rutas(ruta_base: str) -> Dict[str, str]:
+    """
+        Ruta de cada archivo de citas a partir de la ruta base.
+        Args:
+            ruta_base (str): Ruta base sin extensión (ej. 'data/citas').
+        Returns:
+            Dict[str, str]: origen → ruta.
+    """
+    return {
+        'mensual': ruta_base,
+        **{origen: f"{ruta_base}.{origen}" for origen in ORIGENES if origen != 'mensual'},
+        }
+
+
+def _existe(origen: str, ruta: str) -> bool:
+    if origen == 'mensual':
+        return os.path.isdir(ruta)
+    return os.path.isfile(ruta)
+
+
+def _leer(ruta: str, mes: Optional[Tuple[int, int]]) -> List[Dict[str, Any]]:
+    if mes is None:
+        return gestor_datos_citas.cargar_datos(ruta)
+    return gestor_datos_citas.cargar_mes(ruta, *mes)
+
+
+def cargar(
+    ruta_base: str,
+    precedencia: Sequence[str] = PRECEDENCIA_POR_DEFECTO,
+    mes: Optional[Tuple[int, int]] = None
+    ) -> Dict[str, Any]:
+    """
+        Carga y une las citas de todos los archivos existentes.
+        Dentro de un mismo archivo, si un id aparece varias veces se toma su
+        última versión (como en compactar_datos); entre archivos, la del
+        archivo con más precedencia.
+        Las citas sin id se conservan todas.
+        Args:
+            ruta_base (str): Ruta base sin extensión.
+            precedencia (Sequence[str]): Orden de los orígenes; los que no
+            estén en la lista no se cargan.
+            mes (Optional[Tuple[int, int]]): (año, mes) para cargar solo ese
+            mes (de la carpeta por mes se lee solo su segmento).
+        Returns:
+            Dict[str, Any]: {
+                'citas': lista unida (copias, en orden de precedencia),
+                'fuentes': origen de cada cita de 'citas' (misma posición),
+                'origenes': id → origen de la cita que quedó,
+                'ubicaciones': id → orígenes que contienen ese id,
+                'estadisticas': {'leidas': {origen: cantidad}, 'total': int,
+                'repetidas': ids en más de un archivo, 'descartadas': int}
+            }
+    """
+    fuentes = {
+        origen: ruta for origen, ruta in rutas(ruta_base).items()
+        if origen in precedencia and _existe(origen, ruta)
+        }
+    orden = [origen for origen in precedencia if origen in fuentes]
+
+    # Un hilo por archivo: las lecturas (y sus esperas de disco) se solapan.
+    if len(orden) > 1:
+        with ThreadPoolExecutor(max_workers=len(orden)) as ejecutor:
+            futuros = {origen: ejecutor.submit(_leer, fuentes[origen], mes) for origen in orden}
+            leidas = {origen: futuro.result() for origen, futuro in futuros.items()}
+    else:
+        leidas = {origen: _leer(fuentes[origen], mes) for origen in orden}
+
+    citas: List[Dict[str, Any]] = []
+    fuentes_citas: List[str] = []
+    origenes: Dict[str, str] = {}
+    ubicaciones: Dict[str, List[str]] = {}
+    for origen in orden:
+        ultimas: Dict[str, Dict[str, Any]] = {}
+        sin_id: List[Dict[str, Any]] = []
+        for registro in leidas[origen]:
+            id_cita = str(registro.get('id') or '').strip()
+            if id_cita:
+                # Última versión, en la posición de la primera.
+                ultimas[id_cita] = registro
+            else:
+                sin_id.append(registro)
+        for id_cita, registro in ultimas.items():
+            ubicaciones.setdefault(id_cita, []).append(origen)
+            if id_cita not in origenes:
+                origenes[id_cita] = origen
+                citas.append(registro)
+        citas.extend(sin_id)
+        fuentes_citas.extend([origen] * (len(citas) - len(fuentes_citas)))
+
+    total_leidas = sum(len(registros) for registros in leidas.values())
+    return {
+        'citas': citas,
+        'fuentes': fuentes_citas,
+        'origenes': origenes,
+        'ubicaciones': ubicaciones,
+        'estadisticas': {
+            'leidas': {origen: len(leidas[origen]) for origen in orden},
+            'total': len(citas),
+            'repetidas': sum(1 for lugares in ubicaciones.values() if len(lugares) > 1),
+            'descartadas': total_leidas - len(citas),
+            },
+        }
+
+
+def _ubicaciones(ruta_base: str, id_cita: str, fusion: Optional[Dict[str, Any]]) -> List[str]:
+    if fusion is None:
+        fusion = cargar(ruta_base)
+    return list(fusion['ubicaciones'].get(id_cita, []))
+
+
+def eliminar(
+    ruta_base: str, id_cita: Any, fusion: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, bool]:
+    """
+        Elimina una cita de todos los archivos que la contienen (si quedara
+        en alguno, volvería a aparecer en la vista unida). Los demás archivos
+        no se reescriben.
+        Args:
+            ruta_base (str): Ruta base sin extensión.
+            id_cita (Any): Id de la cita.
+            fusion (Optional[Dict[str, Any]]): Resultado de cargar() a usar
+            como mapa de ubicaciones; si no se da, se carga.
+        Returns:
+            Dict[str, bool]: origen → si se eliminó en ese archivo.
+    """
+    id_cita = str(id_cita).strip()
+    resultado = dict.fromkeys(ORIGENES, False)
+    archivos = rutas(ruta_base)
+    for origen in _ubicaciones(ruta_base, id_cita, fusion):
+        # Un archivo con anexos repetidos puede tener el id más de una vez.
+        while gestor_datos_citas.eliminar_registro(archivos[origen], 'id', id_cita):
+            resultado[origen] = True
+    return resultado
+
+
+def actualizar(
+    ruta_base: str,
+    id_cita: Any,
+    cambios: Dict[str, Any],
+    fusion: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+    """
+        Actualiza una cita en el archivo que la aporta a la vista unida
+        (el de más precedencia que la contiene); solo se reescribe ese archivo.
+        Args:
+            ruta_base (str): Ruta base sin extensión.
+            id_cita (Any): Id de la cita.
+            cambios (Dict[str, Any]): Campos a modificar con su nuevo valor.
+            fusion (Optional[Dict[str, Any]]): Resultado de cargar(); si no
+            se da, se carga.
+        Returns:
+            Optional[Dict[str, Any]]: La cita actualizada o None si no existe.
+    """
+    id_cita = str(id_cita).strip()
+    if fusion is None:
+        fusion = cargar(ruta_base)
+    origen = fusion['origenes'].get(id_cita)
+    if origen is None:
+        return None
+    return gestor_datos_citas.actualizar_registro(
+        rutas(ruta_base)[origen], 'id', id_cita, cambios
+        )
+
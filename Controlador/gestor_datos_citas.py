@@ -1,9 +1,6 @@
 # -*- coding: utf-8 -*-
 
-import csv
-import json
-import os
-from typing import Any, Dict, List
+from Controlador import almacen, bloqueo, fechas
 
 # Se define el orden de las columnas para los archivos.
 # Se añade 'tipo_documento' como nuevo campo.
@@ -17,68 +14,63 @@ CAMPOS = [
         'estado'
         ]
 
-def inicializar_archivo(filepath: str) -> None:
-    """
-        Verifica si un archivo de datos existe. Si no, lo crea con las cabeceras.
-        Esta función es clave para evitar errores en la primera ejecución del programa.
-        Args:
-            filepath (str): La ruta completa al archivo de datos (e.g., 'data/.csv').
-        Returns:
-            None
-    """
-    directorio = os.path.dirname(filepath)
-    if directorio and not os.path.exists(directorio):
-        os.makedirs(directorio)
+# Tabla e índices usados cuando el almacenamiento es SQLite (.db).
+TABLA = 'citas'
+INDICES_SQLITE = [
+    ('id',),
+    ('documento_paciente',),
+    ('documento_medico', 'fecha', 'hora'),
+    ('fecha',),
+    ]
 
-    if not os.path.exists(filepath):
-        if filepath.endswith('.csv'):
-            with open(filepath, mode='w', newline='', encoding='utf-8') as csv_file:
-                writer = csv.DictWriter(csv_file, fieldnames=CAMPOS)
-                writer.writeheader()
-        elif filepath.endswith('.json'):
-            with open(filepath, mode='w', encoding='utf-8') as json_file:
-                json.dump([], json_file)
+# Esquema con que el motor de almacenamiento maneja la entidad; los
+# registros leídos quedan en memoria con su tipo compacto.
+ESQUEMA = almacen.esquema('Cita', CAMPOS, TABLA, INDICES_SQLITE, campo_particion='fecha')
+Cita = ESQUEMA['tipo']
 
-def cargar_datos(filepath: str) -> List[Dict[str, Any]]:
-    """
-        Carga los datos desde un archivo (CSV o JSON)
-        y los retorna como una lista de diccionarios.
-        Args:
-            filepath (str): La ruta al archivo de datos.
-        Returns:
-            List[Dict[str, Any]]: Una lista de diccionarios con los
-            datos de los aprendices.
-    """
-    inicializar_archivo(filepath)
+inicializar_archivo = almacen.ligar(ESQUEMA, almacen.inicializar_archivo)
+cargar_datos = almacen.ligar(ESQUEMA, almacen.cargar_datos)
+iterar_datos = almacen.ligar(ESQUEMA, almacen.iterar_datos)
+cargar_mes = almacen.ligar(ESQUEMA, almacen.cargar_mes)
+guardar_datos = almacen.ligar(ESQUEMA, almacen.guardar_datos)
+agregar_registro = almacen.ligar(ESQUEMA, almacen.agregar_registro)
+agregar_registros = almacen.ligar(ESQUEMA, almacen.agregar_registros)
+indice = almacen.ligar(ESQUEMA, almacen.indice)
+buscar_registro = almacen.ligar(ESQUEMA, almacen.buscar_registro)
+buscar_registros = almacen.ligar(ESQUEMA, almacen.buscar_registros)
+derivado = almacen.ligar(ESQUEMA, almacen.derivado)
+bloqueo_escritura = almacen.bloqueo_escritura
+siguiente_id = almacen.ligar(ESQUEMA, almacen.siguiente_id)
+reservar_ids = almacen.ligar(ESQUEMA, almacen.reservar_ids)
+existe_valor = almacen.ligar(ESQUEMA, almacen.existe_valor)
+valores = almacen.ligar(ESQUEMA, almacen.valores)
+actualizar_registro = almacen.ligar(ESQUEMA, almacen.actualizar_registro)
+eliminar_registro = almacen.ligar(ESQUEMA, almacen.eliminar_registro)
+compactar_datos = almacen.ligar(ESQUEMA, almacen.compactar_datos)
+particionar = almacen.ligar(ESQUEMA, almacen.particionar)
 
-    try:
-        if filepath.endswith('.csv'):
-            with open(filepath, mode='r', newline='', encoding='utf-8') as csv_file:
-                lector = csv.DictReader(csv_file)
-                return list(lector)
-        elif filepath.endswith('.json'):
-            with open(filepath, mode='r', encoding='utf-8') as json_file:
-                datos = json.load(json_file)
-                return datos if isinstance(datos, list) else []
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []
 
-def guardar_datos(filepath: str, datos: List[Dict[str, Any]]) -> None:
+def normalizar_fechas(filepath: str) -> int:
     """
-        Guarda una lista de diccionarios en un archivo (CSV o JSON),
-        sobrescribiendo el contenido.
+        Migración de una sola vez: reescribe las fechas guardadas en forma
+        canónica (YYYY-MM-DD), así las lecturas posteriores ya no tienen que
+        convertirlas. Las fechas que no se pueden interpretar no se tocan.
+        Si ninguna fecha cambia, el archivo no se reescribe.
         Args:
-            filepath (str): La ruta al archivo donde se guardarán los datos.
-            datos (List[Dict[str, Any]]): La lista de aprendices a guardar.
+            filepath (str): La ruta al archivo (o carpeta) de datos.
         Returns:
-            None
+            int: Cantidad de citas cuya fecha se reescribió.
     """
-    if filepath.endswith('.csv'):
-        with open(filepath, mode='w', newline='', encoding='utf-8') as csv_file:
-            writer = csv.DictWriter(csv_file, fieldnames=CAMPOS)
-            writer.writeheader()
-            writer.writerows(datos)
-    elif filepath.endswith('.json'):
-        with open(filepath, mode='w', encoding='utf-8') as json_file:
-            json.dump(datos, json_file, indent=4)
-
+    inicializar_archivo(filepath)
+    with bloqueo.exclusivo(filepath):
+        datos = cargar_datos(filepath)
+        cambiadas = 0
+        for registro in datos:
+            fecha = registro.get('fecha')
+            canonica = fechas.normalizar(fecha)
+            if fecha is not None and canonica != fecha:
+                registro['fecha'] = canonica
+                cambiadas += 1
+        if cambiadas:
+            guardar_datos(filepath, datos)
+    return cambiadas
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Persistencia en SQLite.
+
+Tercer formato de almacenamiento, junto a CSV y JSON. Cada archivo .db
+guarda una tabla por tipo de registro (citas, medicos, pacientes) con una
+columna de texto por campo, de modo que los registros leídos tienen la misma
+forma que los de un CSV. Se usa modo WAL y consultas parametrizadas sobre
+una conexión persistente por hilo, así sqlite3 reutiliza las sentencias ya
+compiladas entre llamadas.
+
+A diferencia de los archivos planos, actualizar o eliminar un registro
+toca una sola fila y las búsquedas por campo usan los índices de la tabla.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Extensiones de archivo que se tratan como base de datos SQLite.
+EXTENSIONES = ('.db', '.sqlite', '.sqlite3')
+
+_locales = threading.local()
+
+
+def es_sqlite(filepath: str) -> bool:
+    """
+        Indica si la ruta corresponde a una base de datos SQLite.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            bool: True si la extensión es de SQLite.
+    """
+    return filepath.lower().endswith(EXTENSIONES)
+
+
+def _conexion(filepath: str) -> sqlite3.Connection:
+    """
+        Conexión persistente del hilo actual para la base de datos dada.
+    """
+    conexiones = getattr(_locales, 'conexiones', None)
+    if conexiones is None:
+        conexiones = _locales.conexiones = {}
+    clave = os.path.abspath(filepath)
+    conexion = conexiones.get(clave)
+    if conexion is not None and not os.path.exists(clave):
+        # El archivo fue borrado: la conexión apunta a una base huérfana.
+        conexion.close()
+        conexion = None
+    if conexion is None:
+        directorio = os.path.dirname(filepath)
+        if directorio and not os.path.exists(directorio):
+            os.makedirs(directorio)
+        conexion = sqlite3.connect(clave, timeout=30)
+        conexion.row_factory = sqlite3.Row
+        conexion.execute('PRAGMA journal_mode=WAL')
+        conexion.execute('PRAGMA synchronous=NORMAL')
+        conexiones[clave] = conexion
+    return conexion
+
+
+def cerrar_conexiones() -> None:
+    """
+        Cierra las conexiones abiertas por el hilo actual.
+        Returns:
+            None
+    """
+    conexiones = getattr(_locales, 'conexiones', {})
+    for conexion in conexiones.values():
+        conexion.close()
+    conexiones.clear()
+    getattr(_locales, 'tablas', set()).clear()
+
+
+def _texto(valor: Any) -> str:
+    # Mismo criterio que csv.DictWriter: None se guarda como vacío.
+    return '' if valor is None else str(valor)
+
+
+def _fila(registro: Dict[str, Any], campos: Sequence[str]) -> Tuple[str, ...]:
+    return tuple(_texto(registro.get(campo)) for campo in campos)
+
+
+def _columnas(campos: Iterable[str]) -> str:
+    return ', '.join(f'"{campo}"' for campo in campos)
+
+
+def _condicion(filtros: Dict[str, Any]) -> Tuple[str, List[str]]:
+    partes = [f'"{campo}" = ?' for campo in filtros]
+    valores = [str(valor).strip() for valor in filtros.values()]
+    return ' AND '.join(partes) or '1', valores
+
+
+def inicializar(
+    filepath: str,
+    tabla: str,
+    campos: Sequence[str],
+    indices: Sequence[Tuple[str, ...]] = ()
+    ) -> None:
+    """
+        Crea la tabla y sus índices si todavía no existen.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas, en orden.
+            indices (Sequence[Tuple[str, ...]]): Columnas de cada índice.
+        Returns:
+            None
+    """
+    creadas = getattr(_locales, 'tablas', None)
+    if creadas is None:
+        creadas = _locales.tablas = set()
+    clave = (os.path.abspath(filepath), tabla)
+    if clave in creadas and os.path.exists(clave[0]):
+        return
+    conexion = _conexion(filepath)
+    with conexion:
+        definicion = ', '.join(f'"{campo}" TEXT' for campo in campos)
+        conexion.execute(f'CREATE TABLE IF NOT EXISTS "{tabla}" ({definicion})')
+        for columnas in indices:
+            nombre = f"idx_{tabla}_{'_'.join(columnas)}"
+            conexion.execute(
+                f'CREATE INDEX IF NOT EXISTS "{nombre}" '
+                f'ON "{tabla}" ({_columnas(columnas)})'
+                )
+    creadas.add(clave)
+
+
+def cargar(filepath: str, tabla: str, campos: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+        Lee todos los registros de la tabla en orden de inserción.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas a leer.
+        Returns:
+            List[Dict[str, Any]]: Registros como diccionarios.
+    """
+    cursor = _conexion(filepath).execute(
+        f'SELECT {_columnas(campos)} FROM "{tabla}" ORDER BY rowid'
+        )
+    return [dict(fila) for fila in cursor]
+
+
+def guardar(
+    filepath: str, tabla: str, campos: Sequence[str], datos: List[Dict[str, Any]]
+    ) -> None:
+    """
+        Reemplaza todo el contenido de la tabla en una sola transacción.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas, en orden.
+            datos (List[Dict[str, Any]]): Registros a guardar.
+        Returns:
+            None
+    """
+    conexion = _conexion(filepath)
+    marcadores = ', '.join('?' for _ in campos)
+    with conexion:
+        conexion.execute(f'DELETE FROM "{tabla}"')
+        conexion.executemany(
+            f'INSERT INTO "{tabla}" ({_columnas(campos)}) VALUES ({marcadores})',
+            (_fila(registro, campos) for registro in datos)
+            )
+
+
+def insertar(
+    filepath: str, tabla: str, campos: Sequence[str], registro: Dict[str, Any]
+    ) -> Dict[str, str]:
+    """
+        Inserta un registro al final de la tabla.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas, en orden.
+            registro (Dict[str, Any]): Registro a insertar.
+        Returns:
+            Dict[str, str]: El registro tal como se leerá de la tabla.
+    """
+    fila = _fila(registro, campos)
+    marcadores = ', '.join('?' for _ in campos)
+    conexion = _conexion(filepath)
+    with conexion:
+        conexion.execute(
+            f'INSERT INTO "{tabla}" ({_columnas(campos)}) VALUES ({marcadores})', fila
+            )
+    return dict(zip(campos, fila))
+
+
+def insertar_varios(
+    filepath: str, tabla: str, campos: Sequence[str], registros: Iterable[Dict[str, Any]]
+    ) -> None:
+    """
+        Inserta varios registros al final de la tabla en una sola transacción
+        (si falla alguno, no queda ninguno).
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas, en orden.
+            registros (Iterable[Dict[str, Any]]): Registros a insertar.
+        Returns:
+            None
+    """
+    marcadores = ', '.join('?' for _ in campos)
+    conexion = _conexion(filepath)
+    with conexion:
+        conexion.executemany(
+            f'INSERT INTO "{tabla}" ({_columnas(campos)}) VALUES ({marcadores})',
+            (_fila(registro, campos) for registro in registros)
+            )
+
+
+def buscar(
+    filepath: str,
+    tabla: str,
+    campos: Sequence[str],
+    filtros: Dict[str, Any],
+    limite: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+    """
+        Registros cuyos campos coinciden exactamente con los filtros.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas a leer.
+            filtros (Dict[str, Any]): campo → valor buscado.
+            limite (Optional[int]): Máximo de registros a retornar.
+        Returns:
+            List[Dict[str, Any]]: Registros encontrados, en orden de inserción.
+    """
+    donde, valores = _condicion(filtros)
+    consulta = f'SELECT {_columnas(campos)} FROM "{tabla}" WHERE {donde} ORDER BY rowid'
+    if limite is not None:
+        consulta += f' LIMIT {int(limite)}'
+    cursor = _conexion(filepath).execute(consulta, valores)
+    return [dict(fila) for fila in cursor]
+
+
+def iterar(
+    filepath: str,
+    tabla: str,
+    campos: Sequence[str],
+    filtros: Optional[Dict[str, Any]] = None
+    ) -> Iterator[Dict[str, Any]]:
+    """
+        Recorre los registros que coinciden con los filtros sin cargarlos
+        todos en memoria (se leen del cursor a medida que se piden).
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas a leer.
+            filtros (Optional[Dict[str, Any]]): campo → valor buscado.
+        Returns:
+            Iterator[Dict[str, Any]]: Registros en orden de inserción.
+    """
+    donde, valores = _condicion(filtros or {})
+    cursor = _conexion(filepath).execute(
+        f'SELECT {_columnas(campos)} FROM "{tabla}" WHERE {donde} ORDER BY rowid', valores
+        )
+    for fila in cursor:
+        yield dict(fila)
+
+
+def actualizar(
+    filepath: str,
+    tabla: str,
+    campos: Sequence[str],
+    filtros: Dict[str, Any],
+    cambios: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+    """
+        Actualiza el primer registro que coincide con los filtros.
+        Los campos de 'cambios' que no son columnas de la tabla se ignoran.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            campos (Sequence[str]): Columnas de la tabla.
+            filtros (Dict[str, Any]): campo → valor del registro a actualizar.
+            cambios (Dict[str, Any]): campo → nuevo valor.
+        Returns:
+            Optional[Dict[str, Any]]: El registro actualizado o None si no existe.
+    """
+    donde, valores = _condicion(filtros)
+    conexion = _conexion(filepath)
+    with conexion:
+        fila = conexion.execute(
+            f'SELECT rowid FROM "{tabla}" WHERE {donde} ORDER BY rowid LIMIT 1', valores
+            ).fetchone()
+        if fila is None:
+            return None
+        columnas = [campo for campo in cambios if campo in campos]
+        if columnas:
+            asignaciones = ', '.join(f'"{campo}" = ?' for campo in columnas)
+            conexion.execute(
+                f'UPDATE "{tabla}" SET {asignaciones} WHERE rowid = ?',
+                [_texto(cambios[campo]) for campo in columnas] + [fila[0]]
+                )
+        registro = conexion.execute(
+            f'SELECT {_columnas(campos)} FROM "{tabla}" WHERE rowid = ?', (fila[0],)
+            ).fetchone()
+    return dict(registro)
+
+
+def eliminar(
+    filepath: str, tabla: str, filtros: Dict[str, Any]
+    ) -> bool:
+    """
+        Elimina el primer registro que coincide con los filtros.
+        Args:
+            filepath (str): Ruta de la base de datos.
+            tabla (str): Nombre de la tabla.
+            filtros (Dict[str, Any]): campo → valor del registro a eliminar.
+        Returns:
+            bool: True si se eliminó un registro.
+    """
+    donde, valores = _condicion(filtros)
+    conexion = _conexion(filepath)
+    with conexion:
+        cursor = conexion.execute(
+            f'DELETE FROM "{tabla}" WHERE rowid = '
+            f'(SELECT rowid FROM "{tabla}" WHERE {donde} ORDER BY rowid LIMIT 1)',
+            valores
+            )
+    return cursor.rowcount > 0
+
+
+def compactar(filepath: str) -> None:
+    """
+        Traslada el WAL a la base de datos y recupera el espacio libre.
+        Args:
+            filepath (str): Ruta de la base de datos.
+        Returns:
+            None
+    """
+    conexion = _conexion(filepath)
+    conexion.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    conexion.execute('VACUUM')
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lectura de Archivos.
+
+Lectores en streaming (generadores) para los archivos de datos: entregan
+los registros de a uno, sin cargar el archivo completo en memoria, de modo
+que una consulta sobre un historial muy grande usa memoria constante.
+Soporta CSV, arreglos JSON (decodificados por partes) y JSON-lines (un
+registro por línea).
+
+Los filtros se aplican lo antes posible (predicate push-down): en CSV se
+comparan las columnas antes de construir el diccionario y en JSON-lines se
+descartan las líneas que no pueden coincidir sin decodificarlas.
+
+Cada lectura ve una foto del archivo: se lee solo hasta el tamaño que tenía
+al abrirlo (con bloqueo compartido), así lo que otro proceso anexe mientras
+tanto no aparece a medias.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import codecs
+import csv
+import json
+import os
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from Controlador import bloqueo
+
+# Bytes que se leen por vez al decodificar un arreglo JSON.
+TAMANO_BLOQUE = 64 * 1024
+
+Registro = Dict[str, Any]
+Predicado = Callable[[Registro], bool]
+
+
+def valor_campo(registro: Registro, campo: str) -> str:
+    """
+        Valor de un campo normalizado para comparar (texto sin espacios;
+        None o ausente se toma como vacío).
+        Args:
+            registro (Registro): Registro a consultar.
+            campo (str): Nombre del campo.
+        Returns:
+            str: El valor normalizado.
+    """
+    valor = registro.get(campo)
+    return '' if valor is None else str(valor).strip()
+
+
+def _normalizar(filtros: Optional[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    return [(campo, str(valor).strip()) for campo, valor in (filtros or {}).items()]
+
+
+def coincide(registro: Registro, filtros: Optional[Dict[str, Any]]) -> bool:
+    """
+        Indica si un registro tiene exactamente los valores de los filtros.
+        Args:
+            registro (Registro): Registro a evaluar.
+            filtros (Optional[Dict[str, Any]]): Campo → valor buscado.
+        Returns:
+            bool: True si todos los campos coinciden.
+    """
+    return all(valor_campo(registro, campo) == valor for campo, valor in _normalizar(filtros))
+
+
+def filtrar(
+    registros: Iterator[Registro],
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Predicado] = None
+    ) -> Iterator[Registro]:
+    """
+        Deja pasar solo los registros que cumplen los filtros y el predicado.
+        Args:
+            registros (Iterator[Registro]): Registros de entrada.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto.
+            predicado (Optional[Predicado]): Condición adicional.
+        Returns:
+            Iterator[Registro]: Los registros que cumplen.
+    """
+    condiciones = _normalizar(filtros)
+    for registro in registros:
+        if all(valor_campo(registro, campo) == valor for campo, valor in condiciones) and (
+            predicado is None or predicado(registro)):
+            yield registro
+
+
+def _abrir(filepath: str) -> Tuple[IO[bytes], int]:
+    # Abre el archivo en binario y toma su tamaño actual como límite. Se
+    # hace con bloqueo compartido para no tomar un anexo a medio escribir;
+    # el resto de la lectura ya no necesita el bloqueo.
+    if not os.path.exists(filepath):
+        raise FileNotFoundError(filepath)
+    with bloqueo.compartido(filepath):
+        archivo = open(filepath, 'rb')
+        return archivo, os.fstat(archivo.fileno()).st_size
+
+
+def _lineas(archivo: IO[bytes], limite: int) -> Iterator[str]:
+    # Líneas de texto (con su fin de línea) hasta el byte 'limite'.
+    leidos = 0
+    for linea in archivo:
+        if leidos + len(linea) > limite:
+            linea = linea[:limite - leidos]
+        leidos += len(linea)
+        if linea:
+            yield linea.decode('utf-8')
+        if leidos >= limite:
+            return
+
+
+def iterar_csv(
+    filepath: str,
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Predicado] = None
+    ) -> Iterator[Dict[str, Optional[str]]]:
+    """
+        Recorre un CSV fila por fila, como csv.DictReader.
+        Args:
+            filepath (str): Ruta al archivo CSV.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto; se
+            evalúan sobre las columnas antes de armar el diccionario.
+            predicado (Optional[Predicado]): Condición adicional.
+        Returns:
+            Iterator[Dict[str, Optional[str]]]: Filas que cumplen.
+    """
+    archivo, limite = _abrir(filepath)
+    with archivo:
+        lector = csv.reader(_lineas(archivo, limite))
+        cabecera = next(lector, None)
+        if not cabecera:
+            return
+        posiciones = []
+        for campo, valor in _normalizar(filtros):
+            if campo in cabecera:
+                posiciones.append((cabecera.index(campo), valor))
+            elif valor:
+                # Columna inexistente: ninguna fila puede coincidir.
+                return
+        ancho = len(cabecera)
+        for fila in lector:
+            if not fila:
+                continue
+            if any(
+                (fila[i].strip() if i < len(fila) else '') != valor
+                for i, valor in posiciones
+                ):
+                continue
+            registro: Dict[Any, Any] = dict(zip(cabecera, fila))
+            if len(fila) < ancho:
+                registro.update(dict.fromkeys(cabecera[len(fila):]))
+            elif len(fila) > ancho:
+                registro[None] = fila[ancho:]
+            if predicado is None or predicado(registro):
+                yield registro
+
+
+def iterar_json(
+    filepath: str,
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Predicado] = None
+    ) -> Iterator[Registro]:
+    """
+        Recorre un arreglo JSON elemento por elemento, decodificándolo por
+        bloques en lugar de usar json.load sobre el archivo completo.
+        Si el contenido no es un arreglo o está dañado, la lectura termina
+        en el último registro válido.
+        Args:
+            filepath (str): Ruta al archivo JSON.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto.
+            predicado (Optional[Predicado]): Condición adicional.
+        Returns:
+            Iterator[Registro]: Registros (diccionarios) que cumplen.
+    """
+    archivo, limite = _abrir(filepath)
+    with archivo:
+        yield from filtrar(_elementos_json(archivo, limite), filtros, predicado)
+
+
+def _elementos_json(archivo: IO[bytes], limite: int) -> Iterator[Registro]:
+    decodificador = json.JSONDecoder()
+    texto = codecs.getincrementaldecoder('utf-8')()
+    restante = limite
+    buffer = ''
+    posicion = 0
+    fin = False
+
+    def rellenar() -> bool:
+        # Agrega otro bloque al buffer; False si ya no hay más datos.
+        nonlocal buffer, posicion, restante, fin
+        if fin:
+            return False
+        bloque = archivo.read(min(TAMANO_BLOQUE, restante))
+        restante -= len(bloque)
+        fin = not bloque or restante <= 0
+        buffer = buffer[posicion:] + texto.decode(bloque, final=fin)
+        posicion = 0
+        return True
+
+    def siguiente_caracter() -> str:
+        # Salta espacios y retorna el próximo carácter significativo.
+        nonlocal posicion
+        while True:
+            while posicion < len(buffer) and buffer[posicion].isspace():
+                posicion += 1
+            if posicion < len(buffer):
+                return buffer[posicion]
+            if not rellenar():
+                return ''
+
+    if siguiente_caracter() != '[':
+        return
+    posicion += 1
+    if siguiente_caracter() == ']':
+        return
+    while True:
+        siguiente_caracter()
+        try:
+            elemento, final = decodificador.raw_decode(buffer, posicion)
+            completo = final < len(buffer) or fin
+        except json.JSONDecodeError:
+            completo = False
+        if not completo:
+            # El elemento sigue en el próximo bloque (o el archivo terminó).
+            if not rellenar():
+                return
+            continue
+        posicion = final
+        if isinstance(elemento, dict):
+            yield elemento
+        separador = siguiente_caracter()
+        if separador != ',':
+            return
+        posicion += 1
+
+
+def _descartable(filtros: List[Tuple[str, str]]) -> Callable[[str], bool]:
+    # Textos que deben aparecer tal cual en la línea para que pueda haber
+    # coincidencia. Solo se usan valores que json.dumps no escapa.
+    necesarios = [
+        valor for _, valor in filtros
+        if valor and valor.isascii() and valor.isprintable()
+        and '"' not in valor and '\\' not in valor
+        ]
+    return lambda linea: any(valor not in linea for valor in necesarios)
+
+
+def iterar_jsonl(
+    filepath: str,
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Predicado] = None
+    ) -> Iterator[Registro]:
+    """
+        Recorre un archivo JSON-lines (un objeto JSON por línea). Las líneas
+        vacías o dañadas se ignoran.
+        Args:
+            filepath (str): Ruta al archivo .jsonl.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto; las
+            líneas que no contienen el valor buscado no se decodifican.
+            predicado (Optional[Predicado]): Condición adicional.
+        Returns:
+            Iterator[Registro]: Registros que cumplen.
+    """
+    condiciones = _normalizar(filtros)
+    descartable = _descartable(condiciones)
+    archivo, limite = _abrir(filepath)
+    with archivo:
+        for linea in _lineas(archivo, limite):
+            if not linea.strip() or descartable(linea):
+                continue
+            try:
+                registro = json.loads(linea)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(registro, dict) and all(
+                valor_campo(registro, campo) == valor for campo, valor in condiciones
+                ) and (predicado is None or predicado(registro)):
+                yield registro
+
+
+def iterar_posiciones_jsonl(filepath: str) -> Iterator[Tuple[int, Registro]]:
+    """
+        Recorre un JSON-lines entregando cada registro junto con la
+        posición (en bytes) donde empieza su línea, para armar índices que
+        luego se leen con leer_linea().
+        Args:
+            filepath (str): Ruta al archivo .jsonl.
+        Returns:
+            Iterator[Tuple[int, Registro]]: Pares (posición, registro).
+    """
+    archivo, limite = _abrir(filepath)
+    with archivo:
+        posicion = 0
+        for linea in archivo:
+            if posicion + len(linea) > limite:
+                return
+            inicio = posicion
+            posicion += len(linea)
+            if not linea.strip():
+                continue
+            try:
+                registro = json.loads(linea)
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if isinstance(registro, dict):
+                yield inicio, registro
+
+
+def leer_linea(filepath: str, posicion: int) -> Optional[Registro]:
+    """
+        Lee un solo registro de un JSON-lines saltando directo a su línea,
+        sin recorrer el resto del archivo.
+        Args:
+            filepath (str): Ruta al archivo .jsonl.
+            posicion (int): Posición (en bytes) donde empieza la línea.
+        Returns:
+            Optional[Registro]: El registro o None si la línea no es válida.
+    """
+    try:
+        with open(filepath, 'rb') as archivo:
+            archivo.seek(posicion)
+            registro = json.loads(archivo.readline())
+    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return registro if isinstance(registro, dict) else None
+
+
+def iterar(
+    filepath: str,
+    filtros: Optional[Dict[str, Any]] = None,
+    predicado: Optional[Predicado] = None
+    ) -> Iterator[Registro]:
+    """
+        Recorre un archivo de datos según su extensión (.csv, .json, .jsonl).
+        Un archivo inexistente o de otro formato no produce registros.
+        Args:
+            filepath (str): Ruta al archivo de datos.
+            filtros (Optional[Dict[str, Any]]): Campo → valor exacto.
+            predicado (Optional[Predicado]): Condición adicional.
+        Returns:
+            Iterator[Registro]: Registros que cumplen.
+    """
+    lectores = {'.csv': iterar_csv, '.json': iterar_json, '.jsonl': iterar_jsonl}
+    lector = lectores.get(os.path.splitext(filepath)[1].lower())
+    if lector is None:
+        return iter(())
+    return _si_existe(lector(filepath, filtros, predicado))
+
+
+def _si_existe(registros: Iterator[Registro]) -> Iterator[Registro]:
+    # El archivo se abre al pedir el primer registro: si no existe, no hay
+    # registros.
+    try:
+        yield from registros
+    except FileNotFoundError:
+        return
@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Almacenamiento Particionado por Mes.
+
+Organiza un archivo de citas como una carpeta con un segmento por mes
+(2025-01.jsonl, 2025-02.jsonl, ...) y un manifiesto que lista los meses y
+el formato de los segmentos (csv, json o jsonl). Cargar un mes abre solo su
+segmento, así las consultas por mes dependen del tamaño del mes y no de
+todo el historial. Los meses viejos se pueden archivar comprimidos con gzip
+(2024-01.jsonl.gz); se siguen pudiendo leer y se descomprimen solos si se
+vuelve a escribir en ellos.
+
+Este módulo solo maneja la estructura (manifiesto, rutas, archivado); la
+lectura y escritura de cada segmento la hace el gestor de datos, que trata
+cada segmento como un archivo normal.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional
+
+from Controlador import bloqueo, escritura, fechas
+
+MANIFIESTO = 'manifiesto.json'
+FORMATOS = ('csv', 'json', 'jsonl')
+FORMATO_POR_DEFECTO = 'jsonl'
+# Segmento para las citas cuya fecha no se puede interpretar.
+SIN_FECHA = 'sin-fecha'
+
+
+def es_particionado(filepath: str) -> bool:
+    """
+        Indica si la ruta corresponde a un almacenamiento particionado: una
+        carpeta existente o una ruta terminada en separador ('data/citas/').
+        Args:
+            filepath (str): Ruta del almacenamiento.
+        Returns:
+            bool: True si es una carpeta de segmentos.
+    """
+    return filepath.endswith(('/', os.sep)) or os.path.isdir(filepath)
+
+
+def mes_de_fecha(fecha: Any) -> str:
+    """
+        Mes ('YYYY-MM') al que pertenece una fecha (en cualquiera de los
+        formatos que acepta fechas.partes).
+        Args:
+            fecha (Any): Fecha de la cita.
+        Returns:
+            str: El mes o SIN_FECHA si no se puede interpretar.
+    """
+    partes = fechas.partes(fecha)
+    if partes is None:
+        return SIN_FECHA
+    return f"{partes[0]:04d}-{partes[1]:02d}"
+
+
+def _ruta_manifiesto(ruta: str) -> str:
+    return os.path.join(ruta, MANIFIESTO)
+
+
+def leer_manifiesto(ruta: str) -> Dict[str, Any]:
+    """
+        Lee el manifiesto de la carpeta.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+        Returns:
+            Dict[str, Any]: {'formato': str, 'meses': {mes: {'archivado': bool}}}.
+    """
+    try:
+        with open(_ruta_manifiesto(ruta), 'r', encoding='utf-8') as archivo:
+            manifiesto = json.load(archivo)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifiesto = {}
+    if not isinstance(manifiesto, dict):
+        manifiesto = {}
+    if manifiesto.get('formato') not in FORMATOS:
+        manifiesto['formato'] = FORMATO_POR_DEFECTO
+    if not isinstance(manifiesto.get('meses'), dict):
+        manifiesto['meses'] = {}
+    return manifiesto
+
+
+def _guardar_manifiesto(ruta: str, manifiesto: Dict[str, Any]) -> None:
+    manifiesto['meses'] = dict(sorted(manifiesto['meses'].items()))
+    escritura.guardar_json(_ruta_manifiesto(ruta), manifiesto)
+
+
+def inicializar(ruta: str, formato: Optional[str] = None) -> None:
+    """
+        Crea la carpeta y su manifiesto si todavía no existen.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            formato (Optional[str]): Formato de los segmentos (por defecto
+            jsonl). Solo se usa al crear la carpeta.
+        Returns:
+            None
+    """
+    if os.path.exists(_ruta_manifiesto(ruta)):
+        return
+    if formato is not None and formato not in FORMATOS:
+        raise ValueError(f"Formato de segmento no soportado: {formato}")
+    os.makedirs(ruta, exist_ok=True)
+    with bloqueo.exclusivo(ruta):
+        if os.path.exists(_ruta_manifiesto(ruta)):
+            return
+        _guardar_manifiesto(ruta, {'formato': formato or FORMATO_POR_DEFECTO, 'meses': {}})
+
+
+def ruta_segmento(ruta: str, mes: str, formato: str) -> str:
+    """
+        Ruta del segmento (sin comprimir) de un mes.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes 'YYYY-MM' o SIN_FECHA.
+            formato (str): Formato de los segmentos.
+        Returns:
+            str: Ruta del segmento.
+    """
+    return os.path.join(ruta, f"{mes}.{formato}")
+
+
+def meses(
+    ruta: str, desde: Optional[str] = None, hasta: Optional[str] = None
+    ) -> List[str]:
+    """
+        Meses con datos, en orden, opcionalmente dentro de un rango.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            desde (Optional[str]): Primer mes incluido ('YYYY-MM').
+            hasta (Optional[str]): Último mes incluido ('YYYY-MM').
+        Returns:
+            List[str]: Los meses.
+    """
+    return [
+        mes for mes in sorted(leer_manifiesto(ruta)['meses'])
+        if (desde is None or mes >= desde) and (hasta is None or mes <= hasta)
+        ]
+
+
+def registrar_mes(ruta: str, mes: str) -> str:
+    """
+        Prepara el segmento de un mes para escribir en él: lo agrega al
+        manifiesto si es nuevo y lo descomprime si estaba archivado.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes 'YYYY-MM' o SIN_FECHA.
+        Returns:
+            str: Ruta del segmento.
+    """
+    manifiesto = leer_manifiesto(ruta)
+    datos_mes = manifiesto['meses'].get(mes)
+    if datos_mes is not None and not datos_mes.get('archivado'):
+        return ruta_segmento(ruta, mes, manifiesto['formato'])
+    with bloqueo.exclusivo(ruta):
+        manifiesto = leer_manifiesto(ruta)
+        if manifiesto['meses'].get(mes, {}).get('archivado'):
+            desarchivar(ruta, mes)
+        elif mes not in manifiesto['meses']:
+            manifiesto['meses'][mes] = {'archivado': False}
+            _guardar_manifiesto(ruta, manifiesto)
+    return ruta_segmento(ruta, mes, manifiesto['formato'])
+
+
+def quitar_mes(ruta: str, mes: str) -> None:
+    """
+        Elimina un mes del manifiesto y borra su segmento.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes a quitar.
+        Returns:
+            None
+    """
+    with bloqueo.exclusivo(ruta):
+        manifiesto = leer_manifiesto(ruta)
+        if manifiesto['meses'].pop(mes, None) is None:
+            return
+        _guardar_manifiesto(ruta, manifiesto)
+        segmento = ruta_segmento(ruta, mes, manifiesto['formato'])
+        for archivo in (segmento, f"{segmento}.gz"):
+            if os.path.exists(archivo):
+                os.remove(archivo)
+
+
+def esta_archivado(ruta: str, mes: str) -> bool:
+    """
+        Indica si el segmento de un mes está comprimido.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes a consultar.
+        Returns:
+            bool: True si está archivado.
+    """
+    return bool(leer_manifiesto(ruta)['meses'].get(mes, {}).get('archivado'))
+
+
+def archivar(ruta: str, mes: str) -> bool:
+    """
+        Comprime con gzip el segmento de un mes (ej. meses ya cerrados que
+        solo se consultan). El segmento sin comprimir se borra.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes a archivar.
+        Returns:
+            bool: True si se archivó; False si no existe o ya estaba archivado.
+    """
+    with bloqueo.exclusivo(ruta):
+        manifiesto = leer_manifiesto(ruta)
+        datos_mes = manifiesto['meses'].get(mes)
+        if datos_mes is None or datos_mes.get('archivado'):
+            return False
+        segmento = ruta_segmento(ruta, mes, manifiesto['formato'])
+        with bloqueo.exclusivo(segmento):
+            if os.path.exists(segmento):
+                def comprimir(destino):
+                    with open(segmento, 'rb') as origen, gzip.GzipFile(
+                        fileobj=destino, mode='wb', mtime=0) as comprimido:
+                        shutil.copyfileobj(origen, comprimido)
+                escritura.escribir_atomico(f"{segmento}.gz", comprimir, binario=True)
+            datos_mes['archivado'] = True
+            _guardar_manifiesto(ruta, manifiesto)
+            if os.path.exists(segmento):
+                os.remove(segmento)
+    return True
+
+
+def desarchivar(ruta: str, mes: str) -> bool:
+    """
+        Descomprime el segmento de un mes archivado.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes a descomprimir.
+        Returns:
+            bool: True si se descomprimió; False si no estaba archivado.
+    """
+    with bloqueo.exclusivo(ruta):
+        manifiesto = leer_manifiesto(ruta)
+        datos_mes = manifiesto['meses'].get(mes)
+        if datos_mes is None or not datos_mes.get('archivado'):
+            return False
+        segmento = ruta_segmento(ruta, mes, manifiesto['formato'])
+        with bloqueo.exclusivo(segmento):
+            if os.path.exists(f"{segmento}.gz"):
+                def descomprimir(destino):
+                    with gzip.open(f"{segmento}.gz", 'rb') as origen:
+                        shutil.copyfileobj(origen, destino)
+                escritura.escribir_atomico(segmento, descomprimir, binario=True)
+            datos_mes['archivado'] = False
+            _guardar_manifiesto(ruta, manifiesto)
+            if os.path.exists(f"{segmento}.gz"):
+                os.remove(f"{segmento}.gz")
+    return True
+
+
+def leer_archivado(ruta: str, mes: str) -> List[Dict[str, Any]]:
+    """
+        Lee los registros de un mes archivado sin descomprimirlo en disco.
+        Args:
+            ruta (str): Carpeta del almacenamiento particionado.
+            mes (str): Mes archivado.
+        Returns:
+            List[Dict[str, Any]]: Registros del mes.
+    """
+    formato = leer_manifiesto(ruta)['formato']
+    segmento = ruta_segmento(ruta, mes, formato)
+    try:
+        with bloqueo.compartido(segmento), gzip.open(f"{segmento}.gz", 'rb') as archivo:
+            texto = io.TextIOWrapper(archivo, encoding='utf-8', newline='')
+            if formato == 'csv':
+                return list(csv.DictReader(texto))
+            if formato == 'json':
+                datos = json.load(texto)
+                return datos if isinstance(datos, list) else []
+            registros = []
+            for linea in texto:
+                if linea.strip():
+                    try:
+                        registro = json.loads(linea)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(registro, dict):
+                        registros.append(registro)
+            return registros
+    except (FileNotFoundError, OSError, json.JSONDecodeError):
+        return []
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Secuencias de IDs.
+
+Asigna ids autoincrementales sin recorrer los registros: cada archivo de
+datos tiene al lado un archivo de secuencia (.citas.csv.seq) con el próximo
+id libre, que se lee y se actualiza con el bloqueo exclusivo del archivo de
+datos tomado, así dos terminales nunca reciben el mismo id. Se pueden
+reservar bloques de ids para importaciones masivas.
+
+Si el archivo de secuencia no existe o está dañado, se reconstruye una sola
+vez a partir del mayor id de los registros existentes.
+No contiene lógica de negocio, solo operaciones de I/O.
+"""
+
+import os
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from Controlador import bloqueo, escritura
+
+
+def ruta_secuencia(filepath: str) -> str:
+    """
+        Ruta del archivo de secuencia asociado a un archivo de datos.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+        Returns:
+            str: Ruta del archivo de secuencia (oculto, en la misma carpeta).
+    """
+    ruta = os.path.abspath(filepath)
+    return os.path.join(os.path.dirname(ruta), f".{os.path.basename(ruta)}.seq")
+
+
+def maximo_id(registros: Iterable[Dict[str, Any]]) -> int:
+    """
+        Mayor id numérico de los registros (los ids no numéricos se ignoran).
+        Args:
+            registros (Iterable[Dict[str, Any]]): Registros a recorrer.
+        Returns:
+            int: El mayor id o 0 si no hay ninguno.
+    """
+    maximo = 0
+    for registro in registros:
+        texto = str(registro.get('id') or '').strip()
+        if texto.isdigit():
+            maximo = max(maximo, int(texto))
+    return maximo
+
+
+def _leer(ruta: str) -> Optional[int]:
+    try:
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            texto = archivo.read().strip()
+    except FileNotFoundError:
+        return None
+    return int(texto) if texto.isdigit() and int(texto) > 0 else None
+
+
+def _escribir(ruta: str, siguiente: int) -> None:
+    # Se sobrescribe en el lugar: el contenido cabe en un bloque del disco.
+    # Si aun así quedara dañado, se reconstruye desde los registros.
+    descriptor = os.open(ruta, os.O_RDWR | os.O_CREAT, escritura.PERMISOS_POR_DEFECTO)
+    with os.fdopen(descriptor, 'r+', encoding='utf-8') as archivo:
+        archivo.write(f"{siguiente}\n")
+        archivo.truncate()
+        escritura.sincronizar(archivo, ruta)
+
+
+def reservar(
+    filepath: str, calcular_maximo: Callable[[], int], cantidad: int = 1
+    ) -> range:
+    """
+        Reserva 'cantidad' ids consecutivos para el archivo de datos.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            calcular_maximo (Callable[[], int]): Retorna el mayor id de los
+            registros existentes; solo se usa si hay que reconstruir la
+            secuencia.
+            cantidad (int): Cantidad de ids a reservar.
+        Returns:
+            range: Los ids reservados.
+    """
+    if cantidad < 1:
+        raise ValueError("Se debe reservar al menos un id.")
+    ruta = ruta_secuencia(filepath)
+    with bloqueo.exclusivo(filepath):
+        siguiente = _leer(ruta)
+        if siguiente is None:
+            siguiente = calcular_maximo() + 1
+        _escribir(ruta, siguiente + cantidad)
+    return range(siguiente, siguiente + cantidad)
+
+
+def siguiente(filepath: str, calcular_maximo: Callable[[], int]) -> int:
+    """
+        Reserva el próximo id del archivo de datos.
+        Args:
+            filepath (str): Ruta del archivo de datos.
+            calcular_maximo (Callable[[], int]): Igual que en reservar().
+        Returns:
+            int: El id asignado.
+    """
+    return reservar(filepath, calcular_maximo)[0]
@@ -1,7 +1,8 @@
-import csv
-import json
 import os
+import sqlite3
+from typing import Any, Dict, Iterable
 
+from Controlador import almacen, gestor_sqlite
 from Modelo import medico, paciente
 
 
@@ -60,61 +61,88 @@ def obtener_nombre_completo_por_documento(
         return f"Error: {e}"
 
 
-def obtener_nombre_por_documento(
-    filepath_base: str, documento: str
-    ) -> str:
+def _nombre_de(persona: Dict[str, Any]) -> str:
+    nombre = persona.get("nombres", "") or persona.get("nombre", "")
+    apellido = persona.get("apellidos", "") or persona.get("apellido", "")
+    if nombre and apellido:
+        return f"{nombre.strip()} {apellido.strip()}"
+    elif nombre:
+        return nombre.strip()
+    return "Sin nombre"
+
+
+def obtener_nombres_por_documentos(
+    filepath_base: str, documentos: Iterable[Any]
+    ) -> Dict[str, str]:
     """
-    Busca el nombre completo de una persona
-    (paciente o médico)
-    por su documento en archivos JSON o CSV
-    (busca en ambos si existen).
+    Resuelve en lote el nombre completo de varias personas
+    (pacientes o médicos) por su documento.
+    Cada archivo se lee una sola vez (y queda en caché), sin importar
+    cuántos documentos se consulten.
     Args:
         filepath_base (str): Ruta base sin
-        extensión o con extensión (.json o .csv)
-        documento (str): Documento a buscar
+        extensión o con extensión (.json, .csv, .jsonl o .db)
+        documentos (Iterable[Any]): Documentos a resolver.
     Returns:
-        str: Nombre completo o mensaje de error
+        Dict[str, str]: documento → nombre completo, solo para los
+        documentos encontrados.
     """
-    documento = str(documento).strip()
+    pendientes = {str(d).strip() for d in documentos if d is not None}
 
     # Quitar extensión si viene incluida
     base, ext = os.path.splitext(filepath_base)
-    if ext not in (".json", ".csv"):
-        # Probar con ambas rutas
-        rutas = [f"{base}.json", f"{base}.csv"]
+    if ext not in (".json", ".csv", ".jsonl", *gestor_sqlite.EXTENSIONES):
+        # Probar con las rutas de cada formato
+        rutas = [f"{base}.json", f"{base}.csv", f"{base}.jsonl", f"{base}.db"]
     else:
         rutas = [filepath_base]
 
+    nombres: Dict[str, str] = {}
     for ruta in rutas:
+        if not pendientes:
+            break
         if not os.path.exists(ruta):
             continue
-
-        try:
-            # Leer JSON
-            if ruta.endswith(".json"):
-                with open(ruta, "r", encoding="utf-8") as f:
-                    personas = json.load(f)
-            # Leer CSV
-            elif ruta.endswith(".csv"):
-                with open(ruta, "r", encoding="utf-8") as f:
-                    lector = csv.DictReader(f)
-                    personas = list(lector)
-            else:
-                continue
-        except Exception:
+        if gestor_sqlite.es_sqlite(ruta):
+            # La tabla se llama como el archivo (pacientes.db → pacientes)
+            # y cada documento se resuelve con su índice.
+            tabla = os.path.splitext(os.path.basename(ruta))[0]
+            for documento in list(pendientes):
+                try:
+                    encontrados = gestor_sqlite.buscar(
+                        ruta, tabla, ["documento", "nombres", "apellidos"],
+                        {"documento": documento}, 1
+                        )
+                except sqlite3.Error:
+                    break
+                if encontrados:
+                    nombres[documento] = _nombre_de(encontrados[0])
+                    pendientes.discard(documento)
             continue
+        por_documento = almacen.leer_indice(ruta, "documento")
+        for documento in list(pendientes):
+            coincidencias = por_documento.get(documento)
+            if coincidencias:
+                nombres[documento] = _nombre_de(coincidencias[0])
+                pendientes.discard(documento)
+    return nombres
 
-        # Buscar persona por documento
-        for p in personas:
-            doc = str(p.get("documento", "")).strip()
-            if doc == documento:
-                nombre = p.get("nombres", "") or p.get("nombre", "")
-                apellido = p.get("apellidos", "") or p.get("apellido", "")
-                if nombre and apellido:
-                    return f"{nombre.strip()} {apellido.strip()}"
-                elif nombre:
-                    return nombre.strip()
-                else:
-                    return "Sin nombre"
 
-    return "No encontrado"
+def obtener_nombre_por_documento(
+    filepath_base: str, documento: str
+    ) -> str:
+    """
+    Busca el nombre completo de una persona
+    (paciente o médico)
+    por su documento en archivos JSON, CSV, JSON-lines o SQLite
+    (busca en todos los que existan).
+    Args:
+        filepath_base (str): Ruta base sin
+        extensión o con extensión (.json, .csv, .jsonl o .db)
+        documento (str): Documento a buscar
+    Returns:
+        str: Nombre completo o mensaje de error
+    """
+    documento = str(documento).strip()
+    return obtener_nombres_por_documentos(
+        filepath_base, [documento]).get(documento, "No encontrado")
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lógica de Negocio - Analítica de Citas
+
+Carga citas, médicos y pacientes en DataFrames de pandas con tipos
+(estado y especialidad categóricos, fecha y hora como datetime) y calcula
+sobre ellos, con operaciones por columnas y groupby, los reportes de
+estadísticas: la tabla por médico, el uso por hora del día, las tasas de
+cancelación e inasistencia por especialidad y la tendencia semanal.
+La tabla de citas se construye una vez por versión del archivo y luego
+se pone al día con las citas nuevas o retiradas.
+"""
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from Controlador import (
+    fechas,
+    gestor_datos_citas,
+    gestor_datos_medico,
+    gestor_datos_pacientes,
+)
+from Modelo import cita, estadisticas
+
+# Estados (en minúsculas) que cuentan como inasistencia del paciente.
+ESTADOS_INASISTENCIA = {'no asistio', 'no asistió', 'inasistencia'}
+
+CONTADORES = ('total', 'pendientes', 'aprobadas', 'canceladas')
+
+# Categorías fijas: las tablas de distintos lotes de citas se concatenan.
+GRUPOS = pd.CategoricalDtype(CONTADORES[1:])
+
+
+def _texto(columna: pd.Series) -> pd.Series:
+    return columna.fillna('').astype(str).str.strip()
+
+
+def _por_valor(columna: pd.Series, conversion: Callable[[pd.Series], Any]) -> pd.Series:
+    # Documentos, fechas, horas y estados se repiten mucho: la conversión se
+    # aplica una vez por valor distinto y se reparte con los códigos.
+    categorias = columna.fillna('').astype('category')
+    distintos = pd.Series(categorias.cat.categories, dtype=object).astype(str).str.strip()
+    convertidos = pd.Series(conversion(distintos))
+    return pd.Series(
+        convertidos.take(categorias.cat.codes.to_numpy()).to_numpy(),
+        index=columna.index, dtype=convertidos.dtype
+        )
+
+
+def _tabla(registros: Iterable[Dict[str, Any]], campos: Iterable[str]) -> pd.DataFrame:
+    # Una lista por columna: más rápido que un DataFrame de diccionarios.
+    registros = list(registros)
+    return pd.DataFrame(
+        {campo: [registro.get(campo) for registro in registros] for campo in campos},
+        dtype=object
+        )
+
+
+def tabla_citas(registros: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    DataFrame tipado de citas.
+        Args:
+            registros (Iterable[Dict[str, Any]]): Citas como diccionarios.
+        Returns:
+            pd.DataFrame: Los campos de la cita (documentos y hora como
+            texto sin espacios), 'estado' categórico en minúsculas, 'grupo' categórico
+            (pendientes, aprobadas, canceladas o nulo), 'fecha' y
+            'fecha_hora' como datetime (NaT si no se pueden interpretar).
+    """
+    tabla = _tabla(registros, gestor_datos_citas.CAMPOS)
+    for campo in ('documento_paciente', 'documento_medico', 'hora'):
+        tabla[campo] = _por_valor(tabla[campo], lambda textos: textos)
+    tabla['estado'] = _por_valor(tabla['estado'], lambda textos: textos.str.lower()).astype('category')
+    tabla['grupo'] = tabla['estado'].map(estadisticas.GRUPOS_ESTADO).astype(GRUPOS)
+    tabla['fecha'] = _por_valor(tabla['fecha'], lambda textos: pd.to_datetime(
+        textos.map(fechas.normalizar), format='%Y-%m-%d', errors='coerce'
+        ))
+    tabla['fecha_hora'] = tabla['fecha'] + _por_valor(tabla['hora'], lambda textos: pd.to_timedelta(
+        textos.str.slice(0, 5) + ':00', errors='coerce'
+        ))
+    return tabla
+
+
+def tabla_medicos(registros: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    DataFrame tipado de médicos, sin documentos repetidos.
+        Args:
+            registros (Iterable[Dict[str, Any]]): Médicos como diccionarios.
+        Returns:
+            pd.DataFrame: Los campos del médico, 'nombre' (nombres y
+            apellidos) y 'especialidad' categórica ('N/A' si falta).
+    """
+    tabla = _tabla(registros, gestor_datos_medico.CAMPOS)
+    for campo in ('documento', 'nombres', 'apellidos'):
+        tabla[campo] = _texto(tabla[campo])
+    tabla['nombre'] = (tabla['nombres'] + ' ' + tabla['apellidos']).str.strip()
+    tabla['especialidad'] = _texto(tabla['especialidad']).replace('', 'N/A').astype('category')
+    return tabla.drop_duplicates('documento', ignore_index=True)
+
+
+def tabla_pacientes(registros: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    DataFrame tipado de pacientes.
+        Args:
+            registros (Iterable[Dict[str, Any]]): Pacientes como diccionarios.
+        Returns:
+            pd.DataFrame: Los campos del paciente, con el documento como
+            texto sin espacios.
+    """
+    tabla = _tabla(registros, gestor_datos_pacientes.CAMPOS)
+    tabla['documento'] = _texto(tabla['documento'])
+    return tabla
+
+
+def _construir(registros: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    # La tabla más las citas anexadas o retiradas desde que se armó; los
+    # cambios se aplican en bloque cuando se pide un reporte.
+    return {'tabla': tabla_citas(registros), 'nuevas': [], 'retiradas': []}
+
+
+def _agregar(estructura: Dict[str, Any], registro: Dict[str, Any]) -> None:
+    estructura['nuevas'].append(registro)
+
+
+def _retirar(estructura: Dict[str, Any], registro: Dict[str, Any]) -> None:
+    # Una cita que aún no llegó a la tabla basta con quitarla de las nuevas.
+    identificador = str(registro.get('id'))
+    nuevas = estructura['nuevas']
+    for posicion in range(len(nuevas) - 1, -1, -1):
+        if str(nuevas[posicion].get('id')) == identificador:
+            del nuevas[posicion]
+            return
+    estructura['retiradas'].append(identificador)
+
+
+def _al_dia(estructura: Dict[str, Any]) -> pd.DataFrame:
+    tabla = estructura['tabla']
+    if estructura['retiradas']:
+        # Se quita una fila por cada retiro de ese id (el archivo puede
+        # traer ids repetidos).
+        veces = Counter(estructura['retiradas'])
+        ids = tabla['id'].astype(str)
+        candidatas = ids[ids.isin(veces)]
+        quitar = candidatas.index[
+            candidatas.groupby(candidatas).cumcount() < candidatas.map(veces)]
+        tabla = tabla.drop(index=quitar).reset_index(drop=True)
+    if estructura['nuevas']:
+        nuevas = tabla_citas(estructura['nuevas'])
+        unida = pd.concat([tabla, nuevas], ignore_index=True)
+        unida['estado'] = union_categoricals([tabla['estado'], nuevas['estado']])
+        tabla = unida
+    estructura.update(tabla=tabla, nuevas=[], retiradas=[])
+    return tabla
+
+
+def citas(filepath: str) -> pd.DataFrame:
+    """
+    Tabla de citas de un archivo, construida una vez por versión y puesta
+    al día con las citas creadas, modificadas o eliminadas desde entonces
+    (sin reconstruirla completa).
+        Args:
+            filepath (str): Ruta al archivo (o carpeta) de citas.
+        Returns:
+            pd.DataFrame: Ver tabla_citas (compartida, solo lectura).
+    """
+    return _al_dia(gestor_datos_citas.derivado(
+        filepath, 'analitica', _construir, _agregar, retirador=_retirar
+        ))
+
+
+def medicos(filepath: str) -> pd.DataFrame:
+    """
+    Tabla de médicos de un archivo.
+        Args:
+            filepath (str): Ruta al archivo de médicos.
+        Returns:
+            pd.DataFrame: Ver tabla_medicos.
+    """
+    return tabla_medicos(gestor_datos_medico.cargar_datos(filepath))
+
+
+def pacientes(filepath: str) -> pd.DataFrame:
+    """
+    Tabla de pacientes de un archivo.
+        Args:
+            filepath (str): Ruta al archivo de pacientes.
+        Returns:
+            pd.DataFrame: Ver tabla_pacientes.
+    """
+    return tabla_pacientes(gestor_datos_pacientes.cargar_datos(filepath))
+
+
+def conteos(tabla: pd.DataFrame) -> pd.DataFrame:
+    """
+    Citas de cada médico por grupo de estado.
+        Args:
+            tabla (pd.DataFrame): Tabla de citas (tabla_citas).
+        Returns:
+            pd.DataFrame: Índice documento_medico; columnas total,
+            pendientes, aprobadas y canceladas.
+    """
+    return _por_grupo(tabla['documento_medico'], tabla['grupo'])
+
+
+def _por_grupo(claves: pd.Series, grupos: pd.Series) -> pd.DataFrame:
+    # Total por clave y, en columnas, cuántas hay de cada grupo de estado.
+    total = claves.value_counts().sort_index()
+    resultado = pd.crosstab(claves, grupos).reindex(
+        index=total.index, columns=list(CONTADORES[1:]), fill_value=0
+        )
+    resultado.insert(0, 'total', total)
+    resultado.columns.name = None
+    return resultado.astype('int64')
+
+
+def tabla_conteos(conteos_medico: estadisticas.Conteos) -> pd.DataFrame:
+    """
+    Conteos materializados (estadisticas.conteos_por_medico) como DataFrame.
+        Args:
+            conteos_medico (estadisticas.Conteos): documento → conteo.
+        Returns:
+            pd.DataFrame: Mismo formato que conteos().
+    """
+    return pd.DataFrame.from_dict(
+        conteos_medico, orient='index', columns=list(CONTADORES), dtype='int64'
+        ).rename_axis('documento_medico')
+
+
+def por_medico(conteos_medico: pd.DataFrame, tabla_medico: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tabla de estadísticas por médico (los médicos sin citas con ceros).
+        Args:
+            conteos_medico (pd.DataFrame): Resultado de conteos() o tabla_conteos().
+            tabla_medico (pd.DataFrame): Tabla de médicos (tabla_medicos).
+        Returns:
+            pd.DataFrame: Columnas nombre, especialidad, total, pendientes,
+            aprobadas y canceladas, en el orden de los médicos.
+    """
+    unida = tabla_medico[['documento', 'nombre', 'especialidad']].merge(
+        conteos_medico, how='left', left_on='documento', right_index=True
+        )
+    unida[list(CONTADORES)] = unida[list(CONTADORES)].fillna(0).astype('int64')
+    return unida[['nombre', 'especialidad', *CONTADORES]].reset_index(drop=True)
+
+
+def uso_por_hora(tabla: pd.DataFrame) -> pd.DataFrame:
+    """
+    Citas que ocupan franja (no canceladas) en cada hora del día.
+        Args:
+            tabla (pd.DataFrame): Tabla de citas (tabla_citas).
+        Returns:
+            pd.DataFrame: Índice hora (0-23); columnas citas y porcentaje
+            (sobre el total de citas con hora).
+    """
+    activas = tabla[~tabla['estado'].isin(cita.ESTADOS_LIBRES)]
+    horas = activas['fecha_hora'].dropna().dt.hour
+    resultado = horas.value_counts().sort_index().rename('citas').rename_axis('hora').to_frame()
+    total = resultado['citas'].sum()
+    resultado['porcentaje'] = (resultado['citas'] * 100 / total).round(1) if total else 0.0
+    return resultado
+
+
+def tasas_por_especialidad(tabla: pd.DataFrame, tabla_medico: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tasas de cancelación e inasistencia de las citas de cada especialidad.
+        Args:
+            tabla (pd.DataFrame): Tabla de citas (tabla_citas).
+            tabla_medico (pd.DataFrame): Tabla de médicos (tabla_medicos).
+        Returns:
+            pd.DataFrame: Índice especialidad; columnas total, canceladas,
+            inasistencias, tasa_cancelacion y tasa_inasistencia (en %).
+    """
+    especialidades = tabla_medico.set_index('documento')['especialidad']
+    marcas = pd.DataFrame({
+        'especialidad': tabla['documento_medico'].map(especialidades),
+        'canceladas': tabla['grupo'] == 'canceladas',
+        'inasistencias': tabla['estado'].isin(ESTADOS_INASISTENCIA),
+        })
+    resultado = marcas.groupby('especialidad', observed=True).agg(
+        total=('canceladas', 'size'),
+        canceladas=('canceladas', 'sum'),
+        inasistencias=('inasistencias', 'sum'),
+        )
+    resultado['tasa_cancelacion'] = (resultado['canceladas'] * 100 / resultado['total']).round(1)
+    resultado['tasa_inasistencia'] = (resultado['inasistencias'] * 100 / resultado['total']).round(1)
+    return resultado
+
+
+def tendencia_semanal(tabla: pd.DataFrame) -> pd.DataFrame:
+    """
+    Citas por semana (de lunes a domingo) y grupo de estado.
+        Args:
+            tabla (pd.DataFrame): Tabla de citas (tabla_citas).
+        Returns:
+            pd.DataFrame: Índice semana (fecha del lunes); columnas total,
+            pendientes, aprobadas y canceladas. Las citas sin fecha válida
+            no se cuentan.
+    """
+    con_fecha = tabla[tabla['fecha'].notna()]
+    lunes = con_fecha['fecha'] - pd.to_timedelta(con_fecha['fecha'].dt.weekday, unit='D')
+    return _por_grupo(lunes.rename('semana'), con_fecha['grupo'])
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lógica de Negocio - Calendario
+
+Índice de citas por mes para el calendario interactivo: para cada
+(año, mes) guarda cuántas citas hay en cada día y cuántas hay de cada
+estado. Se construye una vez por lectura del archivo de citas y se
+mantiene al anexar, modificar o eliminar citas, así cambiar de mes en el calendario es
+una consulta al diccionario y no una lectura del historial completo.
+"""
+from typing import Any, Dict, Iterable, Tuple
+
+from Controlador import fechas, gestor_datos_citas
+
+ResumenMes = Dict[str, Any]
+Calendario = Dict[Tuple[int, int], ResumenMes]
+
+
+def resumen_vacio() -> ResumenMes:
+    """
+    Resumen de un mes sin citas.
+        Returns:
+            ResumenMes: {'total': 0, 'dias': {}, 'estados': {}}.
+    """
+    return {'total': 0, 'dias': {}, 'estados': {}}
+
+
+def _sumar(indice: Calendario, registro: Dict[str, Any], cantidad: int) -> None:
+    partes = fechas.partes(registro.get('fecha'))
+    if partes is None:
+        return
+    año, mes, dia = partes
+    resumen = indice.get((año, mes))
+    if resumen is None:
+        resumen = indice[(año, mes)] = resumen_vacio()
+    estado = str(registro.get('estado') or '').strip().lower()
+    resumen['total'] += cantidad
+    for clave, valor in (('dias', dia), ('estados', estado)):
+        restante = resumen[clave].get(valor, 0) + cantidad
+        if restante > 0:
+            resumen[clave][valor] = restante
+        else:
+            resumen[clave].pop(valor, None)
+    if resumen['total'] <= 0:
+        del indice[(año, mes)]
+
+
+def _marcar(indice: Calendario, registro: Dict[str, Any]) -> None:
+    _sumar(indice, registro, 1)
+
+
+def _desmarcar(indice: Calendario, registro: Dict[str, Any]) -> None:
+    _sumar(indice, registro, -1)
+
+
+def _construir(citas: Iterable[Dict[str, Any]]) -> Calendario:
+    indice: Calendario = {}
+    for registro in citas:
+        _marcar(indice, registro)
+    return indice
+
+
+def indice_calendario(filepath: str) -> Calendario:
+    """
+    Índice de citas por mes de un archivo de citas.
+        Args:
+            filepath (str): Ruta al archivo (o carpeta) de citas.
+        Returns:
+            Calendario: (año, mes) → {'total': int, 'dias': {día: cantidad},
+            'estados': {estado: cantidad}} (compartido, solo lectura).
+    """
+    return gestor_datos_citas.derivado(
+        filepath, 'calendario', _construir, _marcar, retirador=_desmarcar
+        )
+
+
+def resumen_mes(filepath: str, año: int, mes: int) -> ResumenMes:
+    """
+    Resumen de las citas de un mes.
+        Args:
+            filepath (str): Ruta al archivo (o carpeta) de citas.
+            año (int): Año a consultar.
+            mes (int): Mes a consultar (1-12).
+        Returns:
+            ResumenMes: Total, citas por día y por estado (solo lectura).
+    """
+    return indice_calendario(filepath).get((año, mes)) or resumen_vacio()
+
+
+def resumen_de_citas(citas: Iterable[Dict[str, Any]], año: int, mes: int) -> ResumenMes:
+    """
+    Resumen de un mes calculado a partir de una lista de citas (ej. la
+    vista unida de varios archivos, ya sin ids repetidos).
+        Args:
+            citas (Iterable[Dict[str, Any]]): Citas a contar.
+            año (int): Año a consultar.
+            mes (int): Mes a consultar (1-12).
+        Returns:
+            ResumenMes: Total, citas por día y por estado.
+    """
+    return _construir(citas).get((año, mes)) or resumen_vacio()
+
+
+def combinar(resumenes: Iterable[ResumenMes]) -> ResumenMes:
+    """
+    Suma los resúmenes de un mismo mes tomados de varios archivos
+    (ej. citas.json y citas.csv).
+        Args:
+            resumenes (Iterable[ResumenMes]): Resúmenes a sumar.
+        Returns:
+            ResumenMes: Un resumen nuevo con los totales.
+    """
+    total = resumen_vacio()
+    for resumen in resumenes:
+        total['total'] += resumen['total']
+        for clave in ('dias', 'estados'):
+            for valor, cantidad in resumen[clave].items():
+                total[clave][valor] = total[clave].get(valor, 0) + cantidad
+    return total
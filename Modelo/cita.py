@@ -15,18 +15,103 @@ from rich.table import Table
 from Controlador import gestor_datos_citas
 
 
-def generar_id(citas: List[Dict[str, Any]]) -> int:
+def generar_id(filepath: str) -> int:
     """
     Genera un nuevo ID autoincremental para una cita.
+    Usa la secuencia persistente del archivo: no recorre los registros.
         Args:
-            citas (List[Dict[str, Any]]): La lista actual de las citas.
+            filepath (str): Ruta al archivo de datos.
         Returns:
             int: El nuevo ID a asignar.
     """
-    if not citas:
-        return 1
-    max_id = max(int(cita.get('id', 0)) for cita in citas)
-    return max_id + 1
+    return gestor_datos_citas.siguiente_id(filepath)
+
+
+# Campos que identifican una franja ocupada por un médico o un paciente.
+FRANJA_MEDICO = ('documento_medico', 'fecha', 'hora')
+FRANJA_PACIENTE = ('documento_paciente', 'fecha', 'hora')
+
+# Las citas en estos estados no ocupan su franja.
+ESTADOS_LIBRES = {'cancelada'}
+
+
+def citas_en_franja(
+    filepath: str, franja: tuple, documento: str, fecha: str, hora: str
+    ) -> List[Dict[str, Any]]:
+    """
+    Obtiene las citas que ocupan una franja (documento, fecha, hora).
+    La búsqueda usa el índice de ocupación, sin recorrer todas las citas.
+        Args:
+            filepath (str): Ruta al archivo de datos.
+            franja (tuple): FRANJA_MEDICO o FRANJA_PACIENTE.
+            documento (str): Documento del médico o del paciente.
+            fecha (str): Fecha de la cita (YYYY-MM-DD).
+            hora (str): Hora de la cita (HH:MM).
+        Returns:
+            List[Dict[str, Any]]: Citas que ocupan la franja
+            (las canceladas no cuentan).
+    """
+    filtros = dict(zip(franja, (documento, fecha, hora)))
+    return [
+        c for c in gestor_datos_citas.buscar_registros(filepath, filtros)
+        if str(c.get('estado', '')).strip().lower() not in ESTADOS_LIBRES
+    ]
+
+
+def medico_disponible(
+    filepath: str, documento_medico: str, fecha: str, hora: str
+    ) -> bool:
+    """
+    Indica si el médico está libre en la fecha y hora dadas.
+        Args:
+            filepath (str): Ruta al archivo de datos.
+            documento_medico (str): Documento del médico.
+            fecha (str): Fecha de la cita (YYYY-MM-DD).
+            hora (str): Hora de la cita (HH:MM).
+        Returns:
+            bool: True si no tiene citas en esa franja.
+    """
+    return not citas_en_franja(filepath, FRANJA_MEDICO, documento_medico, fecha, hora)
+
+
+def paciente_disponible(
+    filepath: str, documento_paciente: str, fecha: str, hora: str
+    ) -> bool:
+    """
+    Indica si el paciente está libre en la fecha y hora dadas.
+        Args:
+            filepath (str): Ruta al archivo de datos.
+            documento_paciente (str): Documento del paciente.
+            fecha (str): Fecha de la cita (YYYY-MM-DD).
+            hora (str): Hora de la cita (HH:MM).
+        Returns:
+            bool: True si no tiene citas en esa franja.
+    """
+    return not citas_en_franja(
+        filepath, FRANJA_PACIENTE, documento_paciente, fecha, hora
+        )
+
+
+def conflicto_de_franja(
+    filepath: str, documento_paciente: str, documento_medico: str, fecha: str, hora: str
+    ) -> Optional[str]:
+    """
+    Indica quién ya tiene una cita en la fecha y hora dadas.
+        Args:
+            filepath (str): Ruta al archivo de datos.
+            documento_paciente (str): Documento del paciente.
+            documento_medico (str): Documento del médico.
+            fecha (str): Fecha de la cita (YYYY-MM-DD).
+            hora (str): Hora de la cita (HH:MM).
+        Returns:
+            Optional[str]: 'medico' o 'paciente' si la franja está ocupada
+            para alguno de ellos; None si ambos están libres.
+    """
+    if not medico_disponible(filepath, documento_medico, fecha, hora):
+        return 'medico'
+    if not paciente_disponible(filepath, documento_paciente, fecha, hora):
+        return 'paciente'
+    return None
 
 
 def crear_cita(filepath: str,
@@ -40,7 +125,8 @@ def crear_cita(filepath: str,
     """
     (CREATE) Agrega una nueva cita.
 
-        Valida que no exista una cita para el mismo paciente, médico, fecha y hora.
+        Valida que ni el médico ni el paciente tengan ya una cita
+        en la misma fecha y hora.
 
         Args:
             filepath (str): Ruta al archivo de datos.
@@ -55,34 +141,32 @@ def crear_cita(filepath: str,
             Optional[Dict[str, Any]]: El diccionario de
             la cita creada o None si ya existía.
     """
-    citas = gestor_datos_citas.cargar_datos(filepath)
-
-    # Validar si ya existe una cita para el mismo paciente, médico, fecha y hora
-    for cita in citas:
-        if (cita.get('documento_paciente') == documento_paciente and
-            cita.get('documento_medico') == documento_medico and
-            cita.get('fecha') == fecha ):
-            cita.get('hora') == hora
+    # Validar, generar el id y anexar sin que otra terminal escriba en medio
+    with gestor_datos_citas.bloqueo_escritura(filepath):
+        # Validar que el médico y el paciente estén libres en esa fecha y hora
+        if conflicto_de_franja(
+            filepath, documento_paciente, documento_medico, fecha, hora) is not None:
             print(
-                "\n Error: Ya existe una cita registrada para ese paciente,"
-                "médico, fecha y hora."
+                "\n Error: Ya existe una cita registrada para ese paciente "
+                "o médico en esa fecha y hora."
                 )
             return None
 
-    nuevo_id = generar_id(citas)
+        nuevo_id = generar_id(filepath)
 
-    nueva_cita = {
-        'id': str(nuevo_id),
-        'documento_paciente': documento_paciente,
-        'documento_medico': documento_medico,
-        'fecha': fecha,
-        'hora': hora,
-        'motivo': motivo,
-        'estado': estado
-    }
+        nueva_cita = {
+            'id': str(nuevo_id),
+            'documento_paciente': documento_paciente,
+            'documento_medico': documento_medico,
+            'fecha': fecha,
+            'hora': hora,
+            'motivo': motivo,
+            'estado': estado
+        }
+
+        # Solo se anexa la nueva cita; no se reescribe el archivo completo.
+        gestor_datos_citas.agregar_registro(filepath, nueva_cita)
 
-    citas.append(nueva_cita)
-    gestor_datos_citas.guardar_datos(filepath, citas)
     return nueva_cita
 
 
@@ -116,8 +200,11 @@ def buscar_cita_por_documento(filepath: str, documento_paciente: str) -> list[
             Optional[Dict[str, Any]]: El diccionario de la cita si se encuentra
             de lo contrario None.
     """
-    citas = gestor_datos_citas.cargar_datos(filepath)
-    return [c for c in citas if c.get('documento_paciente') == documento_paciente]
+    # Se recorre el archivo en streaming: solo quedan en memoria las citas
+    # del paciente.
+    return list(gestor_datos_citas.iterar_datos(
+        filepath, predicado=lambda c: c.get('documento_paciente') == documento_paciente
+        ))
 
 
 def actualizar_cita(
@@ -134,26 +221,7 @@ def actualizar_cita(
     Returns:
         Optional[Dict[str, Any]]: Cita actualizada o None si no se encontró.
     """
-    # ✅ CORRECCIÓN 1: Eliminar la importación incorrecta de aquí
-    # Ya está importado al inicio del archivo
-    citas = gestor_datos_citas.cargar_datos(filepath)
-    cita_encontrada = None
-    indice = -1
-
-    for i, c in enumerate(citas):
-        # ✅ CORRECCIÓN 2: Cambiar 'id_cita' por 'id'
-        if c.get('id') == id_cita:
-            cita_encontrada = c
-            indice = i
-            break
-
-    if cita_encontrada is None:
-        return None
-    cita_encontrada.update(datos_nuevos)
-    citas[indice] = cita_encontrada
-
-    gestor_datos_citas.guardar_datos(filepath, citas)
-    return cita_encontrada
+    return gestor_datos_citas.actualizar_registro(filepath, 'id', id_cita, datos_nuevos)
 
 console = Console()
 def eliminar_cita_por_documento(filepath: str, documento: str) -> bool:
@@ -167,9 +235,9 @@ def eliminar_cita_por_documento(filepath: str, documento: str) -> bool:
         bool: True si se eliminó una cita, False si no se eliminó nada
     """
 
-    citas = gestor_datos_citas.cargar_datos(filepath)
-
-    citas_paciente = [c for c in citas if c.get("documento_paciente") == documento]
+    citas_paciente = list(gestor_datos_citas.iterar_datos(
+        filepath, predicado=lambda c: c.get("documento_paciente") == documento
+        ))
 
     if not citas_paciente:
         console.print(Panel
@@ -224,8 +292,7 @@ def eliminar_cita_por_documento(filepath: str, documento: str) -> bool:
         console.print("[yellow]Operación cancelada por el usuario.[/yellow]")
         return False
 
-    citas.remove(cita_a_eliminar)
-    gestor_datos_citas.guardar_datos(filepath, citas)
+    gestor_datos_citas.eliminar_registro(filepath, 'id', cita_a_eliminar.get('id'))
 
     console.print(Panel("[bold green]✅ Cita eliminada correctamente.[/bold green]",
                         border_style="green"))
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lógica de Negocio - Disponibilidad
+
+Busca franjas libres de los médicos dentro del horario de atención
+(07:00 a 18:00, en franjas de 30 minutos). La ocupación de cada médico
+por día se guarda como un entero usado como mapa de bits (un bit por
+franja), que se construye una vez por lectura del archivo de citas y se
+mantiene al anexar citas nuevas.
+"""
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from Controlador import gestor_datos_citas
+from Modelo import cita
+
+HORA_APERTURA = 7
+HORA_CIERRE = 18
+MINUTOS_POR_FRANJA = 30
+
+# La última franja empieza exactamente a la hora de cierre (18:00).
+TOTAL_FRANJAS = (HORA_CIERRE - HORA_APERTURA) * 60 // MINUTOS_POR_FRANJA + 1
+TODAS_LAS_FRANJAS = (1 << TOTAL_FRANJAS) - 1
+
+Ocupacion = Dict[Tuple[str, str], int]
+
+
+def franja_de_hora(hora: str) -> Optional[int]:
+    """
+    Posición de la franja que contiene una hora.
+        Args:
+            hora (str): Hora en formato HH:MM.
+        Returns:
+            Optional[int]: Índice de la franja o None si la hora es inválida
+            o está fuera del horario de atención.
+    """
+    try:
+        horas, minutos = str(hora).strip().split(':')
+        desde_apertura = int(horas) * 60 + int(minutos) - HORA_APERTURA * 60
+    except ValueError:
+        return None
+    if desde_apertura < 0:
+        return None
+    posicion = desde_apertura // MINUTOS_POR_FRANJA
+    return posicion if posicion < TOTAL_FRANJAS else None
+
+
+def hora_de_franja(posicion: int) -> str:
+    """
+    Hora de inicio de una franja.
+        Args:
+            posicion (int): Índice de la franja.
+        Returns:
+            str: Hora en formato HH:MM.
+    """
+    minutos = HORA_APERTURA * 60 + posicion * MINUTOS_POR_FRANJA
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def _marcar(ocupacion: Ocupacion, registro: Dict[str, Any]) -> None:
+    if str(registro.get('estado', '')).strip().lower() in cita.ESTADOS_LIBRES:
+        return
+    posicion = franja_de_hora(registro.get('hora', ''))
+    if posicion is None:
+        return
+    clave = (
+        str(registro.get('documento_medico', '')).strip(),
+        str(registro.get('fecha', '')).strip()
+        )
+    ocupacion[clave] = ocupacion.get(clave, 0) | (1 << posicion)
+
+
+def _construir(citas: List[Dict[str, Any]]) -> Ocupacion:
+    ocupacion: Ocupacion = {}
+    for registro in citas:
+        _marcar(ocupacion, registro)
+    return ocupacion
+
+
+def mapa_ocupacion(filepath: str) -> Ocupacion:
+    """
+    Mapa de ocupación de todos los médicos.
+        Args:
+            filepath (str): Ruta al archivo de citas.
+        Returns:
+            Ocupacion: (documento_medico, fecha) → bits de franjas ocupadas
+            (compartido, solo lectura).
+    """
+    return gestor_datos_citas.derivado(filepath, 'ocupacion', _construir, _marcar)
+
+
+def _dias(fecha_inicio: datetime.date, fecha_fin: datetime.date):
+    dia = fecha_inicio
+    while dia <= fecha_fin:
+        yield dia
+        dia += datetime.timedelta(days=1)
+
+
+def _franjas_desde(hora_minima: Optional[str]) -> int:
+    # Bits de las franjas que empiezan en hora_minima o después.
+    if not hora_minima:
+        return TODAS_LAS_FRANJAS
+    posicion = franja_de_hora(hora_minima)
+    if posicion is None:
+        antes_de_abrir = str(hora_minima).strip() < f"{HORA_APERTURA:02d}:00"
+        return TODAS_LAS_FRANJAS if antes_de_abrir else 0
+    if hora_de_franja(posicion) < str(hora_minima).strip():
+        posicion += 1
+    return TODAS_LAS_FRANJAS & ~((1 << posicion) - 1)
+
+
+def _posiciones(bits: int):
+    while bits:
+        menor = bits & -bits
+        yield menor.bit_length() - 1
+        bits ^= menor
+
+
+def franjas_libres(
+    filepath: str,
+    documento_medico: str,
+    fecha_inicio: datetime.date,
+    fecha_fin: datetime.date,
+    *,
+    limite: Optional[int] = None,
+    hora_minima: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
+    """
+    Franjas libres de un médico en un rango de fechas, en orden cronológico.
+        Args:
+            filepath (str): Ruta al archivo de citas.
+            documento_medico (str): Documento del médico.
+            fecha_inicio (datetime.date): Primer día del rango.
+            fecha_fin (datetime.date): Último día del rango (incluido).
+            limite (Optional[int]): Máximo de franjas a retornar.
+            hora_minima (Optional[str]): En el primer día, solo se
+            consideran franjas desde esta hora (HH:MM).
+        Returns:
+            List[Tuple[str, str]]: Pares (fecha, hora) libres.
+    """
+    ocupacion = mapa_ocupacion(filepath)
+    documento = str(documento_medico).strip()
+    libres: List[Tuple[str, str]] = []
+    for dia in _dias(fecha_inicio, fecha_fin):
+        fecha = dia.isoformat()
+        bits = ~ocupacion.get((documento, fecha), 0) & TODAS_LAS_FRANJAS
+        if dia == fecha_inicio:
+            bits &= _franjas_desde(hora_minima)
+        for posicion in _posiciones(bits):
+            libres.append((fecha, hora_de_franja(posicion)))
+            if limite is not None and len(libres) >= limite:
+                return libres
+    return libres
+
+
+def franjas_libres_especialidad(
+    filepath: str,
+    medicos: List[Dict[str, Any]],
+    especialidad: str,
+    fecha_inicio: datetime.date,
+    fecha_fin: datetime.date,
+    *,
+    limite: Optional[int] = 10,
+    hora_minima: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+    """
+    Próximas franjas libres entre los médicos activos de una especialidad.
+    Por cada franja se listan todos los médicos libres en ella.
+        Args:
+            filepath (str): Ruta al archivo de citas.
+            medicos (List[Dict[str, Any]]): Médicos registrados.
+            especialidad (str): Especialidad buscada (sin distinguir
+            mayúsculas).
+            fecha_inicio (datetime.date): Primer día del rango.
+            fecha_fin (datetime.date): Último día del rango (incluido).
+            limite (Optional[int]): Máximo de resultados a retornar.
+            hora_minima (Optional[str]): En el primer día, solo se
+            consideran franjas desde esta hora (HH:MM).
+        Returns:
+            List[Dict[str, str]]: Diccionarios con fecha, hora y
+            documento_medico, en orden cronológico.
+    """
+    buscada = str(especialidad).strip().lower()
+    documentos = sorted({
+        str(m.get('documento', '')).strip() for m in medicos
+        if str(m.get('especialidad', '')).strip().lower() == buscada
+        and str(m.get('estado', '')).strip().lower() != 'inactivo'
+    })
+    if not documentos:
+        return []
+
+    ocupacion = mapa_ocupacion(filepath)
+    resultados: List[Dict[str, str]] = []
+    for dia in _dias(fecha_inicio, fecha_fin):
+        fecha = dia.isoformat()
+        permitidas = _franjas_desde(hora_minima) if dia == fecha_inicio else (
+            TODAS_LAS_FRANJAS)
+        libres_por_medico = [
+            (documento, ~ocupacion.get((documento, fecha), 0) & permitidas)
+            for documento in documentos
+        ]
+        alguna_libre = 0
+        for _, bits in libres_por_medico:
+            alguna_libre |= bits
+        for posicion in _posiciones(alguna_libre):
+            bit = 1 << posicion
+            for documento, bits in libres_por_medico:
+                if bits & bit:
+                    resultados.append({
+                        'fecha': fecha,
+                        'hora': hora_de_franja(posicion),
+                        'documento_medico': documento,
+                    })
+                    if limite is not None and len(resultados) >= limite:
+                        return resultados
+    return resultados
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lógica de Negocio - Estadísticas de Citas
+
+Conteos de citas por médico (total, pendientes, aprobadas y canceladas)
+materializados sobre el archivo de citas: se calculan en una sola pasada
+por versión del archivo y luego se ajustan cita a cita al crear, modificar
+o eliminar citas, en lugar de recontar el historial completo cada vez.
+También agrupa esos conteos por especialidad.
+"""
+from typing import Any, Dict, Iterable, Set
+
+from Controlador import gestor_datos_citas
+
+# Estado (en minúsculas) → contador en el que se suma.
+GRUPOS_ESTADO = {
+    'pendiente': 'pendientes',
+    'completada': 'aprobadas',
+    'aprobada': 'aprobadas',
+    'finalizada': 'aprobadas',
+    'cancelada': 'canceladas',
+    'anulada': 'canceladas',
+    }
+
+Conteo = Dict[str, int]
+Conteos = Dict[str, Conteo]
+
+
+def conteo_vacio() -> Conteo:
+    """
+    Conteo de un médico sin citas.
+        Returns:
+            Conteo: {'total': 0, 'pendientes': 0, 'aprobadas': 0, 'canceladas': 0}.
+    """
+    return {'total': 0, 'pendientes': 0, 'aprobadas': 0, 'canceladas': 0}
+
+
+def _sumar(conteos: Conteos, registro: Dict[str, Any], cantidad: int) -> None:
+    documento = str(registro.get('documento_medico') or '').strip()
+    conteo = conteos.get(documento)
+    if conteo is None:
+        conteo = conteos[documento] = conteo_vacio()
+    conteo['total'] += cantidad
+    grupo = GRUPOS_ESTADO.get(str(registro.get('estado') or '').strip().lower())
+    if grupo is not None:
+        conteo[grupo] += cantidad
+    if conteo['total'] <= 0:
+        del conteos[documento]
+
+
+def _agregar(conteos: Conteos, registro: Dict[str, Any]) -> None:
+    _sumar(conteos, registro, 1)
+
+
+def _retirar(conteos: Conteos, registro: Dict[str, Any]) -> None:
+    _sumar(conteos, registro, -1)
+
+
+def _construir(citas: Iterable[Dict[str, Any]]) -> Conteos:
+    conteos: Conteos = {}
+    for registro in citas:
+        _agregar(conteos, registro)
+    return conteos
+
+
+def conteos_por_medico(filepath: str) -> Conteos:
+    """
+    Conteos de citas de cada médico en un archivo de citas.
+        Args:
+            filepath (str): Ruta al archivo (o carpeta) de citas.
+        Returns:
+            Conteos: documento del médico → {'total', 'pendientes',
+            'aprobadas', 'canceladas'} (compartido, solo lectura).
+    """
+    return gestor_datos_citas.derivado(
+        filepath, 'estadisticas_medico', _construir, _agregar, retirador=_retirar
+        )
+
+
+def por_especialidad(conteos: Conteos, medicos: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """
+    Suma los conteos de los médicos de cada especialidad.
+        Args:
+            conteos (Conteos): Resultado de conteos_por_medico().
+            medicos (Iterable[Dict[str, Any]]): Registros de médicos.
+        Returns:
+            Dict[str, Dict[str, int]]: especialidad → conteo sumado, con
+            'medicos' (cantidad de médicos de la especialidad).
+    """
+    resumen: Dict[str, Dict[str, int]] = {}
+    vistos: Set[str] = set()
+    for medico in medicos:
+        documento = str(medico.get('documento') or '').strip()
+        if documento in vistos:
+            continue
+        vistos.add(documento)
+        especialidad = str(medico.get('especialidad') or '').strip() or 'N/A'
+        total = resumen.get(especialidad)
+        if total is None:
+            total = resumen[especialidad] = {'medicos': 0, **conteo_vacio()}
+        total['medicos'] += 1
+        for clave, cantidad in conteos.get(documento, {}).items():
+            total[clave] += cantidad
+    return resumen
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Lógica de Negocio - Importación Masiva
+
+Importa pacientes o médicos desde un CSV grande (ej. al incorporar una
+clínica nueva). El archivo de entrada se recorre por lotes sin cargarlo
+completo; cada fila se valida con los mismos validadores que los
+formularios (documento, teléfono, nombres y apellidos) y se descartan los
+documentos ya registrados o repetidos dentro del mismo archivo, consultando
+el índice por documento. Con varios procesos, los lotes se validan en
+paralelo y sus resultados se unen en el orden del archivo. Las filas
+aceptadas se guardan todas juntas en una sola escritura, con ids reservados
+en bloque, y las rechazadas se escriben en un CSV de rechazos con la línea
+del archivo en que empieza cada una, el motivo y la fila tal como estaba en
+el archivo (las columnas fila y motivo no son campos de la entidad, así el
+archivo de rechazos se corrige y se vuelve a importar tal cual).
+
+Uso:
+    python -m Modelo.importacion pacientes nuevos.csv data/pacientes.csv --procesos 4
+"""
+
+import argparse
+import collections
+import csv
+import io
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from Controlador import escritura, gestor_datos_medico, gestor_datos_pacientes
+from Validaciones import validadores
+
+# Gestor de datos de cada entidad importable.
+ENTIDADES = {
+    'pacientes': gestor_datos_pacientes,
+    'medicos': gestor_datos_medico,
+    }
+
+# Líneas del archivo de entrada que se leen y validan a la vez.
+TAMANO_LOTE = 10000
+
+# Bloques en espera por proceso: acota la memoria si la lectura del archivo
+# va más rápido que la validación.
+LOTES_POR_PROCESO = 2
+
+# Reglas de cada campo: las mismas que aplican los formularios.
+REGLAS: Dict[str, validadores.Validador] = {
+    'documento': validadores.cedula,
+    'telefono': validadores.telefono,
+    'nombres': validadores.texto,
+    'apellidos': validadores.texto,
+    }
+
+# Columnas que se agregan al archivo de rechazos.
+COLUMNAS_RECHAZO = ['fila', 'motivo']
+
+# (línea del archivo de entrada en que empieza la fila, fila normalizada)
+Fila = Tuple[int, Dict[str, str]]
+Validacion = Tuple[List[Fila], List[Dict[str, Any]]]
+
+
+def motivo_rechazo(fila: Dict[str, str]) -> Optional[str]:
+    """
+    Valida el formato de una fila (sin consultar los datos existentes).
+        Args:
+            fila (Dict[str, str]): Fila normalizada (textos sin espacios).
+        Returns:
+            Optional[str]: El motivo del rechazo o None si la fila es válida.
+    """
+    for campo, validador in REGLAS.items():
+        error = validador(fila.get(campo, ''))
+        if error is not None:
+            return f"{campo}: {error['mensaje']}"
+    return None
+
+
+def _filas_originales(lineas: Iterable[str]) -> Iterator[Tuple[List[str], List[str]]]:
+    # Cada fila del CSV con las líneas del archivo que ocupa, sin modificar
+    # (el lector pide las líneas de a una, sin leer por adelantado).
+    leidas: List[str] = []
+
+    def leer() -> Iterator[str]:
+        for linea in lineas:
+            leidas.append(linea)
+            yield linea
+
+    for celdas in csv.reader(leer()):
+        yield celdas, leidas[:]
+        leidas.clear()
+
+
+def _bloques(archivo: Iterator[str], tamano_lote: int) -> Iterator[Tuple[int, str]]:
+    # (número de la primera línea, texto) de bloques de unas tamano_lote
+    # líneas: cortar el texto es mucho más barato que interpretarlo, y un
+    # solo texto se pasa a otro proceso más rápido que las filas en celdas.
+    inicio = 2
+    while True:
+        lineas = list(itertools.islice(archivo, tamano_lote))
+        if not lineas:
+            return
+        bloque = ''.join(lineas)
+        # Un campo entre comillas puede ocupar varias líneas: si el bloque
+        # termina dentro de uno (comillas impares), se completa.
+        while bloque.count('"') % 2:
+            linea = next(archivo, '')
+            if not linea:
+                break
+            lineas.append(linea)
+            bloque += linea
+        yield inicio, bloque
+        inicio += len(lineas)
+
+
+def validar_lote(
+    lote: Tuple[int, str], cabecera: Sequence[str], campos: Sequence[str]
+    ) -> Tuple[int, Validacion]:
+    """
+    Interpreta, normaliza y valida el formato de un bloque del CSV de
+    entrada. No usa estado compartido, así los bloques se pueden validar en
+    otros procesos.
+        Args:
+            lote (Tuple[int, str]): Número de la primera línea del bloque en
+            el archivo (la cabecera es la línea 1) y el texto de sus filas.
+            cabecera (Sequence[str]): Columnas del archivo de entrada.
+            campos (Sequence[str]): Campos de la entidad.
+        Returns:
+            Tuple[int, Validacion]: Cantidad de filas del bloque y el
+            resultado: las filas válidas (solo los campos de la entidad,
+            como texto sin espacios y sin id) y los rechazos ('fila',
+            'motivo' y 'original': el texto de la fila en el archivo), en
+            orden, con la línea en que empieza cada fila.
+    """
+    posiciones = {columna: i for i, columna in enumerate(cabecera)}
+    columnas = [(campo, posiciones.get(campo)) for campo in campos if campo != 'id']
+    validas: List[Fila] = []
+    rechazos: List[Dict[str, Any]] = []
+    numero, bloque = lote
+    cantidad = 0
+    for celdas, lineas in _filas_originales(io.StringIO(bloque, newline='')):
+        cantidad += 1
+        fila = {
+            campo: celdas[i].strip() if i is not None and i < len(celdas) else ''
+            for campo, i in columnas
+            }
+        motivo = motivo_rechazo(fila)
+        if motivo is None:
+            validas.append((numero, fila))
+        else:
+            rechazos.append({'fila': numero, 'motivo': motivo, 'original': ''.join(lineas)})
+        # La próxima fila empieza después de las líneas de esta.
+        numero += len(lineas)
+    return cantidad, (validas, rechazos)
+
+
+def validar_archivo(
+    origen: str,
+    campos: Sequence[str],
+    procesos: int = 1,
+    tamano_lote: int = TAMANO_LOTE
+    ) -> Tuple[int, str, Validacion]:
+    """
+    Lee el CSV de entrada por bloques y valida el formato de cada fila. Con
+    más de un proceso, los bloques se reparten en un ProcessPoolExecutor y
+    los resultados se unen en el orden del archivo.
+        Args:
+            origen (str): CSV de entrada.
+            campos (Sequence[str]): Campos de la entidad.
+            procesos (int): Procesos que validan a la vez (1: en este proceso).
+            tamano_lote (int): Líneas por bloque.
+        Returns:
+            Tuple[int, str, Validacion]: Filas leídas, la cabecera tal como
+            está en el archivo y el resultado unido de validar_lote.
+    """
+    leidas = 0
+    validas: List[Fila] = []
+    rechazadas: List[Dict[str, Any]] = []
+
+    def unir(resultado: Tuple[int, Validacion]) -> None:
+        nonlocal leidas
+        leidas += resultado[0]
+        validas.extend(resultado[1][0])
+        rechazadas.extend(resultado[1][1])
+
+    with open(origen, mode='r', newline='', encoding='utf-8-sig') as archivo:
+        celdas, lineas = next(_filas_originales(archivo), ([], []))
+        cabecera = [columna.strip() for columna in celdas]
+        bloques = _bloques(archivo, tamano_lote)
+        if procesos <= 1:
+            for bloque in bloques:
+                unir(validar_lote(bloque, cabecera, campos))
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                # Ventana acotada de bloques en curso; se unen en orden.
+                pendientes: collections.deque = collections.deque()
+                for bloque in bloques:
+                    pendientes.append(ejecutor.submit(validar_lote, bloque, cabecera, campos))
+                    if len(pendientes) >= procesos * LOTES_POR_PROCESO:
+                        unir(pendientes.popleft().result())
+                while pendientes:
+                    unir(pendientes.popleft().result())
+    return leidas, ''.join(lineas), (validas, rechazadas)
+
+
+def _textos_originales(origen: str, numeros: Set[int]) -> Dict[int, str]:
+    # Texto original de las filas que empiezan en las líneas dadas.
+    textos: Dict[int, str] = {}
+    with open(origen, mode='r', newline='', encoding='utf-8-sig') as archivo:
+        numero = 1
+        for _, lineas in _filas_originales(archivo):
+            if numero in numeros:
+                textos[numero] = ''.join(lineas)
+            numero += len(lineas)
+    return textos
+
+
+def _linea_rechazo(campos: Sequence[Any], original: str) -> str:
+    # 'fila,motivo,' seguido del texto original: el archivo sigue siendo un
+    # CSV válido y la fila no cambia ni un byte.
+    prefijo = io.StringIO()
+    csv.writer(prefijo, lineterminator='').writerow(campos)
+    final = '' if original.endswith(('\n', '\r')) else '\n'
+    return f"{prefijo.getvalue()},{original}{final}"
+
+
+def _guardar_rechazos(ruta: str, cabecera: str, rechazadas: List[Dict[str, Any]]) -> None:
+    def escribir(archivo):
+        archivo.write(_linea_rechazo(COLUMNAS_RECHAZO, cabecera))
+        archivo.writelines(
+            _linea_rechazo([r['fila'], r['motivo']], r['original']) for r in rechazadas
+            )
+
+    escritura.escribir_atomico(ruta, escribir, newline='')
+
+
+def ruta_rechazos(origen: str) -> str:
+    """
+    Ruta por defecto del archivo de rechazos, junto al archivo de entrada.
+        Args:
+            origen (str): Ruta del CSV de entrada.
+        Returns:
+            str: Ruta del CSV de rechazos (ej. 'nuevos_rechazos.csv').
+    """
+    return f"{os.path.splitext(origen)[0]}_rechazos.csv"
+
+
+def importar_csv(
+    origen: str,
+    destino: str,
+    entidad: str = 'pacientes',
+    rechazos: Optional[str] = None,
+    *,
+    tamano_lote: int = TAMANO_LOTE,
+    procesos: int = 1
+    ) -> Dict[str, Any]:
+    """
+    Importa pacientes o médicos desde un CSV con cabecera.
+        Args:
+            origen (str): CSV de entrada (columnas con los nombres de los
+            campos; las que no son de la entidad se ignoran).
+            destino (str): Archivo de datos de la entidad (CSV, JSON,
+            JSON-lines o SQLite).
+            entidad (str): 'pacientes' o 'medicos'.
+            rechazos (Optional[str]): CSV donde escribir las filas rechazadas
+            (por defecto, ruta_rechazos(origen)). Solo se crea si hay rechazos.
+            tamano_lote (int): Líneas que se leen y validan a la vez.
+            procesos (int): Procesos que validan lotes en paralelo.
+        Returns:
+            Dict[str, Any]: {'leidas', 'importadas', 'rechazadas': int,
+            'rechazos': ruta del archivo de rechazos o None}.
+        Raises:
+            ValueError: Si la entidad no es importable.
+    """
+    if entidad not in ENTIDADES:
+        raise ValueError(f"Entidad no importable: {entidad}")
+    gestor = ENTIDADES[entidad]
+
+    leidas, cabecera, (validas, rechazadas) = validar_archivo(
+        origen, gestor.CAMPOS, procesos, tamano_lote
+        )
+
+    # Duplicados, ids y escritura como una sola operación sobre el destino.
+    with gestor.bloqueo_escritura(destino):
+        registrados = gestor.indice(destino, 'documento')
+        vistos = set()
+        nuevas: List[Dict[str, str]] = []
+        duplicadas: List[Dict[str, Any]] = []
+        for numero, fila in validas:
+            documento = fila['documento']
+            error = (validadores.cedula(documento, registrados=registrados)
+                     or validadores.cedula(documento, registrados=vistos))
+            if error is not None:
+                duplicadas.append({'fila': numero, 'motivo': f"documento: {error['mensaje']}"})
+                continue
+            vistos.add(documento)
+            nuevas.append(fila)
+        if nuevas:
+            ids = gestor.reservar_ids(destino, len(nuevas))
+            gestor.agregar_registros(destino, [
+                {'id': str(id_nuevo), **fila} for id_nuevo, fila in zip(ids, nuevas)
+                ])
+
+    if duplicadas:
+        # Las válidas solo guardan los campos normalizados: el texto
+        # original de las repetidas se recupera del archivo de entrada.
+        textos = _textos_originales(origen, {r['fila'] for r in duplicadas})
+        for rechazo in duplicadas:
+            rechazo['original'] = textos[rechazo['fila']]
+        rechazadas.extend(duplicadas)
+
+    ruta = None
+    if rechazadas:
+        ruta = rechazos or ruta_rechazos(origen)
+        rechazadas.sort(key=lambda fila: fila['fila'])
+        _guardar_rechazos(ruta, cabecera, rechazadas)
+    return {
+        'leidas': leidas,
+        'importadas': len(nuevas),
+        'rechazadas': len(rechazadas),
+        'rechazos': ruta,
+        }
+
+
+def main(argumentos: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Punto de entrada por línea de comandos.
+        Args:
+            argumentos (Optional[List[str]]): Argumentos (por defecto sys.argv).
+        Returns:
+            Dict[str, Any]: Resumen de importar_csv.
+    """
+    parser = argparse.ArgumentParser(
+        description="Importación masiva de pacientes o médicos desde un CSV.")
+    parser.add_argument('entidad', choices=sorted(ENTIDADES))
+    parser.add_argument('origen', help="CSV de entrada.")
+    parser.add_argument('destino', help="Archivo de datos de la entidad.")
+    parser.add_argument('--rechazos', help="CSV donde escribir las filas rechazadas.")
+    parser.add_argument('--tamano-lote', type=int, default=TAMANO_LOTE)
+    parser.add_argument(
+        '--procesos', type=int, default=1, help="Procesos que validan en paralelo.")
+    opciones = parser.parse_args(argumentos)
+
+    resumen = importar_csv(
+        opciones.origen, opciones.destino, opciones.entidad,
+        opciones.rechazos, tamano_lote=opciones.tamano_lote, procesos=opciones.procesos)
+    print(f"Filas leídas: {resumen['leidas']}")
+    print(f"Importadas: {resumen['importadas']}")
+    print(f"Rechazadas: {resumen['rechazadas']}")
+    if resumen['rechazos']:
+        print(f"Rechazos en: {resumen['rechazos']}")
+    return resumen
+
+
+if __name__ == "__main__":
+    main()
@@ -6,25 +6,23 @@ Contiene todas las funciones para gestionar los médicos (CRUD).
 Este módulo utiliza 'gestor_datos' para la persistencia.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Container, Dict, List, Optional
 
 from Controlador import gestor_datos_medico
 
 
-def generar_id(medicos: List[Dict[str, Any]]) -> int:
+def generar_id(filepath: str) -> int:
     """
         Genera un nuevo ID autoincremental para un médico.
+        Usa la secuencia persistente del archivo: no recorre los registros.
 
         Args:
-            medicos (List[Dict[str, Any]]): Lista actual de los médicos.
+            filepath (str): Ruta al archivo de datos.
 
         Returns:
-            int: Nuevo ID a asignar.
+            int: El nuevo ID a asignar.
     """
-    if not medicos:
-        return 1
-    max_id = max(int(m.get('id', 0)) for m in medicos)
-    return max_id + 1
+    return gestor_datos_medico.siguiente_id(filepath)
 
 
 def crear_medico(
@@ -55,35 +53,35 @@ def crear_medico(
     Returns:
         Optional[Dict[str, Any]]: El médico creado o None si ya existía.
     """
-    medicos = gestor_datos_medico.cargar_datos(filepath)
     str_documento = str(documento)
 
-    # --- Validar duplicado ---
-    if any(m.get('documento') == str_documento for m in medicos):
-        print(
-            f"\n[bold red]⚠ Error:[/bold red] El documento '{str_documento}'"
-            "ya se encuentra registrado."
-            )
-        return None
-
-    # --- Generar nuevo ID ---
-    nuevo_id = generar_id(medicos)
-
-    nuevo_medico = {
-        'id': str(nuevo_id),
-        'tipo_documento': tipo_documento,
-        'documento': str_documento,
-        'nombres': nombres,
-        'apellidos': apellidos,
-        'especialidad': especialidad,
-        'telefono': str(telefono),
-        'estado': estado,
-        'consultorio': consultorio,
-    }
-
-    # --- Guardar datos ---
-    medicos.append(nuevo_medico)
-    gestor_datos_medico.guardar_datos(filepath, medicos)
+    # Validar, generar el id y anexar sin que otra terminal escriba en medio
+    with gestor_datos_medico.bloqueo_escritura(filepath):
+        # --- Validar duplicado ---
+        if gestor_datos_medico.existe_valor(filepath, 'documento', str_documento):
+            print(
+                f"\n[bold red]⚠ Error:[/bold red] El documento '{str_documento}'"
+                "ya se encuentra registrado."
+                )
+            return None
+
+        # --- Generar nuevo ID ---
+        nuevo_id = generar_id(filepath)
+
+        nuevo_medico = {
+            'id': str(nuevo_id),
+            'tipo_documento': tipo_documento,
+            'documento': str_documento,
+            'nombres': nombres,
+            'apellidos': apellidos,
+            'especialidad': especialidad,
+            'telefono': str(telefono),
+            'estado': estado,
+            'consultorio': consultorio,
+        }
+
+        # --- Guardar datos ---
+        gestor_datos_medico.agregar_registro(filepath, nuevo_medico)
 
     return nuevo_medico
 
@@ -115,11 +113,21 @@ def buscar_medico_por_documento(filepath: str, documento: str) -> Optional[
         Returns:
             Optional[Dict[str, Any]]: El médico encontrado o None si no existe.
     """
-    medicos = gestor_datos_medico.cargar_datos(filepath)
-    for medico in medicos:
-        if medico.get('documento') == documento:
-            return medico
-    return None
+    return gestor_datos_medico.buscar_registro(filepath, 'documento', documento)
+
+
+def documentos_registrados(filepath: str) -> Container[str]:
+    """
+        Documentos de los médicos registrados, para comprobar duplicados
+        con 'in' en tiempo constante (se mantiene al día con el archivo).
+
+        Args:
+            filepath (str): Ruta al archivo de datos.
+
+        Returns:
+            Container[str]: Los documentos registrados.
+    """
+    return gestor_datos_medico.valores(filepath, 'documento')
 
 
 def actualizar_medico(filepath: str, documento: str, datos_nuevos: Dict[
@@ -137,39 +145,30 @@ def actualizar_medico(filepath: str, documento: str, datos_nuevos: Dict[
         Returns:
             Optional[Dict[str, Any]]: Médico actualizado o None si no se encontró.
     """
-    medicos = gestor_datos_medico.cargar_datos(filepath)
-    medico_encontrado = None
-    indice = -1
-
-    for i, m in enumerate(medicos):
-        if m.get('documento') == documento:
-            medico_encontrado = m
-            indice = i
-            break
-
-    if medico_encontrado:
-        campos_permitidos = [
-            'nombres',
-            'apellidos',
-            'especialidad',
-            'telefono',
-            'estado',
-            'consultorio',
-            'tipo_documento'
-        ]
-
-        for key, value in datos_nuevos.items():
-            if key in campos_permitidos:
-                medico_encontrado[key] = str(value)
-            else:
-                print(f"⚠️ Advertencia: El campo '{key}' "
-                    "no está permitido para actualización.")
-
-        medicos[indice] = medico_encontrado
-        gestor_datos_medico.guardar_datos(filepath, medicos)
-        return medico_encontrado
-
-    return None
+    if not gestor_datos_medico.existe_valor(filepath, 'documento', documento):
+        return None
+
+    campos_permitidos = [
+        'nombres',
+        'apellidos',
+        'especialidad',
+        'telefono',
+        'estado',
+        'consultorio',
+        'tipo_documento'
+    ]
+
+    cambios = {}
+    for key, value in datos_nuevos.items():
+        if key in campos_permitidos:
+            cambios[key] = str(value)
+        else:
+            print(f"⚠️ Advertencia: El campo '{key}' "
+                "no está permitido para actualización.")
+
+    return gestor_datos_medico.actualizar_registro(
+        filepath, 'documento', documento, cambios
+        )
 
 
 def cambiar_estado_medico(filepath: str, documento: str, nuevo_estado: str) -> bool:
@@ -206,19 +205,4 @@ def eliminar_medico(filepath: str, documento: str) -> bool:
         Returns:
             bool: True si el medico fue eliminado, False si no se encontró.
     """
-    medicos = gestor_datos_medico.cargar_datos(filepath)
-    medico_a_eliminar = None
-
-    # Buscar el paciente
-    for medico in medicos:
-        if medico.get('documento') == documento:
-            medico_a_eliminar = medico
-            break
-
-    # Eliminarlo si existe
-    if medico_a_eliminar:
-        medicos.remove(medico_a_eliminar)
-        gestor_datos_medico.guardar_datos(filepath, medicos)
-        return True
-
-    return False
+    return gestor_datos_medico.eliminar_registro(filepath, 'documento', documento)
@@ -6,25 +6,23 @@ Contiene todas las funciones para gestionar los pacientes (CRUD).
 Este módulo utiliza 'gestor_datos' para la persistencia.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Container, Dict, List, Optional
 
 from Controlador import gestor_datos_pacientes
 
 
-def generar_id(pacientes: List[Dict[str, Any]]) -> int:
+def generar_id(filepath: str) -> int:
     """
-        Genera un nuevo ID autoincremental para un aprendiz.
+        Genera un nuevo ID autoincremental para un paciente.
+        Usa la secuencia persistente del archivo: no recorre los registros.
 
         Args:
-            pacientes (List[Dict[str, Any]]): La lista actual de aprendices.
+            filepath (str): Ruta al archivo de datos.
 
         Returns:
             int: El nuevo ID a asignar.
     """
-    if not pacientes:
-        return 1
-    max_id = max(int(ap.get('id', 0)) for ap in pacientes)
-    return max_id + 1
+    return gestor_datos_pacientes.siguiente_id(filepath)
 
 def crear_paciente(
         filepath: str,
@@ -53,27 +51,27 @@ def crear_paciente(
             Optional[Dict[str, Any]]: El diccionario del paciente creado o
             None si ya existía.
     """
-    pacientes = gestor_datos_pacientes.cargar_datos(filepath)
     str_documento = str(documento)
 
-    if any(ap.get('documento') == str_documento for ap in pacientes):
-        print(f"\n❌ Error: El documento '{str_documento}' ya se encuentra registrado.")
-        return None
-
-    nuevo_id = generar_id(pacientes)
-
-    nuevo_paciente = {
-        'id': str(nuevo_id),
-        'tipo_documento': tipo_documento,
-        'documento': str_documento,
-        'nombres': nombres,
-        'apellidos': apellidos,
-        'direccion': direccion,
-        'telefono': str(telefono)
-    }
-
-    pacientes.append(nuevo_paciente)
-    gestor_datos_pacientes.guardar_datos(filepath, pacientes)
+    # Validar, generar el id y anexar sin que otra terminal escriba en medio
+    with gestor_datos_pacientes.bloqueo_escritura(filepath):
+        if gestor_datos_pacientes.existe_valor(filepath, 'documento', str_documento):
+            print(f"\n❌ Error: El documento '{str_documento}' ya se encuentra registrado.")
+            return None
+
+        nuevo_id = generar_id(filepath)
+
+        nuevo_paciente = {
+            'id': str(nuevo_id),
+            'tipo_documento': tipo_documento,
+            'documento': str_documento,
+            'nombres': nombres,
+            'apellidos': apellidos,
+            'direccion': direccion,
+            'telefono': str(telefono)
+        }
+
+        gestor_datos_pacientes.agregar_registro(filepath, nuevo_paciente)
     return nuevo_paciente
 
 def leer_todos_los_pacientes(filepath: str) -> List[
@@ -104,11 +102,22 @@ def buscar_paciente_por_documento(filepath: str, documento: str) -> Optional[
             Optional[Dict[str, Any]]: El diccionario del paciente si se encuentra,
             de lo contrario None.
     """
-    pacientes = gestor_datos_pacientes.cargar_datos(filepath)
-    for paciente in pacientes:
-        if paciente.get('documento') == documento:
-            return paciente
-    return None
+    return gestor_datos_pacientes.buscar_registro(filepath, 'documento', documento)
+
+
+def documentos_registrados(filepath: str) -> Container[str]:
+    """
+        Documentos de los pacientes registrados, para comprobar duplicados
+        con 'in' en tiempo constante (se mantiene al día con el archivo).
+
+        Args:
+            filepath (str): Ruta al archivo de datos.
+
+        Returns:
+            Container[str]: Los documentos registrados.
+    """
+    return gestor_datos_pacientes.valores(filepath, 'documento')
+
 
 def actualizar_paciente(
         filepath: str,
@@ -127,30 +136,13 @@ def actualizar_paciente(
             Optional[Dict[str, Any]]: El diccionario del paciente actualizado,
             o None si no se encontró.
     """
-    pacientes = gestor_datos_pacientes.cargar_datos(filepath)
-    paciente_encontrado = None
-    indice = -1
-
-    # Buscar paciente por documento
-    for i, paciente in enumerate(pacientes):
-        if paciente.get('documento') == documento:  # ✅ corregido
-            paciente_encontrado = paciente
-            indice = i
-            break
-
-    if paciente_encontrado:
-        # Convertimos todos los nuevos valores a string para consistencia
-        for key, value in datos_nuevos.items():
-            datos_nuevos[key] = str(value)
-
-        # Actualizamos los datos
-        paciente_encontrado.update(datos_nuevos)
-        pacientes[indice] = paciente_encontrado
-
-        gestor_datos_pacientes.guardar_datos(filepath, pacientes)
-        return paciente_encontrado
+    # Convertimos todos los nuevos valores a string para consistencia
+    for key, value in datos_nuevos.items():
+        datos_nuevos[key] = str(value)
 
-    return None
+    return gestor_datos_pacientes.actualizar_registro(
+        filepath, 'documento', documento, datos_nuevos
+        )
 
 
 def eliminar_paciente(filepath: str, documento: str) -> bool:
@@ -164,19 +156,4 @@ def eliminar_paciente(filepath: str, documento: str) -> bool:
         Returns:
             bool: True si el paciente fue eliminado, False si no se encontró.
     """
-    pacientes = gestor_datos_pacientes.cargar_datos(filepath)
-    paciente_a_eliminar = None
-
-    # Buscar el paciente
-    for paciente in pacientes:
-        if paciente.get('documento') == documento:
-            paciente_a_eliminar = paciente
-            break
-
-    # Eliminarlo si existe
-    if paciente_a_eliminar:
-        pacientes.remove(paciente_a_eliminar)
-        gestor_datos_pacientes.guardar_datos(filepath, pacientes)
-        return True
-
-    return False
+    return gestor_datos_pacientes.eliminar_registro(filepath, 'documento', documento)
@@ -2,40 +2,46 @@
 # Validador de documento no repetido
 # -*- coding: utf-8 -*-
 
-import csv
-import json
-import os
-
 from rich.console import Console
 from rich.panel import Panel
 
+from Controlador import almacen
+
 console = Console()
 
 
 def validar_documento_unico(
-    documento: str, lista_registros: list, nombre_archivo: str
+    documento: str, lista_registros, nombre_archivo: str
     ) -> bool:
     """
-    Verifica si un documento ya está registrado en una lista de diccionarios.
+    Verifica si un documento ya está registrado.
 
     Args:
         documento (str): Documento a verificar.
-        lista_registros (list): Lista de registros cargados desde archivo
-        (cada uno es un dict).
+        lista_registros (list | dict | set): Lista de registros cargados desde
+        archivo (cada uno es un dict), o un índice por documento (como el de
+        gestor_datos_*.indice) para consultar en tiempo constante.
         nombre_archivo (str): Nombre del módulo o tipo de registro
         (ej: 'Paciente', 'Médico').
 
     Returns:
         bool: True si el documento es único, False si ya existe.
     """
-    for registro in lista_registros:
-        if str(registro.get("documento", "")).strip() == str(documento).strip():
-            console.print(Panel.fit(
-                f"[bold red]⚠️ El documento {documento} "
-                "ya está registrado en {nombre_archivo}.[/bold red]",
-                border_style="red"
-            ))
-            return False
+    documento = str(documento).strip()
+    if isinstance(lista_registros, (dict, set, frozenset)):
+        duplicado = documento in lista_registros
+    else:
+        duplicado = any(
+            str(registro.get("documento", "")).strip() == documento
+            for registro in lista_registros
+        )
+    if duplicado:
+        console.print(Panel.fit(
+            f"[bold red]⚠️ El documento {documento} "
+            f"ya está registrado en {nombre_archivo}.[/bold red]",
+            border_style="red"
+        ))
+        return False
     return True
 
 
@@ -72,28 +78,10 @@ def validar_existencia_relacion(documento, lista, tipo):
         if str(item.get("documento")) == str(documento):
             return True
 
-    # --- Definir nombres de archivos según tipo ---
+    # --- Buscar en los archivos (CSV y JSON) con el motor de datos ---
     nombre_base = tipo.lower()
-    archivo_csv = f"Data/{nombre_base}.csv"
-    archivo_json = f"Data/{nombre_base}.json"
-
-    # --- Buscar en el CSV ---
-    if os.path.exists(archivo_csv):
-        with open(archivo_csv, "r", encoding="utf-8") as f:
-            lector = csv.DictReader(f)
-            for fila in lector:
-                if str(fila.get("documento")) == str(documento):
-                    return True
-
-    # --- Buscar en el JSON ---
-    if os.path.exists(archivo_json):
-        with open(archivo_json, "r", encoding="utf-8") as f:
-            try:
-                datos = json.load(f)
-                for item in datos:
-                    if str(item.get("documento")) == str(documento):
-                        return True
-            except json.JSONDecodeError:
-                return False
-
-    return False
+    documento = str(documento).strip()
+    return any(
+        documento in almacen.leer_indice(f"Data/{nombre_base}.{formato}")
+        for formato in ("csv", "json")
+    )
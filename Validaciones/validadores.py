@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Módulo de Validadores.
+
+Reglas de validación de los campos sin interacción con el usuario: cada
+validador recibe el valor ya leído y retorna None si es válido o un error
+con un código y un mensaje. Los usan los formularios de la consola
+(validar_campos, que solo piden el dato y muestran el mensaje), las
+importaciones masivas y cualquier otro camino que reciba datos, así todos
+aplican exactamente las mismas reglas. Las comprobaciones son de cadenas
+(isdigit, longitudes, una expresión regular compilada una vez), sin
+strptime ni excepciones. Se incluye una API por lotes para validar columnas
+o listas de registros de una vez.
+"""
+
+import re
+from typing import Any, Callable, Container, Dict, Iterable, List, Optional
+
+# Horario de atención en que se pueden agendar citas (la última, en punto),
+# en franjas de 30 minutos como las de Modelo.disponibilidad.
+HORA_APERTURA = 7
+HORA_CIERRE = 18
+MINUTOS_POR_FRANJA = 30
+
+_HORA = re.compile(r'(\d{1,2}):(\d{1,2})')
+
+# {'codigo': identificador estable del error, 'mensaje': texto para el usuario}
+Error = Dict[str, str]
+Validador = Callable[[Any], Optional[Error]]
+
+
+def _error(codigo: str, mensaje: str) -> Error:
+    return {'codigo': codigo, 'mensaje': mensaje}
+
+
+def _texto(valor: Any) -> str:
+    return '' if valor is None else str(valor).strip()
+
+
+def texto(valor: Any, min_len: int = 1, max_len: int = 100) -> Optional[Error]:
+    """
+        Valida que un texto no esté vacío y cumpla la longitud.
+        Args:
+            valor (Any): Valor a validar (se ignoran los espacios de los extremos).
+            min_len (int): Longitud mínima permitida.
+            max_len (int): Longitud máxima permitida.
+        Returns:
+            Optional[Error]: None si es válido; si no, código 'vacio' o 'longitud'.
+    """
+    valor = _texto(valor)
+    if not valor:
+        return _error('vacio', "Este campo no puede estar vacío.")
+    if not min_len <= len(valor) <= max_len:
+        return _error(
+            'longitud', f"El texto debe tener entre {min_len} y {max_len} caracteres."
+            )
+    return None
+
+
+def numero(valor: Any, minimo: Optional[int] = None, maximo: Optional[int] = None) -> Optional[Error]:
+    """
+        Valida que el valor sea un entero no negativo dentro del rango.
+        Args:
+            valor (Any): Valor a validar.
+            minimo (Optional[int]): Valor mínimo permitido.
+            maximo (Optional[int]): Valor máximo permitido.
+        Returns:
+            Optional[Error]: None si es válido; si no, código 'vacio',
+            'no_numerico', 'minimo' o 'maximo'.
+    """
+    valor = _texto(valor)
+    if not valor:
+        return _error('vacio', "Este campo no puede estar vacío.")
+    if not valor.isdigit():
+        return _error('no_numerico', "Debes ingresar solo números.")
+    entero = int(valor)
+    if minimo is not None and entero < minimo:
+        return _error('minimo', f"El valor no puede ser menor que {minimo}.")
+    if maximo is not None and entero > maximo:
+        return _error('maximo', f"El valor no puede ser mayor que {maximo}.")
+    return None
+
+
+def telefono(valor: Any, min_digitos: int = 7, max_digitos: int = 10) -> Optional[Error]:
+    """
+        Valida un número de teléfono: solo dígitos y longitud válida.
+        Args:
+            valor (Any): Valor a validar.
+            min_digitos (int): Longitud mínima permitida.
+            max_digitos (int): Longitud máxima permitida.
+        Returns:
+            Optional[Error]: None si es válido; si no, código 'vacio' o 'formato'.
+    """
+    valor = _texto(valor)
+    if not valor:
+        return _error('vacio', "Este campo no puede estar vacío.")
+    if not valor.isdigit() or not min_digitos <= len(valor) <= max_digitos:
+        return _error(
+            'formato',
+            f"El teléfono debe tener entre {min_digitos} y {max_digitos} dígitos numéricos."
+            )
+    return None
+
+
+def cedula(
+    valor: Any,
+    min_digitos: int = 6,
+    max_digitos: int = 10,
+    registrados: Optional[Container[str]] = None
+    ) -> Optional[Error]:
+    """
+        Valida un número de cédula: solo dígitos, longitud válida y, si se
+        dan los documentos registrados, que no esté repetido.
+        Args:
+            valor (Any): Valor a validar.
+            min_digitos (int): Longitud mínima permitida.
+            max_digitos (int): Longitud máxima permitida.
+            registrados (Optional[Container[str]]): Documentos ya registrados
+            (un set o la vista del gestor, para consultar en tiempo constante).
+        Returns:
+            Optional[Error]: None si es válida; si no, código 'vacio',
+            'formato' o 'duplicado'.
+    """
+    valor = _texto(valor)
+    if not valor:
+        return _error('vacio', "Este campo no puede estar vacío.")
+    if not valor.isdigit() or not min_digitos <= len(valor) <= max_digitos:
+        return _error(
+            'formato',
+            f"La cédula debe tener entre {min_digitos} y {max_digitos} dígitos numéricos."
+            )
+    if registrados is not None and valor in registrados:
+        return _error('duplicado', f"La cédula {valor} ya está registrada.")
+    return None
+
+
+def hora(valor: Any) -> Optional[Error]:
+    """
+        Valida una hora HH:MM (24 horas) dentro del horario de atención
+        (07:00 a 18:00; a las 18 solo en punto) que sea el inicio de una
+        franja (:00 o :30). Así la hora de la cita es la misma clave con la
+        que se buscan los choques y se marcan las franjas ocupadas.
+        Args:
+            valor (Any): Valor a validar.
+        Returns:
+            Optional[Error]: None si es válida; si no, código 'formato',
+            'fuera_de_horario' o 'fuera_de_franja'.
+    """
+    coincidencia = _HORA.fullmatch(_texto(valor))
+    if coincidencia is None or int(coincidencia[1]) > 23 or int(coincidencia[2]) > 59:
+        return _error('formato', "Formato de hora inválido. Use el formato HH:MM (ejemplo: 09:30).")
+    horas, minutos = int(coincidencia[1]), int(coincidencia[2])
+    if not HORA_APERTURA <= horas <= HORA_CIERRE:
+        return _error(
+            'fuera_de_horario',
+            f"Solo se permiten horas entre las {HORA_APERTURA:02d}:00 y las {HORA_CIERRE:02d}:00."
+            )
+    if horas == HORA_CIERRE and minutos > 0:
+        return _error(
+            'fuera_de_horario', f"La última cita permitida es a las {HORA_CIERRE:02d}:00 en punto."
+            )
+    if minutos % MINUTOS_POR_FRANJA:
+        return _error(
+            'fuera_de_franja',
+            f"Las citas se agendan en franjas de {MINUTOS_POR_FRANJA} minutos: "
+            "use una hora en punto o y media (ejemplo: 09:30)."
+            )
+    return None
+
+
+# ---------------------------------
+# Validación por lotes
+# ---------------------------------
+def validar_valores(validador: Validador, valores: Iterable[Any]) -> List[Optional[Error]]:
+    """
+        Valida una columna de valores con el mismo validador. Cada valor
+        distinto se valida una sola vez (en una columna de horas o de
+        estados los valores se repiten mucho).
+        Args:
+            validador (Validador): Función de este módulo con sus opciones
+            ya fijadas (ej. functools.partial(telefono, max_digitos=12)).
+            valores (Iterable[Any]): Valores a validar.
+        Returns:
+            List[Optional[Error]]: El resultado de cada valor, en orden.
+    """
+    resultados: Dict[Any, Optional[Error]] = {}
+    errores: List[Optional[Error]] = []
+    for valor in valores:
+        try:
+            error = resultados[valor]
+        except KeyError:
+            error = resultados[valor] = validador(valor)
+        except TypeError:
+            # Valores no hashables: se validan sin recordar el resultado.
+            error = validador(valor)
+        errores.append(error)
+    return errores
+
+
+def validar_registros(
+    registros: Iterable[Dict[str, Any]], reglas: Dict[str, Validador]
+    ) -> List[Dict[str, Error]]:
+    """
+        Valida varios campos de cada registro.
+        Args:
+            registros (Iterable[Dict[str, Any]]): Registros a validar.
+            reglas (Dict[str, Validador]): campo → validador.
+        Returns:
+            List[Dict[str, Error]]: Por cada registro, campo → error de los
+            campos inválidos (vacío si el registro es válido).
+    """
+    registros = list(registros)
+    errores: List[Dict[str, Error]] = [{} for _ in registros]
+    for campo, validador in reglas.items():
+        columna = validar_valores(validador, (registro.get(campo) for registro in registros))
+        for encontrados, error in zip(errores, columna):
+            if error is not None:
+                encontrados[campo] = error
+    return errores
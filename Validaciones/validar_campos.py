@@ -1,17 +1,30 @@
 # -*- coding: utf-8 -*-
 
 
-import csv
-import json
-import os
-from datetime import datetime
+from typing import Container, Optional
 
 from rich.console import Console
 from rich.prompt import Prompt
 
+from Validaciones import validadores
+
 console = Console()
 
 
+def _mostrar(error: validadores.Error, icono: str = '') -> None:
+    console.print(f"[bold red]{icono} {error['mensaje']}[/bold red]")
+
+
+def _pedir(etiqueta: str, validador: validadores.Validador, icono: str = '') -> str:
+    # Pide el dato hasta que el validador lo acepte.
+    while True:
+        valor = Prompt.ask(etiqueta).strip()
+        error = validador(valor)
+        if error is None:
+            return valor
+        _mostrar(error, icono)
+
+
 # ======================================================
 #  VALIDACIÓN DE CAMPOS VACÍOS Y LONGITUD
 # ======================================================
@@ -27,16 +40,7 @@ def validar_texto(etiqueta: str, min_len: int = 1, max_len: int = 100) -> str:
     Returns:
         str: Texto ingresado por el usuario que cumple las condiciones.
     """
-    while True:
-        valor = Prompt.ask(etiqueta).strip()
-        if not valor:
-            console.print("[bold red] Este campo no puede estar vacío.[/bold red]")
-            continue
-        if len(valor) < min_len or len(valor) > max_len:
-            console.print("[bold red] El texto debe tener entre "
-                        "{min_len} y {max_len} caracteres.[/bold red]")
-            continue
-        return valor
+    return _pedir(etiqueta, lambda valor: validadores.texto(valor, min_len, max_len))
 
 
 # ======================================================
@@ -55,24 +59,7 @@ def validar_numero(etiqueta: str, minimo: int = None, maximo: int = None) -> int
     Returns:
         int: Número entero válido.
     """
-    while True:
-        valor = Prompt.ask(etiqueta).strip()
-        if not valor:
-            console.print("[bold red] Este campo no puede estar vacío.[/bold red]")
-            continue
-        if not valor.isdigit():
-            console.print("[bold red] Debes ingresar solo números.[/bold red]")
-            continue
-        valor = int(valor)
-        if minimo is not None and valor < minimo:
-            console.print(f"[bold red] El valor no puede ser menor que {minimo}."
-                        "[/bold red]")
-            continue
-        if maximo is not None and valor > maximo:
-            console.print(f"[bold red] El valor no puede ser mayor que {maximo}."
-                        "[/bold red]")
-            continue
-        return valor
+    return int(_pedir(etiqueta, lambda valor: validadores.numero(valor, minimo, maximo)))
 
 
 
@@ -95,111 +82,54 @@ def validar_telefono(etiqueta: str, min_digitos: int = 7, max_digitos: int = 10)
     Returns:
         str: Número de teléfono válido.
     """
-    while True:
-        valor = Prompt.ask(etiqueta).strip()
-        if not valor:
-            console.print("[bold red] Este campo no puede estar vacío.[/bold red]")
-            continue
-        if not valor.isdigit() or not (min_digitos <= len(valor) <= max_digitos):
-            console.print(
-                f"[bold red] El teléfono debe tener entre {min_digitos} y {max_digitos}"
-                " dígitos numéricos.[/bold red]"
-                )
-            continue
-        return valor
+    return _pedir(
+        etiqueta, lambda valor: validadores.telefono(valor, min_digitos, max_digitos)
+        )
 
 
 def validar_cedula(
-    etiqueta: str, filepath: str, min_digitos: int = 6, max_digitos: int = 10
+    etiqueta: str,
+    registrados: Optional[Container[str]] = None,
+    min_digitos: int = 6,
+    max_digitos: int = 10
     ) -> str:
     """
     Solicita un número de cédula y valida que:
     - No esté vacío.
     - Contenga solo dígitos.
     - Tenga una longitud válida.
-    - No esté duplicada en el archivo (JSON o CSV).
+    - No esté entre los documentos registrados (si se dan).
     Args:
         etiqueta (str): Texto que se muestra al usuario.
-        filepath (str): Ruta del archivo donde se guardan los registros.
+        registrados (Optional[Container[str]]): Documentos ya registrados
+        (ej. paciente.documentos_registrados(filepath)); None para validar
+        solo el formato.
         min_digitos (int): Longitud mínima permitida (por defecto 6).
         max_digitos (int): Longitud máxima permitida (por defecto 10).
     Returns:
         str: Número de cédula válido y no duplicado.
     """
-
-    # --- Cargar registros existentes ---
-    registros = []
-    if os.path.exists(filepath):
-        try:
-            if filepath.endswith(".json"):
-                with open(filepath, "r", encoding="utf-8") as f:
-                    registros = json.load(f)
-            elif filepath.endswith(".csv"):
-                with open(filepath, "r", encoding="utf-8", newline="") as f:
-                    lector = csv.DictReader(f)
-                    registros = list(lector)
-        except Exception as e:
-            console.print(
-                f"[bold yellow]⚠️ No se pudieron cargar los registros: {e}[/bold yellow]"
-                )
-
-
-    # --- Ciclo de validación ---
     while True:
         valor = Prompt.ask(etiqueta).strip()
-
-        # Validar campo vacío
-        if not valor:
-            console.print("[bold red]⚠️ Este campo no puede estar vacío.[/bold red]")
-            continue
-
-        # Validar formato y longitud
-        if not valor.isdigit() or not (min_digitos <= len(valor) <= max_digitos):
-            console.print(
-                f"[bold red]⚠️ La cédula debe tener entre {min_digitos} y {max_digitos}"
-                " dígitos numéricos.[/bold red]"
-                )
-            continue
-
-        # Validar duplicado
-        duplicado = any(
-            str(
-                registro.get("documento", "")
-                ).strip() == valor for registro in registros
-            )
-        if duplicado:
-            console.print(f"[bold red]🚫 La cédula {valor}"
-                        " ya está registrada.[/bold red]")
-            continue
-
-        # Si todo está correcto
-        return valor
+        error = validadores.cedula(valor, min_digitos, max_digitos, registrados)
+        if error is None:
+            return valor
+        _mostrar(error, "🚫" if error['codigo'] == 'duplicado' else "⚠️")
 
 
 def validar_hora(etiqueta: str) -> str:
     """
     Solicita y valida una hora en formato HH:MM (24 horas).
-    Solo permite horas entre 07:00 y 18:00 (7 a.m. - 6 p.m.).
+    Solo permite horas entre 07:00 y 18:00 (7 a.m. - 6 p.m.), en punto
+    o y media (las franjas de 30 minutos de la agenda).
     Args:
         etiqueta (str): Texto que se muestra al solicitar la hora.
     Returns:
         str: Hora validada en formato HH:MM.
     """
-    HORA_APERTURA = 7
-    HORA_CIERRE = 18
-
     while True:
         hora = input(f"⏰Ingrese {etiqueta} (HH:MM): ").strip()
-        try:
-            hora_obj = datetime.strptime(hora, "%H:%M")
-            # Validar rango permitido
-            if HORA_APERTURA <= hora_obj.hour <= HORA_CIERRE:
-                # Si es exactamente las 18:00, solo se acepta si los minutos son 00
-                if hora_obj.hour == HORA_CIERRE and hora_obj.minute > 0:
-                    print("⚠️  La última cita permitida es a las 18:00 en punto.")
-                else:
-                    return hora
-            else:
-                print("⚠️  Solo se permiten horas entre las 07:00 y las 18:00.")
-        except ValueError:
-            print("⚠️  Formato de hora inválido. Use el formato HH:MM (ejemplo: 09:30).")
+        error = validadores.hora(hora)
+        if error is None:
+            return hora
+        print(f"⚠️  {error['mensaje']}")
@@ -4,9 +4,7 @@ Vista del Módulo de Citas con selector interactivo (flechas ↑ ↓)
 y diseño mejorado con emojis para el CRUD.
 """
 import calendar
-import csv
 import datetime
-import json
 import os
 import time
 from typing import Any, Dict, List, Optional
@@ -17,7 +15,8 @@ from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
 
-from Modelo import cita, medico, paciente
+from Controlador import almacen, gestor_sqlite, particiones, utils
+from Modelo import cita, disponibilidad, medico, paciente
 from Validaciones import entrada_datos, validar_campos
 from Vista import navegacion
 from Vista.vista_estadisticas_medico import estadisticas_citas_por_medico
@@ -28,6 +27,10 @@ console = Console()
 DIRECTORIO_DATOS = 'data'
 NOMBRE_ARCHIVO_CSV = 'citas.csv'
 NOMBRE_ARCHIVO_JSON = 'citas.json'
+NOMBRE_ARCHIVO_SQLITE = 'citas.db'
+NOMBRE_ARCHIVO_JSONL = 'citas.jsonl'
+# Carpeta con un segmento por mes (almacenamiento particionado).
+NOMBRE_CARPETA_MENSUAL = 'citas'
 
 
 # =========================================================
@@ -46,8 +49,8 @@ def limpiar():
 
 def elegir_almacenamiento() -> Optional[str]:
     """
-    Seleccionar tipo de almacenamiento (CSV o JSON)
-    usando el selector interactivo.
+    Seleccionar tipo de almacenamiento (CSV, JSON, SQLite, JSON-lines o
+    particionado por mes) usando el selector interactivo.
     Args:
         none
     Returns:
@@ -59,6 +62,9 @@ def elegir_almacenamiento() -> Optional[str]:
     opciones = [
         "📄 CSV (Archivo de texto plano)",
         "🧾 JSON (Formato estructurado)",
+        "🗄️ SQLite (Base de datos)",
+        "📜 JSON-lines (Un registro por línea)",
+        "📅 Por mes (Un archivo por mes)",
         "🔙 Volver al menú principal"
     ]
 
@@ -67,7 +73,10 @@ def elegir_almacenamiento() -> Optional[str]:
         )
     OPCION_CSV=0
     OPCION_JSON=1
-    OPCION_SALIR=2
+    OPCION_SQLITE=2
+    OPCION_JSONL=3
+    OPCION_MENSUAL=4
+    OPCION_SALIR=5
     if seleccion == OPCION_CSV:
         console.print(
             "[bold green]✅ Modo de almacenamiento seleccionado: CSV[/bold green]"
@@ -82,6 +91,28 @@ def elegir_almacenamiento() -> Optional[str]:
         time.sleep(1)
         return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSON)
 
+    elif seleccion == OPCION_SQLITE:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: SQLite[/bold green]"
+            )
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_SQLITE)
+
+    elif seleccion == OPCION_JSONL:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: JSON-lines[/bold green]"
+            )
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSONL)
+
+    elif seleccion == OPCION_MENSUAL:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: Por mes[/bold green]"
+            )
+        time.sleep(1)
+        # La barra final indica que es una carpeta de segmentos.
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_CARPETA_MENSUAL, '')
+
     elif seleccion == OPCION_SALIR:
         console.print(
             "[bold red]↩ Regresando al menú principal...[/bold red]"
@@ -326,45 +357,32 @@ def estado_cita(
 # =========================================================
 def cargar_datos(ruta: str) -> List[Dict[str, Any]]:
     """
-    Carga datos desde un archivo CSV o JSON.
+    Carga datos desde un archivo CSV o JSON (con la caché del almacenamiento).
     Args:
         ruta (str): Ruta al archivo.
     Returns:
         List[Dict[str, Any]]: Lista de diccionarios con los datos.
     """
-    if not os.path.exists(ruta):
-        return []
-
     try:
-        if ruta.endswith('.json'):
-            with open(ruta, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        elif ruta.endswith('.csv'):
-            with open(ruta, 'r', encoding='utf-8') as f:
-                return list(csv.DictReader(f))
+        return almacen.leer(ruta)
     except Exception:
         return []
-    return []
 
 
 def leer_datos_archivo(filepath: str) -> List[Dict[str, Any]]:
     """
-    Lee datos desde un archivo JSON o CSV y devuelve una lista de diccionarios.
+    Lee datos desde un archivo JSON, CSV, SQLite, JSON-lines o una carpeta
+    particionada por mes y devuelve una lista de diccionarios.
     Args:
         filepath (str): Ruta al archivo de datos.
     Returns:
         List[Dict[str, Any]]: Lista de diccionarios con los datos.
     """
-    if filepath.endswith(".json"):
-        with open(filepath, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    elif filepath.endswith(".csv"):
-        with open(filepath, "r", encoding="utf-8") as f:
-            lector = csv.DictReader(f)
-            return list(lector)
+    if filepath.endswith((".json", ".csv")):
+        return almacen.leer(filepath)
+    elif gestor_sqlite.es_sqlite(filepath) or filepath.endswith(".jsonl") or (
+        particiones.es_particionado(filepath)):
+        return cita.leer_todas_las_citas(filepath)
     else:
         return []
 
@@ -437,47 +455,7 @@ def obtener_nombre_completo_por_documento(
     Returns:
         str: Nombre completo o mensaje de no encontrado.
     """
-    try:
-        registros = []
-        if tipo == "paciente":
-            # Intentar JSON
-            try:
-                registros = paciente.leer_todos_los_pacientes(
-                    "data/pacientes.json"
-                    )
-            except Exception:
-                registros = []
-            # Si no hay registros JSON, intentar CSV
-            if not registros:
-                try:
-                    registros = paciente.leer_todos_los_pacientes(
-                        "data/pacientes.csv"
-                        )
-                except Exception:
-                    registros = []
-        else:  # medico
-            try:
-                registros = medico.leer_todos_los_medicos(
-                    "data/medicos.json"
-                    )
-            except Exception:
-                registros = []
-            if not registros:
-                try:
-                    registros = medico.leer_todos_los_medicos(
-                        "data/medicos.csv"
-                        )
-                except Exception:
-                    registros = []
-
-        for r in registros:
-            if r.get("documento") == documento:
-                return f"{r.get('nombres', '')} {r.get(
-                    'apellidos', ''
-                    )}".strip()
-        return f"{documento} (no encontrado)"
-    except Exception as e:
-        return f"Error: {e}"
+    return utils.obtener_nombre_completo_por_documento(filepath, documento, tipo)
 
 
 def obtener_nombre_por_documento(
@@ -495,54 +473,42 @@ def obtener_nombre_por_documento(
     Returns:
         str: Nombre completo o mensaje de error
     """
-    documento = str(documento).strip()
+    return utils.obtener_nombre_por_documento(filepath_base, documento)
 
-    # Quitar extensión si viene incluida
-    base, ext = os.path.splitext(filepath_base)
-    if ext not in (".json", ".csv"):
-        # Probar con ambas rutas
-        rutas = [f"{base}.json", f"{base}.csv"]
-    else:
-        rutas = [filepath_base]
 
-    for ruta in rutas:
-        if not os.path.exists(ruta):
-            continue
+# =========================================================
+# 🔹 Funciones del módulo de Citas (CRUD)
+# =========================================================
+def _hora_minima(dia: datetime.date) -> Optional[str]:
+    # Hoy solo se ofrecen las horas que todavía no han pasado.
+    ahora = datetime.datetime.now()
+    return ahora.strftime("%H:%M") if dia == ahora.date() else None
 
-        try:
-            # Leer JSON
-            if ruta.endswith(".json"):
-                with open(ruta, "r", encoding="utf-8") as f:
-                    personas = json.load(f)
-            # Leer CSV
-            elif ruta.endswith(".csv"):
-                with open(ruta, "r", encoding="utf-8") as f:
-                    lector = csv.DictReader(f)
-                    personas = list(lector)
-            else:
-                continue
-        except Exception:
-            continue
-
-        # Buscar persona por documento
-        for p in personas:
-            doc = str(p.get("documento", "")).strip()
-            if doc == documento:
-                nombre = p.get("nombres", "") or p.get("nombre", "")
-                apellido = p.get("apellidos", "") or p.get("apellido", "")
-                if nombre and apellido:
-                    return f"{nombre.strip()} {apellido.strip()}"
-                elif nombre:
-                    return nombre.strip()
-                else:
-                    return "Sin nombre"
 
-    return "No encontrado"
+def mostrar_franjas_libres_del_dia(
+    filepath: str, documento_medico: str, fecha: str
+    ) -> None:
+    """
+    Muestra las horas libres del médico en la fecha elegida,
+    para que la hora se escoja sin conflictos.
+    Args:
+        filepath (str): Ruta del archivo donde se almacenan las citas.
+        documento_medico (str): Documento del médico.
+        fecha (str): Fecha elegida (YYYY-MM-DD).
+    Returns:
+        none
+    """
+    dia = datetime.date.fromisoformat(fecha)
+    libres = disponibilidad.franjas_libres(
+        filepath, documento_medico, dia, dia, hora_minima=_hora_minima(dia)
+        )
+    if libres:
+        horas = ", ".join(hora for _, hora in libres)
+        console.print(f"\n🕒 Horas libres del médico: [green]{horas}[/green]")
+    else:
+        console.print("\n[yellow]⚠ El médico no tiene horas libres ese día.[/yellow]")
 
 
-# =========================================================
-# 🔹 Funciones del módulo de Citas (CRUD)
-# =========================================================
 def menu_agendar_cita(
     filepath: str, lista_pacientes: list, lista_medicos: list):
     """
@@ -558,17 +524,15 @@ def menu_agendar_cita(
     console.print(Panel.fit("[bold cyan]🩺 Agendar Nueva Cita[/bold cyan]"))
 
     # --- Solicitar datos con validaciones ---
-    documento_paciente = validar_campos.validar_cedula(
-        "Documento del Paciente", filepath
-        )
-    documento_medico = validar_campos.validar_cedula(
-        "Documento del Médico", filepath
-        )
+    # Solo el formato: que existan se verifica abajo con las listas cargadas.
+    documento_paciente = validar_campos.validar_cedula("Documento del Paciente")
+    documento_medico = validar_campos.validar_cedula("Documento del Médico")
 
     fecha = calendario()
     if fecha is None:
         input("\nPresione Enter para continuar...")
         return
+    mostrar_franjas_libres_del_dia(filepath, documento_medico, fecha)
     hora = validar_campos.validar_hora(" la hora ")
     motivo = validar_campos.validar_texto("Motivo de la consulta")
     estado = estado_cita()
@@ -653,6 +617,8 @@ def menu_agendar_cita(
             motivo,
             estado
         )
+    except almacen.ArchivoDanado:
+        raise  # main_vista_citas explica cómo recuperar el archivo
     except Exception as e:
         console.print(Panel(
             f"❌ Error al crear la cita: {e}", border_style="red", title="Error"
@@ -678,10 +644,19 @@ def menu_agendar_cita(
         except Exception as e:
             console.print(f"[red]No se pudo actualizar estadísticas: {e}[/red]")
     else:
+        # crear_cita valida la franja con el bloqueo tomado; aquí solo se
+        # explica el motivo del rechazo.
+        conflicto = cita.conflicto_de_franja(
+            filepath, documento_paciente, documento_medico, fecha, hora
+            )
+        mensajes = {
+            'medico': f"⚠️ El médico ya tiene una cita el {fecha} a las {hora}.",
+            'paciente': f"⚠️ El paciente ya tiene una cita el {fecha} a las {hora}.",
+            }
         console.print(Panel(
-            "⚠️ Ya existe una cita con esos datos o ocurrió un error.",
+            mensajes.get(conflicto, "⚠️ Ya existe una cita con esos datos o ocurrió un error."),
             border_style="red",
-            title="Error"
+            title="❌ Error - Horario ocupado" if conflicto else "Error"
         ))
     input("\nPresione Enter para continuar...")
 
@@ -882,14 +857,22 @@ def menu_ver_todas_citas(filepath: str):
     tabla.add_column("Motivo", justify="center")
     tabla.add_column("Estado", justify="center")
 
+    # --- Resolver nombres en lote (cada archivo se lee una sola vez) ---
+    nombres_pacientes = utils.obtener_nombres_por_documentos(
+        "data/pacientes", (c.get("documento_paciente", "") for c in citas_registradas)
+    )
+    nombres_medicos = utils.obtener_nombres_por_documentos(
+        "data/medicos", (c.get("documento_medico", "") for c in citas_registradas)
+    )
+
     # --- Llenar tabla ---
     for c in citas_registradas:
-        paciente_nombre = obtener_nombre_completo_por_documento(
-            "data/pacientes.json", c.get("documento_paciente", ""), "paciente"
-        )
-        medico_nombre = obtener_nombre_completo_por_documento(
-            "data/medicos.json", c.get("documento_medico", ""), "medico"
-        )
+        doc_paciente = str(c.get("documento_paciente", "")).strip()
+        doc_medico = str(c.get("documento_medico", "")).strip()
+        paciente_nombre = nombres_pacientes.get(
+            doc_paciente, f"{doc_paciente} (no encontrado)")
+        medico_nombre = nombres_medicos.get(
+            doc_medico, f"{doc_medico} (no encontrado)")
 
         tabla.add_row(
             str(c.get("id")),
@@ -960,11 +943,16 @@ def menu_buscar_cita_por_documento(filepath: str):
         tabla.add_column("Motivo", justify="center")
         tabla.add_column("Estado", justify="center")
 
+        nombres_pacientes = utils.obtener_nombres_por_documentos(
+            "data/pacientes", (c.get("documento_paciente") for c in resultados))
+        nombres_medicos = utils.obtener_nombres_por_documentos(
+            "data/medicos", (c.get("documento_medico") for c in resultados))
+
         for c in resultados:
-            nombre_paciente = obtener_nombre_por_documento(
-                "data/pacientes", c.get("documento_paciente"))
-            nombre_medico = obtener_nombre_por_documento(
-                "data/medicos", c.get("documento_medico"))
+            nombre_paciente = nombres_pacientes.get(
+                str(c.get("documento_paciente")).strip(), "No encontrado")
+            nombre_medico = nombres_medicos.get(
+                str(c.get("documento_medico")).strip(), "No encontrado")
 
             tabla.add_row(
                 str(c.get("id_cita", c.get("id", ""))),
@@ -1008,13 +996,19 @@ def mostrar_menu_citas():
     citas_encontradas = cita.leer_todas_las_citas(filepath)
 
     if citas_encontradas:
+        nombres_pacientes = utils.obtener_nombres_por_documentos(
+            "data/pacientes", (item["documento_paciente"] for item in citas_encontradas)
+            )
+        nombres_medicos = utils.obtener_nombres_por_documentos(
+            "data/medicos", (item["documento_medico"] for item in citas_encontradas)
+            )
         for item in citas_encontradas:
-            paciente_nombre = obtener_nombre_completo_por_documento(
-                "data/pacientes.json", item["documento_paciente"], "paciente"
-                )
-            medico_nombre = obtener_nombre_completo_por_documento(
-                "data/medicos.json", item["documento_medico"], "medico"
-                )
+            doc_paciente = str(item["documento_paciente"]).strip()
+            doc_medico = str(item["documento_medico"]).strip()
+            paciente_nombre = nombres_pacientes.get(
+                doc_paciente, f"{doc_paciente} (no encontrado)")
+            medico_nombre = nombres_medicos.get(
+                doc_medico, f"{doc_medico} (no encontrado)")
 
             console.print(Panel(
                 f"[bold green]Cita encontrada:[/bold green]\n"
@@ -1034,6 +1028,65 @@ def mostrar_menu_citas():
     input("\nPresione Enter para continuar...")
 
 
+# =========================================================
+# 🔹 Buscar horarios disponibles por especialidad
+# =========================================================
+def menu_buscar_horarios_disponibles(filepath: str):
+    """
+    Muestra las próximas franjas libres de una especialidad
+    en los siguientes 7 días.
+    Args:
+        filepath (str): Ruta del archivo donde se almacenan las citas.
+    Returns:
+        none
+    """
+    limpiar()
+    console.print(Panel.fit("[bold cyan]🕒 Horarios disponibles[/bold cyan]"))
+    _, medicos = cargar_medicos_y_pacientes()
+    especialidades = sorted({
+        str(m.get("especialidad", "")).strip() for m in medicos
+        if str(m.get("especialidad", "")).strip()
+    })
+    if not especialidades:
+        console.print("[yellow]⚠️ No hay médicos registrados.[/yellow]")
+        input("\nPresione Enter para continuar...")
+        return
+
+    seleccion = selector_interactivo("Seleccione la especialidad", especialidades)
+    especialidad = especialidades[seleccion]
+    hoy = datetime.date.today()
+    libres = disponibilidad.franjas_libres_especialidad(
+        filepath, medicos, especialidad, hoy, hoy + datetime.timedelta(days=6),
+        limite=10, hora_minima=_hora_minima(hoy)
+        )
+
+    limpiar()
+    if not libres:
+        console.print(f"[yellow]⚠️ No hay horarios libres de {especialidad}"
+                    " en los próximos 7 días.[/yellow]")
+        input("\nPresione Enter para continuar...")
+        return
+
+    nombres_medicos = utils.obtener_nombres_por_documentos(
+        "data/medicos", (item["documento_medico"] for item in libres)
+        )
+    tabla = Table(
+        title=f"🕒 Próximos horarios libres - {especialidad}",
+        header_style="bold magenta"
+        )
+    tabla.add_column("Fecha", style="cyan")
+    tabla.add_column("Hora", style="cyan")
+    tabla.add_column("Médico", style="green")
+    for item in libres:
+        tabla.add_row(
+            item["fecha"],
+            item["hora"],
+            nombres_medicos.get(item["documento_medico"], item["documento_medico"])
+        )
+    console.print(tabla)
+    input("\nPresione Enter para continuar...")
+
+
 # =========================================================
 # 🔹 Menú principal interactivo
 # =========================================================
@@ -1059,28 +1112,40 @@ def main_vista_citas():
         "❌ Cancelar cita",
         "📋 Ver todas las citas",
         "🔎 Buscar cita",
+        "🕒 Horarios disponibles",
         "⬅ Volver al menú principal"
     ]
 
     while True:
         seleccion = selector_interactivo(titulo, opciones)
 
-        if seleccion == 0:
-            # 🔹 CARGAR DATOS CORRECTAMENTE
-            pacientes, medicos = cargar_medicos_y_pacientes()
-            menu_agendar_cita(archivo, pacientes, medicos)
-        elif seleccion == 1:
-            menu_actualizar_cita(archivo)
-        elif seleccion == 2:
-            menu_cancelar_cita(archivo)
-        elif seleccion == 3:
-            menu_ver_todas_citas(archivo)
-        elif seleccion == 4:
-            menu_buscar_cita_por_documento(archivo)
-        elif seleccion == 5:
+        if seleccion == 6:
             console.print("\n[bold red]⬅ Volviendo al menú principal...[/bold red]")
             break
 
+        try:
+            if seleccion == 0:
+                # 🔹 CARGAR DATOS CORRECTAMENTE
+                pacientes, medicos = cargar_medicos_y_pacientes()
+                menu_agendar_cita(archivo, pacientes, medicos)
+            elif seleccion == 1:
+                menu_actualizar_cita(archivo)
+            elif seleccion == 2:
+                menu_cancelar_cita(archivo)
+            elif seleccion == 3:
+                menu_ver_todas_citas(archivo)
+            elif seleccion == 4:
+                menu_buscar_cita_por_documento(archivo)
+            elif seleccion == 5:
+                menu_buscar_horarios_disponibles(archivo)
+        except almacen.ArchivoDanado as error:
+            # El motor no reescribe un archivo que no puede interpretar.
+            console.print(Panel(
+                f"❌ {error}\nNo se guardó ningún cambio: repare el archivo o "
+                "restaure una copia antes de continuar.",
+                border_style="red", title="Archivo de datos dañado"))
+            input("\nPresione Enter para continuar...")
+
 
 # =========================================================
 # 🔹 Ejecución directa (para pruebas)
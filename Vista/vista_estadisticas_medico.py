@@ -1,13 +1,14 @@
 # -- coding: utf-8 --
 
 
-import csv
-import json
 import os
 
 from rich.console import Console
 from rich.table import Table
 
+from Controlador import almacen
+from Modelo import analitica, estadisticas
+
 console = Console()
 
 
@@ -17,12 +18,8 @@ def cargar_datos(ruta):
         return []
 
     try:
-        if ruta.endswith(".csv"):
-            with open(ruta, "r", encoding="utf-8") as f:
-                return list(csv.DictReader(f))
-        elif ruta.endswith(".json"):
-            with open(ruta, "r", encoding="utf-8") as f:
-                return json.load(f)
+        if ruta.endswith((".csv", ".json")):
+            return almacen.leer(ruta)
         else:
             console.print(f"[yellow]⚠ Formato no soportado: {ruta}[/yellow]")
             return []
@@ -31,6 +28,30 @@ def cargar_datos(ruta):
         return []
 
 
+def conteos_citas(ruta):
+    """
+    Conteos materializados de citas por médico del archivo, o None si el
+    archivo no existe (no se crea).
+    """
+    if not os.path.exists(ruta):
+        return None
+    try:
+        return estadisticas.conteos_por_medico(ruta)
+    except Exception as e:
+        console.print(f"[red]⚠ Error al leer {ruta}:[/red] {e}")
+        return None
+
+
+def _imprimir_tabla(titulo, columnas, filas):
+    """Imprime una tabla con el estilo de las estadísticas."""
+    tabla = Table(title=titulo, border_style="cyan", header_style="bold magenta")
+    for i, columna in enumerate(columnas):
+        tabla.add_column(columna, justify="center" if i else "left")
+    for fila in filas:
+        tabla.add_row(*(str(valor) for valor in fila))
+    console.print(tabla)
+
+
 def estadisticas_citas_por_medico(
     ruta_medicos_csv="data/medicos.csv",
     ruta_medicos_json="data/medicos.json",
@@ -41,75 +62,80 @@ def estadisticas_citas_por_medico(
     """
     Genera estadísticas de citas por médico, combinando datos
     de archivos CSV y/o JSON según disponibilidad.
+    Al mostrarlas incluye además los reportes de Modelo.analitica:
+    totales y tasas por especialidad, uso por hora y tendencia semanal.
     """
 
     # --- Cargar médicos (prioriza CSV, luego JSON) ---
     medicos_data = cargar_datos(ruta_medicos_csv) or cargar_datos(ruta_medicos_json)
-    # --- Cargar citas (prioriza JSON, luego CSV) ---
-    citas_data = cargar_datos(ruta_citas_json) or cargar_datos(ruta_citas_csv)
-
-    estadisticas = []
-
-    for med in medicos_data:
-        doc_medico = str(med.get("documento", "")).strip()
-        nombre = f"{med.get('nombres', '')} {med.get('apellidos', '')}".strip()
-        especialidad = med.get("especialidad", "N/A")
-
-        # Buscar citas asociadas (comparación flexible)
-        citas_medico = [
-            c for c in citas_data
-            if str(c.get("documento_medico", "")).strip() == doc_medico
-        ]
-
-        total = len(citas_medico)
-        pendientes = aprobadas = canceladas = 0
-
-        for c in citas_medico:
-            estado = str(c.get("estado", "")).strip().lower()
-            if estado == "pendiente":
-                pendientes += 1
-            elif estado in ["completada", "aprobada", "finalizada"]:
-                aprobadas += 1
-            elif estado in ["cancelada", "anulada"]:
-                canceladas += 1
-
-        estadisticas.append({
-            "nombre": nombre,
-            "especialidad": especialidad,
-            "total": total,
-            "pendientes": pendientes,
-            "aprobadas": aprobadas,
-            "canceladas": canceladas
-        })
-
-    # --- Mostrar tabla ---
+    # --- Conteos de citas (prioriza JSON, luego CSV); se mantienen al
+    # crear, modificar o eliminar citas, sin recontar el archivo ---
+    ruta_citas, conteos = None, {}
+    for ruta in (ruta_citas_json, ruta_citas_csv):
+        encontrados = conteos_citas(ruta)
+        if encontrados:
+            ruta_citas, conteos = ruta, encontrados
+            break
+
+    medicos = analitica.tabla_medicos(medicos_data)
+    resultado = analitica.por_medico(analitica.tabla_conteos(conteos), medicos).to_dict("records")
+
+    # --- Mostrar tablas ---
     if mostrar:
-        tabla = Table(
-            title="📊 Estadísticas de Citas por Médico",
-            border_style="cyan",
-            header_style="bold magenta"
+        _imprimir_tabla(
+            "📊 Estadísticas de Citas por Médico",
+            ["👨‍⚕️ Médico", "🩺 Especialidad", "📅 Total",
+             "⏳ Pendientes", "✅ Aprobadas", "❌ Canceladas"],
+            ([e["nombre"], e["especialidad"], e["total"],
+              e["pendientes"], e["aprobadas"], e["canceladas"]] for e in resultado),
         )
 
-        tabla.add_column("👨‍⚕️ Médico")
-        tabla.add_column("🩺 Especialidad")
-        tabla.add_column("📅 Total", justify="center")
-        tabla.add_column("⏳ Pendientes", justify="center")
-        tabla.add_column("✅ Aprobadas", justify="center")
-        tabla.add_column("❌ Canceladas", justify="center")
-
-        for e in estadisticas:
-            tabla.add_row(
-                e["nombre"],
-                e["especialidad"],
-                str(e["total"]),
-                str(e["pendientes"]),
-                str(e["aprobadas"]),
-                str(e["canceladas"]),
-            )
-
-        console.print(tabla)
-
-    return estadisticas
+        # --- Totales por especialidad ---
+        _imprimir_tabla(
+            "🩺 Citas por Especialidad",
+            ["🩺 Especialidad", "👨‍⚕️ Médicos", "📅 Total",
+             "⏳ Pendientes", "✅ Aprobadas", "❌ Canceladas"],
+            ([especialidad, total["medicos"], total["total"],
+              total["pendientes"], total["aprobadas"], total["canceladas"]]
+             for especialidad, total in estadisticas.por_especialidad(conteos, medicos_data).items()),
+        )
+
+        if ruta_citas is not None:
+            mostrar_analitica(analitica.citas(ruta_citas), medicos)
+
+    return resultado
+
+
+def mostrar_analitica(tabla_citas, medicos, semanas=8):
+    """
+    Muestra las tasas por especialidad, el uso por hora y las últimas
+    semanas de la tendencia semanal calculadas sobre la tabla de citas.
+    """
+    tasas = analitica.tasas_por_especialidad(tabla_citas, medicos)
+    _imprimir_tabla(
+        "📉 Cancelación e Inasistencia por Especialidad",
+        ["🩺 Especialidad", "📅 Total", "❌ Canceladas", "% Cancelación",
+         "🚫 Inasistencias", "% Inasistencia"],
+        ([especialidad, fila.total, fila.canceladas, f"{fila.tasa_cancelacion}%",
+          fila.inasistencias, f"{fila.tasa_inasistencia}%"]
+         for especialidad, fila in zip(tasas.index, tasas.itertuples())),
+    )
+
+    uso = analitica.uso_por_hora(tabla_citas)
+    _imprimir_tabla(
+        "🕒 Uso por Hora",
+        ["🕒 Hora", "📅 Citas", "%"],
+        ([f"{hora:02d}:00", fila.citas, f"{fila.porcentaje}%"]
+         for hora, fila in zip(uso.index, uso.itertuples())),
+    )
+
+    tendencia = analitica.tendencia_semanal(tabla_citas).tail(semanas)
+    _imprimir_tabla(
+        "📈 Tendencia Semanal",
+        ["📆 Semana", "📅 Total", "⏳ Pendientes", "✅ Aprobadas", "❌ Canceladas"],
+        ([f"{semana:%Y-%m-%d}", fila.total, fila.pendientes, fila.aprobadas, fila.canceladas]
+         for semana, fila in zip(tendencia.index, tendencia.itertuples())),
+    )
 
 
 # Permitir ejecución directa desde consola
@@ -15,6 +15,8 @@ from rich.table import Table
 from rich.text import Text
 from rich.theme import Theme
 
+from Controlador import escritura
+
 # =====================================================================
 # CONFIGURACIÓN DE CRÉDITOS Y DATOS DEL PROYECTO
 # =====================================================================
@@ -86,8 +88,7 @@ def asegurar_data():
             "activo": True,
             "correo": "admin@hospital.com"
         }]
-        with open(DATA_PATH, "w", encoding="utf-8") as f:
-            json.dump(admin, f, indent=4, ensure_ascii=False)
+        escritura.guardar_json(DATA_PATH, admin, ensure_ascii=False)
 
 def leer_usuarios():
     """
@@ -109,8 +110,7 @@ def guardar_usuarios(u):
     Returns:
         None
     """
-    with open(DATA_PATH, "w", encoding="utf-8") as f:
-        json.dump(u, f, indent=4, ensure_ascii=False)
+    escritura.guardar_json(DATA_PATH, u, ensure_ascii=False)
 
 def generar_codigo():
     """
@@ -4,8 +4,6 @@ Vista del Módulo de Médicos con selector interactivo (flechas ↑ ↓)
 y diseño mejorado con emojis para el CRUD.
 """
 
-import csv
-import json
 import os
 import time
 
@@ -15,6 +13,7 @@ from rich.panel import Panel
 from rich.prompt import Confirm, Prompt
 from rich.table import Table
 
+from Controlador import almacen, gestor_sqlite
 from Modelo import medico
 from Validaciones import entrada_datos, validar_campos
 from Vista import navegacion
@@ -24,6 +23,8 @@ console = Console()
 DIRECTORIO_DATOS = 'data'
 NOMBRE_ARCHIVO_CSV = 'medicos.csv'
 NOMBRE_ARCHIVO_JSON = 'medicos.json'
+NOMBRE_ARCHIVO_SQLITE = 'medicos.db'
+NOMBRE_ARCHIVO_JSONL = 'medicos.jsonl'
 
 
 # =========================================================
@@ -42,7 +43,8 @@ def limpiar():
 
 def elegir_almacenamiento() -> str:
     """
-        Seleccionar tipo de almacenamiento (CSV o JSON) usando el selector interactivo.
+        Seleccionar tipo de almacenamiento (CSV, JSON, SQLite o JSON-lines)
+        usando el selector interactivo.
         Args:
             none
         Returns:
@@ -52,6 +54,8 @@ def elegir_almacenamiento() -> str:
     opciones = [
         "📄 CSV (Archivo de texto plano)",
         "🧾 JSON (Formato estructurado)",
+        "🗄️ SQLite (Base de datos)",
+        "📜 JSON-lines (Un registro por línea)",
         "🔙 Volver al menú principal"
     ]
 
@@ -70,6 +74,18 @@ def elegir_almacenamiento() -> str:
         return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSON)
 
     elif seleccion == 2:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: SQLite[/bold green]")
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_SQLITE)
+
+    elif seleccion == 3:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: JSON-lines[/bold green]")
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSONL)
+
+    elif seleccion == 4:
         console.print("[bold red]↩ Regresando al menú principal...[/bold red]")
         time.sleep(1)
         navegacion.ir_a_menu_principal()
@@ -301,7 +317,7 @@ def estado_medico(permitir_vacio: bool = False) -> str | None:
 
 def leer_datos_archivo(filepath):
     """
-    Lee datos desde un archivo JSON o CSV.
+    Lee datos desde un archivo JSON, CSV o SQLite.
     Retorna una lista de diccionarios o lista vacía si hay error.
     Args:
         filepath (str): Ruta del archivo.
@@ -312,12 +328,10 @@ def leer_datos_archivo(filepath):
         return []
 
     try:
-        if filepath.endswith(".json"):
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
-        elif filepath.endswith(".csv"):
-            with open(filepath, "r", encoding="utf-8") as f:
-                return list(csv.DictReader(f))
+        if filepath.endswith((".json", ".csv")):
+            return almacen.leer(filepath)
+        elif gestor_sqlite.es_sqlite(filepath):
+            return medico.leer_todos_los_medicos(filepath)
     except Exception:
         return []
     return []
@@ -333,7 +347,7 @@ def buscar_medicos(filepath_base, documento=None, especialidad=None):
 
     # Archivos posibles
     base, ext = os.path.splitext(filepath_base)
-    if ext not in (".json", ".csv"):
+    if ext not in (".json", ".csv", *gestor_sqlite.EXTENSIONES):
         rutas = [f"{base}.json", f"{base}.csv"]
     else:
         rutas = [filepath_base]
@@ -372,7 +386,9 @@ def menu_crear_medico(filepath: str):
 
     # --- Entradas con validaciones ---
     tipo_documento = solicitar_tipo_documento()
-    documento = validar_campos.validar_cedula("Número de Documento", filepath)
+    documento = validar_campos.validar_cedula(
+        "Número de Documento", medico.documentos_registrados(filepath)
+        )
     nombres = validar_campos.validar_texto("Nombres").capitalize()
     apellidos = validar_campos.validar_texto("Apellidos").capitalize()
     especialidad = solicitar_especialidad_medica()
@@ -750,20 +766,29 @@ def main_vista_medicos():
             "MÓDULO DE MÉDICOS\nUsa ↑ ↓ y Enter para seleccionar",
             opciones)
 
-        if seleccion == 0:
-            menu_crear_medico(archivo)
-        elif seleccion == 1:
-            menu_leer_medicos(archivo)
-        elif seleccion == 2:
-            menu_actualizar_medico(archivo)
-        elif seleccion == 3:
-            menu_buscar_medico(archivo)
-        elif seleccion == 4:
-            menu_eliminar_medico(archivo)
-        elif seleccion == 5:
+        if seleccion == 5:
             console.print("\n[bold red]⬅ Volviendo al menú principal...[/bold red]")
             break
 
+        try:
+            if seleccion == 0:
+                menu_crear_medico(archivo)
+            elif seleccion == 1:
+                menu_leer_medicos(archivo)
+            elif seleccion == 2:
+                menu_actualizar_medico(archivo)
+            elif seleccion == 3:
+                menu_buscar_medico(archivo)
+            elif seleccion == 4:
+                menu_eliminar_medico(archivo)
+        except almacen.ArchivoDanado as error:
+            # El motor no reescribe un archivo que no puede interpretar.
+            console.print(Panel(
+                f"❌ {error}\nNo se guardó ningún cambio: repare el archivo o "
+                "restaure una copia antes de continuar.",
+                border_style="red", title="Archivo de datos dañado"))
+            input("\nPresione Enter para continuar...")
+
 
 # =========================================================
 # 🔹 Ejecución directa (para pruebas)
@@ -12,6 +12,7 @@ from rich.panel import Panel
 from rich.prompt import Confirm, IntPrompt, Prompt
 from rich.table import Table
 
+from Controlador import almacen
 from Modelo import paciente
 from Validaciones import entrada_datos, validar_campos
 from Vista import navegacion
@@ -21,6 +22,8 @@ console = Console()
 DIRECTORIO_DATOS = 'data'
 NOMBRE_ARCHIVO_CSV = 'pacientes.csv'
 NOMBRE_ARCHIVO_JSON = 'pacientes.json'
+NOMBRE_ARCHIVO_SQLITE = 'pacientes.db'
+NOMBRE_ARCHIVO_JSONL = 'pacientes.jsonl'
 
 
 def solicitar_tipo_documento(permitir_vacio: bool = False) -> str | None:
@@ -86,7 +89,7 @@ def solicitar_tipo_documento(permitir_vacio: bool = False) -> str | None:
 def elegir_almacenamiento() -> str:
     """
         Esta función permite al usuario seleccionar el tipo de almacenamiento
-        para los datos de pacientes (CSV o JSON) mediante un selector interactivo.
+        para los datos de pacientes (CSV, JSON, SQLite o JSON-lines) mediante un selector interactivo.
         Args:
             None
         Returns:
@@ -96,6 +99,8 @@ def elegir_almacenamiento() -> str:
     opciones = [
         "📄 CSV (Archivo de texto plano)",
         "🧾 JSON (Formato estructurado)",
+        "🗄️ SQLite (Base de datos)",
+        "📜 JSON-lines (Un registro por línea)",
         "🔙 Volver al menú principal"
     ]
 
@@ -115,6 +120,18 @@ def elegir_almacenamiento() -> str:
         return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSON)
 
     elif seleccion == 2:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: SQLite[/bold green]")
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_SQLITE)
+
+    elif seleccion == 3:
+        console.print(
+            "[bold green]✅ Modo de almacenamiento seleccionado: JSON-lines[/bold green]")
+        time.sleep(1)
+        return os.path.join(DIRECTORIO_DATOS, NOMBRE_ARCHIVO_JSONL)
+
+    elif seleccion == 4:
         console.print("[bold red]↩ Regresando al menú principal...[/bold red]")
         time.sleep(1)
         navegacion.ir_a_menu_principal()
@@ -185,7 +202,9 @@ def menu_crear_paciente(filepath: str):
 
     # --- Captura de datos con validaciones individuales ---
     tipo_documento = solicitar_tipo_documento()
-    documento = validar_campos.validar_cedula("Número de Documento", filepath)
+    documento = validar_campos.validar_cedula(
+        "Número de Documento", paciente.documentos_registrados(filepath)
+        )
     nombres = validar_campos.validar_texto("Nombres").capitalize()
     apellidos = validar_campos.validar_texto("Apellidos").capitalize()
     direccion = validar_campos.validar_texto("Dirección")
@@ -416,18 +435,27 @@ def main_vista_pacientes():
         seleccion = selector_interactivo(
             "MÓDULO DE PACIENTES\nUsa ↑ ↓ y Enter para seleccionar", opciones)
 
-        if seleccion == 0:
-            menu_crear_paciente(archivo)
-        elif seleccion == 1:
-            menu_leer_pacientes(archivo)
-        elif seleccion == 2:
-            menu_actualizar_paciente(archivo)
-        elif seleccion == 3:
-            menu_eliminar_paciente(archivo)
-        elif seleccion == 4:
+        if seleccion == 4:
             console.print("\n[bold red]⬅ Volviendo al menú principal...[/bold red]")
             break
 
+        try:
+            if seleccion == 0:
+                menu_crear_paciente(archivo)
+            elif seleccion == 1:
+                menu_leer_pacientes(archivo)
+            elif seleccion == 2:
+                menu_actualizar_paciente(archivo)
+            elif seleccion == 3:
+                menu_eliminar_paciente(archivo)
+        except almacen.ArchivoDanado as error:
+            # El motor no reescribe un archivo que no puede interpretar.
+            console.print(Panel(
+                f"❌ {error}\nNo se guardó ningún cambio: repare el archivo o "
+                "restaure una copia antes de continuar.",
+                border_style="red", title="Archivo de datos dañado"))
+            input("\nPresione Enter para continuar...")
+
 
 # =========================================================
 # 🔹 Ejecución directa (para pruebas)
@@ -1,10 +1,8 @@
 # Vista/vista_principal.py
 
 import calendar
-import csv as _csv
 import json
 import os
-import re
 import time
 from datetime import datetime
 
@@ -18,7 +16,15 @@ from rich.prompt import Confirm
 from rich.table import Table
 from rich.text import Text
 
-from Controlador.utils import obtener_nombre_por_documento
+from Controlador import (
+    almacen,
+    escritura,
+    fechas,
+    fusion,
+    gestor_datos_citas,
+)
+from Controlador.utils import obtener_nombres_por_documentos
+from Modelo import calendario
 from Vista import navegacion
 from Vista.vista_estadisticas_medico import estadisticas_citas_por_medico
 
@@ -82,19 +88,15 @@ def escribir_mensaje(texto, velocidad=0.01, color="magenta"):
 
 def cargar_json(ruta):
     """
-        Carga un archivo JSON y retorna su contenido
+        Carga un archivo JSON de registros con el motor de datos (caché
+        incluida, sin crear el archivo si no existe).
         Args:
             ruta (str): Ruta al archivo JSON.
         Returns:
-            any: Contenido del archivo JSON.
+            List[Dict[str, Any]]: Registros del archivo; lista vacía si no
+            existe o está dañado.
     """
-    if not os.path.exists(ruta):
-        return []
-    try:
-        with open(ruta, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return []
+    return almacen.leer(ruta)
 
 
 def guardar_json(ruta, datos):
@@ -106,8 +108,7 @@ def guardar_json(ruta, datos):
         Returns:
             none
     """
-    with open(ruta, "w", encoding="utf-8") as f:
-        json.dump(datos, f, ensure_ascii=False, indent=4)
+    escritura.guardar_json(ruta, datos, ensure_ascii=False)
 
 
 def cargar_csv_simple(ruta):
@@ -119,20 +120,13 @@ def cargar_csv_simple(ruta):
         Returns:
             List[Dict[str, str]]: Lista de diccionarios con los datos del CSV
     """
-    if not os.path.exists(ruta):
-        return []
-    with open(ruta, "r", encoding="utf-8") as f:
-        lineas = [l.rstrip("\n") for l in f.readlines() if l.strip() != ""]
-    if not lineas:
-        return []
-    encabezado = [c.strip() for c in lineas[0].split(",")]
-    filas = []
-    for ln in lineas[1:]:
-        valores = [v.strip() for v in ln.split(",")]
-        while len(valores) < len(encabezado):
-            valores.append("")
-        filas.append(dict(zip(encabezado, valores)))
-    return filas
+    return [
+        {
+            str(campo).strip(): str(valor or "").strip()
+            for campo, valor in fila.items() if campo is not None
+            }
+        for fila in almacen.leer(ruta)
+        ]
 
 
 def guardar_citas_csv(ruta_csv, citas):
@@ -146,16 +140,14 @@ def guardar_citas_csv(ruta_csv, citas):
     """
     if not citas:
         # Si no hay citas, crear archivo vacío con encabezados
-        with open(ruta_csv, 'w', encoding='utf-8', newline='') as f:
-            writer = _csv.DictWriter(f, fieldnames=[
-                'id',
-                'documento_paciente',
-                'documento_medico',
-                'fecha',
-                'hora',
-                'motivo',
-                'estado'])
-            writer.writeheader()
+        escritura.guardar_csv(ruta_csv, [
+            'id',
+            'documento_paciente',
+            'documento_medico',
+            'fecha',
+            'hora',
+            'motivo',
+            'estado'], [])
         return True
 
     try:
@@ -178,15 +170,12 @@ def guardar_citas_csv(ruta_csv, citas):
             if c not in campos_ordenados:
                 campos_ordenados.append(c)
 
-        with open(ruta_csv, 'w', encoding='utf-8', newline='') as f:
-            writer = _csv.DictWriter(f, fieldnames=campos_ordenados)
-            writer.writeheader()
-            # quitar campos internos antes de escribir
-            filas = []
-            for c in citas:
-                row = {k: v for k, v in c.items() if not k.startswith("_")}
-                filas.append(row)
-            writer.writerows(filas)
+        # quitar campos internos antes de escribir
+        filas = []
+        for c in citas:
+            row = {k: v for k, v in c.items() if not k.startswith("_")}
+            filas.append(row)
+        escritura.guardar_csv(ruta_csv, campos_ordenados, filas)
         return True
     except Exception as e:
         console.print(f"[red]Error al guardar CSV: {e}[/red]")
@@ -197,121 +186,135 @@ def guardar_citas_csv(ruta_csv, citas):
 # ---------------------------------
 def normalizar_fecha(fecha_str):
     """
-    Intenta normalizar una fecha a formato YYYY-MM-DD.
+    Normaliza una fecha a formato YYYY-MM-DD.
     Si no puede parsear, devuelve la cadena original.
     Soporta formatos comunes: YYYY-MM-DD, DD/MM/YYYY, DD-MM-YYYY, YYYY/MM/DD.
+    Las fechas que ya están en YYYY-MM-DD se devuelven sin convertir y las
+    demás se interpretan una sola vez por texto (ver Controlador.fechas).
     """
-    if not fecha_str:
-        return ""
-    fecha_str = fecha_str.strip()
-    formatos = ["%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y/%m/%d", "%Y-%d-%m"]
-    for fmt in formatos:
-        try:
-            dt = datetime.strptime(fecha_str, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except Exception:
-            continue
-    # si no pudo, intentar heurística: si contiene '/' y patrón dd/mm/yyyy invert
-    m = re.match(r"(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{2,4})", fecha_str)
-    if m:
-        d, mo, y = m.groups()
-        if len(y) == 2:
-            y = "20" + y
-        try:
-            dt = datetime(int(y), int(mo), int(d))
-            return dt.strftime("%Y-%m-%d")
-        except Exception:
-            pass
-    # fallback: devolver original (no normalizada)
-    return fecha_str
+    return fechas.normalizar(fecha_str)
 
 # ---------------------------------
 # CARGAR / ELIMINAR CITAS (JSON + CSV juntos)
 # ---------------------------------
+def _marcar_origen(c, origen):
+    """
+    Copia de la cita con la fecha normalizada y el campo interno "_source".
+    """
+    c = dict(c)  # copia
+    raw_fecha = c.get("fecha", "")
+    c["_original_fecha"] = raw_fecha
+    c["fecha"] = fechas.normalizar(raw_fecha)
+    c["_source"] = origen
+    return c
+
+
+def cargar_citas_fusionadas(ruta_base="data/citas", mes=None):
+    """
+    Carga las citas de todos los almacenamientos (carpeta por mes, JSON,
+    CSV, JSON-lines y SQLite, en paralelo) y las
+    une sin ids repetidos: si un id está en varios archivos se muestra una
+    sola vez, tomada del de más precedencia (fusion.PRECEDENCIA_POR_DEFECTO).
+    Cada cita lleva el campo interno "_source" con el archivo del que salió.
+    Args:
+        ruta_base (str): Ruta base sin extensión
+        mes (tuple): (año, mes) para cargar solo ese mes (opcional)
+    Returns:
+        dict: resultado de fusion.cargar con las citas ya marcadas
+    """
+    try:
+        resultado = fusion.cargar(ruta_base, mes=mes)
+    except Exception:
+        return {"citas": [], "fuentes": [], "origenes": {}, "ubicaciones": {},
+                "estadisticas": {"leidas": {}, "total": 0, "repetidas": 0, "descartadas": 0}}
+    resultado["citas"] = [
+        _marcar_origen(c, origen)
+        for c, origen in zip(resultado["citas"], resultado["fuentes"])
+    ]
+    return resultado
+
+
 def cargar_citas(ruta_base="data/citas"):
     """
-    Carga citas desde JSON y CSV, las fusiona y retorna la lista combinada.
-    Cada cita contiene el campo interno "_source" con valor "json" o "csv".
+    Carga las citas de todos los almacenamientos y retorna la lista
+    unida, sin ids repetidos.
+    Cada cita contiene el campo interno "_source" con su origen ("mensual",
+    "json", "csv", "jsonl" o "db").
     Args:
         ruta_base (str): Ruta base sin extensión
     Returns:
         list: lista de citas combinadas
     """
-    ruta_json = ruta_base + ".json"
-    ruta_csv = ruta_base + ".csv"
+    return cargar_citas_fusionadas(ruta_base)["citas"]
 
-    citas_comb = []
 
-    # JSON
-    if os.path.exists(ruta_json):
-        try:
-            j = cargar_json(ruta_json)
-            if isinstance(j, list):
-                for c in j:
-                    c = dict(c)  # copia
-                    # normalizar fecha si existe
-                    raw_fecha = c.get("fecha", "")
-                    c["_original_fecha"] = raw_fecha
-                    c["fecha"] = normalizar_fecha(raw_fecha) if raw_fecha else ""
-                    c["_source"] = "json"
-                    citas_comb.append(c)
-        except Exception:
-            pass
+def cargar_citas_mes(año, mes, ruta_base="data/citas"):
+    """
+    Carga solo las citas de un mes de todos los almacenamientos.
+    De la carpeta particionada se lee únicamente el segmento del mes.
+    Args:
+        año (int): Año a consultar.
+        mes (int): Mes a consultar (1-12).
+        ruta_base (str): Ruta base sin extensión
+    Returns:
+        list: citas del mes, con "_source" como en cargar_citas
+    """
+    return cargar_citas_fusionadas(ruta_base, (año, mes))["citas"]
 
-    # CSV
-    if os.path.exists(ruta_csv):
-        try:
-            cvs = cargar_csv_simple(ruta_csv)
-            for c in cvs:
-                c = dict(c)  # copia
-                raw_fecha = c.get("fecha", "")
-                c["_original_fecha"] = raw_fecha
-                c["fecha"] = normalizar_fecha(raw_fecha) if raw_fecha else ""
-                c["_source"] = "csv"
-                citas_comb.append(c)
-        except Exception:
-            pass
 
-    return citas_comb
+def resumen_calendario(año, mes, ruta_base="data/citas"):
+    """
+    Resumen de las citas de un mes de todos los formatos, contado sobre la
+    vista unida (sin ids repetidos), así coincide con la vista del día.
+    Solo se leen las citas del mes (de la carpeta por mes, su segmento).
+    Args:
+        año (int): Año a consultar.
+        mes (int): Mes a consultar (1-12).
+        ruta_base (str): Ruta base sin extensión
+    Returns:
+        tuple: (resumen con 'total', 'dias' y 'estados'; formatos con citas)
+    """
+    try:
+        resultado = fusion.cargar(ruta_base, mes=(año, mes))
+    except Exception:
+        return calendario.resumen_vacio(), []
+    formatos = sorted(
+        origen for origen, cantidad in resultado["estadisticas"]["leidas"].items() if cantidad)
+    return calendario.resumen_de_citas(resultado["citas"], año, mes), formatos
+
+def migrar_fechas_citas(ruta_base="data/citas"):
+    """
+    Reescribe una sola vez las fechas de todos los archivos de citas en
+    formato YYYY-MM-DD, para que las cargas posteriores no las conviertan.
+    Args:
+        ruta_base (str): Ruta base sin extensión
+    Returns:
+        dict: archivo → cantidad de fechas reescritas
+    """
+    resultado = {}
+    rutas = [ruta_base] + [
+        ruta_base + extension for extension in (".json", ".csv", ".jsonl", ".db")]
+    for ruta in rutas:
+        existe = os.path.isdir(ruta) if ruta == ruta_base else os.path.isfile(ruta)
+        if existe:
+            resultado[ruta] = gestor_datos_citas.normalizar_fechas(ruta)
+    return resultado
 
 def eliminar_cita_por_id(id_cita, ruta_base="data/citas"):
     """
-    Elimina la cita con id `id_cita` buscando tanto en JSON como en CSV.
-    Si existe en ambos, elimina de ambos (retorna info de dónde fue eliminada).
+    Elimina la cita con id `id_cita` de los archivos que la contienen
+    (de cualquier almacenamiento). Solo se reescriben esos archivos.
     Args:
         id_cita (str)
         ruta_base (str)
     Returns:
-        dict: {'json': bool, 'csv': bool} indicando si se eliminó en cada formato
+        dict: origen → bool (ver fusion.ORIGENES) indicando si se
+        eliminó en cada formato
     """
-    id_cita = str(id_cita)
-    ruta_json = ruta_base + ".json"
-    ruta_csv = ruta_base + ".csv"
-    resultado = {"json": False, "csv": False}
-
-    # JSON
-    if os.path.exists(ruta_json):
-        try:
-            citas = cargar_json(ruta_json) or []
-            citas_n = [c for c in citas if str(c.get("id", "")) != id_cita]
-            if len(citas_n) != len(citas):
-                guardar_json(ruta_json, citas_n)
-                resultado["json"] = True
-        except Exception:
-            pass
-
-    # CSV
-    if os.path.exists(ruta_csv):
-        try:
-            cvs = cargar_csv_simple(ruta_csv) or []
-            cvs_n = [c for c in cvs if str(c.get("id", "")) != id_cita]
-            if len(cvs_n) != len(cvs):
-                guardar_citas_csv(ruta_csv, cvs_n)
-                resultado["csv"] = True
-        except Exception:
-            pass
-
-    return resultado
+    try:
+        return fusion.eliminar(ruta_base, id_cita)
+    except Exception:
+        return dict.fromkeys(fusion.ORIGENES, False)
 
 # ============================================================
 # MOSTRAR TABLA DE CITAS (se mantiene la versión genérica)
@@ -375,13 +378,19 @@ def mostrar_tabla_citas(
     tabla.add_column("📁 Origen", justify="center", style="white")
     tabla.add_column("📌 Estado", justify="center", style="bold")
 
+    # Resolver todos los nombres en lote: un solo parseo por archivo
+    nombres_pacientes = obtener_nombres_por_documentos(
+        "data/pacientes", (c.get("documento_paciente", "") for c in citas))
+    nombres_medicos = obtener_nombres_por_documentos(
+        "data/medicos", (c.get("documento_medico", "") for c in citas))
+
     for idx, c in enumerate(citas, start=1):
         # Usar los nombres de campos correctos del modelo
-        doc_paciente = c.get("documento_paciente", "")
-        doc_medico = c.get("documento_medico", "")
+        doc_paciente = str(c.get("documento_paciente", "")).strip()
+        doc_medico = str(c.get("documento_medico", "")).strip()
 
-        nombre_paciente = obtener_nombre_por_documento("data/pacientes", doc_paciente)
-        nombre_medico = obtener_nombre_por_documento("data/medicos", doc_medico)
+        nombre_paciente = nombres_pacientes.get(doc_paciente, "No encontrado")
+        nombre_medico = nombres_medicos.get(doc_medico, "No encontrado")
 
         estado = str(c.get("estado", "Desconocido")).capitalize()
         if estado.lower() == "pendiente":
@@ -432,33 +441,16 @@ def mostrar_calendario_interactivo(ruta_citas="data/citas"):
     while True:
         limpiar()
 
-        citas = cargar_citas(ruta_citas)
-
-        dias_citas = set()
-        for c in citas:
-            fecha_str = c.get("fecha", "")
-            if not fecha_str:
-                continue
-            try:
-                f = datetime.strptime(fecha_str, "%Y-%m-%d")
-                if f.year == año and f.month == mes:
-                    dias_citas.add(f.day)
-            except Exception:
-                continue
+        # Solo las citas del mes, unidas como en la vista del día
+        resumen, formatos_presentes = resumen_calendario(año, mes, ruta_citas)
+        dias_citas = set(resumen["dias"])
+        citas_este_mes = resumen["total"]
+        estados_display = " | ".join(
+            f"{(estado or 'sin estado').capitalize()}: {cantidad}"
+            for estado, cantidad in sorted(resumen["estados"].items()))
 
         nombre_mes = calendar.month_name[mes]
-        citas_este_mes = 0
-        for c in citas:
-            fecha_str = c.get("fecha", "")
-            try:
-                f = datetime.strptime(fecha_str, "%Y-%m-%d")
-                if f.year == año and f.month == mes:
-                    citas_este_mes += 1
-            except Exception:
-                continue
 
-        formatos_presentes = sorted(list(
-            {c.get("_source", "") for c in citas if c.get("_source")}))
         formato_display = "+".join(
             [f.upper() for f in formatos_presentes]
             ) if formatos_presentes else "Ninguno"
@@ -469,7 +461,8 @@ def mostrar_calendario_interactivo(ruta_citas="data/citas"):
         panel_titulo = Panel.fit(
             f"📅 [bold bright_cyan]{nombre_mes} {año}[/bold bright_cyan]\n"
             f"[dim]Citas este mes: {citas_este_mes} | Formato: {
-                icono_formato} {formato_display}[/dim]",
+                icono_formato} {formato_display}[/dim]"
+            + (f"\n[dim]{estados_display}[/dim]" if estados_display else ""),
             border_style="bright_green",
             box=ROUNDED,
             padding=(0, 4)
@@ -565,7 +558,8 @@ def mostrar_citas_por_dia(año, mes, dia, ruta_citas="data/citas"):
     """
     fecha = f"{año:04d}-{mes:02d}-{dia:02d}"
 
-    citas = cargar_citas(ruta_citas)
+    resultado = cargar_citas_fusionadas(ruta_citas, (año, mes))
+    citas = resultado["citas"]
     citas_dia = []
     for c in citas:
         if c.get("fecha") == fecha:
@@ -595,15 +589,16 @@ def mostrar_citas_por_dia(año, mes, dia, ruta_citas="data/citas"):
     tabla.add_column("📁 Origen", justify="center", style="white")
     tabla.add_column("📌 Estado", justify="center", style="bold")
 
+    nombres_pacientes = obtener_nombres_por_documentos(
+        "data/pacientes", (c.get("documento_paciente", "") for c in citas_dia))
+    nombres_medicos = obtener_nombres_por_documentos(
+        "data/medicos", (c.get("documento_medico", "") for c in citas_dia))
+
     for idx, c in enumerate(citas_dia, start=1):
-        nombre_paciente = obtener_nombre_por_documento(
-            "data/pacientes",
-            c.get("documento_paciente",
-                ""))
-        nombre_medico = obtener_nombre_por_documento(
-            "data/medicos",
-            c.get("documento_medico",
-                ""))
+        nombre_paciente = nombres_pacientes.get(
+            str(c.get("documento_paciente", "")).strip(), "No encontrado")
+        nombre_medico = nombres_medicos.get(
+            str(c.get("documento_medico", "")).strip(), "No encontrado")
         estado = str(c.get("estado", "Desconocido")).capitalize()
         if estado.lower() == "pendiente":
             color_estado = "[bold yellow]🕒 Pendiente[/bold yellow]"
@@ -629,6 +624,13 @@ def mostrar_citas_por_dia(año, mes, dia, ruta_citas="data/citas"):
 
     console.print(tabla)
 
+    estadisticas = resultado["estadisticas"]
+    if estadisticas["repetidas"]:
+        console.print(
+            f"[dim]Se unificaron {estadisticas['repetidas']} citas repetidas entre "
+            f"archivos (precedencia: {' > '.join(fusion.PRECEDENCIA_POR_DEFECTO).upper()})"
+            "[/dim]")
+
     console.print(
         "\n[cyan]Acciones:[/cyan] Ingrese [yellow]ID de cita[/yellow] para cancelar "
         "(se mostrará el origen), o [cyan]Enter[/cyan] para volver."
@@ -879,8 +881,7 @@ def verificar_citas_debug():
     """
     ruta = "data/citas.json"
     if os.path.exists(ruta):
-        with open(ruta, 'r', encoding='utf-8') as f:
-            citas = json.load(f)
+        citas = almacen.leer(ruta)
 
         console.print(Panel(f"[bold green]✅ Archivo encontrado: {ruta}[/bold green]"))
         console.print(f"[cyan]Total de citas:[/cyan] {len(citas)}")
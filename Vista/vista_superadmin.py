@@ -10,6 +10,7 @@ from rich.theme import Theme
 
 # Importar funciones del login
 from Vista.vista_login import guardar_usuarios, leer_usuarios
+from Vista.vista_principal import migrar_fechas_citas
 
 # ---------- CONFIGURACIÓN ----------
 custom_theme = Theme({
@@ -101,6 +102,7 @@ def panel_superadmin(usuario):
             "🗑 Eliminar usuario",
             "🔑 Resetear contraseña",
             "🔒 Cambiar mi contraseña",
+            "📅 Normalizar fechas de citas",
             "🚪 Salir"
         ]
         idx = selector_lista_con_flechas("Panel Superadmin", opciones, allow_back=False)
@@ -204,6 +206,17 @@ def panel_superadmin(usuario):
                         time.sleep(1.4)
                     break
 
+        # --- NORMALIZAR FECHAS (migración de una sola vez) ---
+        elif "Normalizar fechas" in accion:
+            if confirmar_accion("¿Reescribir las fechas de las citas en formato [bold]YYYY-MM-DD[/bold]?", color="green"):
+                resultado = migrar_fechas_citas()
+                detalle = "\n".join(f"- {origen}: {cantidad}" for origen, cantidad in resultado.items())
+                console.print(Panel(f"[ok]📅 Fechas normalizadas por archivo:[/ok]\n{detalle or 'No hay archivos de citas.'}", border_style="green", width=70))
+                time.sleep(1.6)
+            else:
+                console.print(Panel("[warn]❗ Acción cancelada por el usuario.[/warn]", border_style="yellow", width=70))
+                time.sleep(1.2)
+
         # --- SALIR ---
         elif "Salir" in accion:
             console.print(Panel("[bold red]👋 Cerrando sesión de superadmin...[/bold red]", border_style="red", width=70))
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+Prueba de concurrencia: varios procesos escritores sobre el mismo archivo.
+
+Simula varias terminales de recepción que agendan citas y luego actualizan
+su estado, todas contra el mismo archivo de citas. Al final verifica que no
+se haya perdido ninguna cita ni actualización y que no haya ids repetidos,
+y reporta el rendimiento total.
+
+Uso:
+    python -m benchmarks.concurrencia --procesos 8 --citas-por-proceso 50 --formato json
+"""
+
+import argparse
+import datetime
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from Controlador import gestor_datos_citas
+from Modelo import cita, disponibilidad
+
+console = Console()
+
+PRIMER_DIA = datetime.date(2026, 1, 1)
+
+
+def _escritor(filepath: str, proceso: int, cantidad: int, inicio) -> None:
+    # Cada proceso agenda citas en franjas propias (sin conflictos de
+    # horario) y luego actualiza su estado con el camino optimista.
+    inicio.wait()
+    creadas = []
+    with open(os.devnull, 'w', encoding='utf-8') as nulo:
+        os.dup2(nulo.fileno(), 1)
+        for k in range(cantidad):
+            nueva = cita.crear_cita(
+                filepath,
+                f"P{proceso}-{k}",
+                f"M{proceso}",
+                (PRIMER_DIA + datetime.timedelta(
+                    days=k // disponibilidad.TOTAL_FRANJAS)).isoformat(),
+                disponibilidad.hora_de_franja(k % disponibilidad.TOTAL_FRANJAS),
+                'Control',
+                'Pendiente',
+                )
+            if nueva:
+                creadas.append(nueva['id'])
+        for id_cita in creadas:
+            cita.actualizar_cita(filepath, id_cita, {'estado': 'Completada'})
+
+
+def ejecutar(
+    directorio: str, procesos: int = 8, citas_por_proceso: int = 50, formato: str = 'json'
+    ) -> Dict[str, Any]:
+    """
+        Lanza los procesos escritores y verifica el resultado.
+        Args:
+            directorio (str): Carpeta donde se crea el archivo de citas.
+            procesos (int): Cantidad de procesos escritores.
+            citas_por_proceso (int): Citas que agenda cada proceso.
+            formato (str): 'csv' o 'json'.
+        Returns:
+            Dict[str, Any]: operaciones, segundos, ops_por_segundo,
+            citas_perdidas, ids_repetidos y actualizaciones_perdidas.
+    """
+    filepath = os.path.join(directorio, f"citas.{formato}")
+    gestor_datos_citas.inicializar_archivo(filepath)
+
+    contexto = multiprocessing.get_context('spawn')
+    inicio = contexto.Event()
+    trabajadores = [
+        contexto.Process(
+            target=_escritor, args=(filepath, proceso, citas_por_proceso, inicio)
+            )
+        for proceso in range(procesos)
+    ]
+    for trabajador in trabajadores:
+        trabajador.start()
+    # Se espera a que todos arranquen antes de medir.
+    time.sleep(1)
+    comienzo = time.perf_counter()
+    inicio.set()
+    for trabajador in trabajadores:
+        trabajador.join()
+    segundos = time.perf_counter() - comienzo
+
+    citas = gestor_datos_citas.cargar_datos(filepath)
+    esperadas = procesos * citas_por_proceso
+    operaciones = esperadas * 2
+    repetidos = sum(n - 1 for n in Counter(c.get('id') for c in citas).values() if n > 1)
+    return {
+        'formato': formato,
+        'procesos': procesos,
+        'operaciones': operaciones,
+        'segundos': segundos,
+        'ops_por_segundo': operaciones / segundos if segundos else 0.0,
+        'citas_perdidas': esperadas - len(citas),
+        'ids_repetidos': repetidos,
+        'actualizaciones_perdidas': sum(
+            1 for c in citas if c.get('estado') != 'Completada'
+            ),
+    }
+
+
+def main(argumentos: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+        Punto de entrada por línea de comandos.
+        Args:
+            argumentos (Optional[List[str]]): Argumentos (por defecto sys.argv).
+        Returns:
+            Dict[str, Any]: Resultado de la prueba.
+    """
+    parser = argparse.ArgumentParser(
+        description="Prueba de escritura concurrente sobre el archivo de citas.")
+    parser.add_argument('--procesos', type=int, default=8)
+    parser.add_argument('--citas-por-proceso', type=int, default=50)
+    parser.add_argument('--formato', choices=('csv', 'json'), default='json')
+    opciones = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory(prefix='bench_concurrencia_') as directorio:
+        resultado = ejecutar(
+            directorio, opciones.procesos, opciones.citas_por_proceso, opciones.formato)
+
+    tabla = Table(title="🔒 Escritura concurrente", header_style="bold magenta")
+    for clave in resultado:
+        tabla.add_column(clave.replace('_', ' '), justify="right")
+    tabla.add_row(*(
+        f"{valor:,.2f}" if isinstance(valor, float) else str(valor)
+        for valor in resultado.values()
+    ))
+    console.print(tabla)
+    return resultado
+
+
+if __name__ == "__main__":
+    main()
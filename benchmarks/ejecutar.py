@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Pruebas de rendimiento de las operaciones más usadas (CRUD y vistas).
+
+Genera un conjunto de datos sintético en una carpeta temporal y mide
+crear_cita, buscar_paciente_por_documento, actualizar_medico, cargar_citas,
+estadisticas_citas_por_medico y el dibujo de la tabla de citas (sobre una
+consola que descarta la salida). Por cada prueba reporta operaciones por
+segundo, latencia p50/p99 y el pico de memoria de una operación.
+
+Uso:
+    python -m benchmarks.ejecutar --pacientes 5000 --medicos 100 --citas 50000
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import json
+import math
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks import generador
+from Controlador import cache_datos
+from Modelo import cita, medico, paciente
+from Vista import vista_estadisticas_medico, vista_principal
+
+console = Console()
+
+# Operaciones medidas con tracemalloc para estimar el pico de memoria.
+OPERACIONES_MEMORIA = 3
+
+
+def percentil(valores: List[float], porcentaje: float) -> float:
+    """
+        Percentil por rango más cercano.
+        Args:
+            valores (List[float]): Valores ya ordenados.
+            porcentaje (float): Percentil buscado (0-100).
+        Returns:
+            float: Valor del percentil o 0 si no hay valores.
+    """
+    if not valores:
+        return 0.0
+    posicion = max(1, math.ceil(porcentaje / 100 * len(valores)))
+    return valores[posicion - 1]
+
+
+def medir(
+    prueba: str,
+    formato: str,
+    operacion: Callable[[int], Any],
+    repeticiones: int
+    ) -> Dict[str, Any]:
+    """
+        Ejecuta una operación varias veces y resume su rendimiento.
+        Las latencias se toman sin tracemalloc; el pico de memoria se mide
+        aparte con unas pocas operaciones adicionales.
+        Args:
+            prueba (str): Nombre de la prueba.
+            formato (str): Formato de los datos usados (csv, json, ...).
+            operacion (Callable[[int], Any]): Recibe el número de repetición.
+            repeticiones (int): Cantidad de veces a ejecutarla.
+        Returns:
+            Dict[str, Any]: prueba, formato, operaciones, ops_por_segundo,
+            p50_ms, p99_ms y memoria_pico_kb.
+    """
+    gc.collect()
+    latencias = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        operacion(i)
+        latencias.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    for i in range(repeticiones, repeticiones + OPERACIONES_MEMORIA):
+        tracemalloc.reset_peak()
+        operacion(i)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencias.sort()
+    total = sum(latencias)
+    return {
+        'prueba': prueba,
+        'formato': formato,
+        'operaciones': repeticiones,
+        'ops_por_segundo': repeticiones / total if total else 0.0,
+        'p50_ms': percentil(latencias, 50) * 1000,
+        'p99_ms': percentil(latencias, 99) * 1000,
+        'memoria_pico_kb': pico / 1024,
+    }
+
+
+@contextlib.contextmanager
+def _entorno(directorio: str) -> Iterator[None]:
+    """
+        Ejecuta las pruebas dentro de 'directorio' (las vistas usan rutas
+        relativas a data/), sin salida en pantalla y con la caché vacía.
+    """
+    anterior = os.getcwd()
+    consolas = {
+        modulo: modulo.console
+        for modulo in (vista_principal, vista_estadisticas_medico)
+        }
+    with open(os.devnull, 'w', encoding='utf-8') as nulo:
+        try:
+            os.chdir(directorio)
+            cache_datos.invalidar()
+            for modulo in consolas:
+                modulo.console = Console(file=nulo, width=160)
+            with contextlib.redirect_stdout(nulo):
+                yield
+        finally:
+            for modulo, original in consolas.items():
+                modulo.console = original
+            os.chdir(anterior)
+            cache_datos.invalidar()
+
+
+def ejecutar(
+    directorio: str,
+    datos: Dict[str, List[Dict[str, Any]]],
+    *,
+    repeticiones: int = 200,
+    repeticiones_vistas: int = 20,
+    filas_tabla: int = 500,
+    semilla: int = 0
+    ) -> List[Dict[str, Any]]:
+    """
+        Ejecuta todas las pruebas sobre los datos ya generados en 'directorio'.
+        Las vistas se miden primero, antes de que las pruebas de escritura
+        modifiquen los archivos.
+        Args:
+            directorio (str): Carpeta que contiene la carpeta data generada.
+            datos (Dict[str, List[Dict[str, Any]]]): Registros generados.
+            repeticiones (int): Repeticiones de cada operación CRUD.
+            repeticiones_vistas (int): Repeticiones de cada vista.
+            filas_tabla (int): Citas a dibujar en la tabla.
+            semilla (int): Semilla para elegir los registros consultados.
+        Returns:
+            List[Dict[str, Any]]: Un resultado de medir() por prueba.
+    """
+    rng = random.Random(f"ejecutar-{semilla}")
+    documentos_pacientes = [p['documento'] for p in datos['pacientes']]
+    documentos_medicos = [m['documento'] for m in datos['medicos']]
+    resultados = []
+
+    with _entorno(directorio):
+        resultados.append(medir(
+            'cargar_citas', 'json+csv',
+            lambda _: vista_principal.cargar_citas('data/citas'),
+            repeticiones_vistas
+            ))
+        resultados.append(medir(
+            'estadisticas_citas_por_medico', 'csv/json',
+            lambda _: vista_estadisticas_medico.estadisticas_citas_por_medico(),
+            repeticiones_vistas
+            ))
+        citas_tabla = datos['citas'][:filas_tabla]
+        resultados.append(medir(
+            f'mostrar_tabla_citas ({len(citas_tabla)} filas)', 'json+csv',
+            lambda _: vista_principal.mostrar_tabla_citas(citas_tabla),
+            repeticiones_vistas
+            ))
+
+        for formato in generador.FORMATOS:
+            ruta_pacientes = os.path.join('data', f'pacientes.{formato}')
+            ruta_medicos = os.path.join('data', f'medicos.{formato}')
+            ruta_citas = os.path.join('data', f'citas.{formato}')
+
+            def buscar_paciente(_):
+                paciente.buscar_paciente_por_documento(
+                    ruta_pacientes, rng.choice(documentos_pacientes))
+
+            def actualizar_medico(i):
+                medico.actualizar_medico(
+                    ruta_medicos, rng.choice(documentos_medicos),
+                    {'telefono': 3100000000 + i})
+
+            def crear_cita(_):
+                fecha = datetime.date(2026, 1, 1) + datetime.timedelta(
+                    days=rng.randrange(365))
+                cita.crear_cita(
+                    ruta_citas, rng.choice(documentos_pacientes),
+                    rng.choice(documentos_medicos), fecha.isoformat(),
+                    rng.choice(generador.HORAS), 'Control', 'Pendiente')
+
+            resultados.append(medir(
+                'buscar_paciente_por_documento', formato, buscar_paciente, repeticiones))
+            resultados.append(medir(
+                'actualizar_medico', formato, actualizar_medico, repeticiones))
+            resultados.append(medir('crear_cita', formato, crear_cita, repeticiones))
+
+    return resultados
+
+
+def mostrar_resultados(resultados: List[Dict[str, Any]]) -> None:
+    """
+        Muestra los resultados en una tabla.
+        Args:
+            resultados (List[Dict[str, Any]]): Resultados de ejecutar().
+        Returns:
+            None
+    """
+    tabla = Table(title="⏱️ Rendimiento", header_style="bold magenta")
+    tabla.add_column("Prueba", style="cyan")
+    tabla.add_column("Formato")
+    tabla.add_column("Ops", justify="right")
+    tabla.add_column("Ops/s", justify="right")
+    tabla.add_column("p50 (ms)", justify="right")
+    tabla.add_column("p99 (ms)", justify="right")
+    tabla.add_column("Memoria pico (KB)", justify="right")
+    for r in resultados:
+        tabla.add_row(
+            r['prueba'],
+            r['formato'],
+            str(r['operaciones']),
+            f"{r['ops_por_segundo']:,.1f}",
+            f"{r['p50_ms']:.3f}",
+            f"{r['p99_ms']:.3f}",
+            f"{r['memoria_pico_kb']:,.1f}",
+        )
+    console.print(tabla)
+
+
+def main(argumentos: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+        Punto de entrada por línea de comandos.
+        Args:
+            argumentos (Optional[List[str]]): Argumentos (por defecto sys.argv).
+        Returns:
+            List[Dict[str, Any]]: Resultados de las pruebas.
+    """
+    parser = argparse.ArgumentParser(
+        description="Pruebas de rendimiento del sistema de citas médicas.")
+    parser.add_argument('--pacientes', type=int, default=1000)
+    parser.add_argument('--medicos', type=int, default=50)
+    parser.add_argument('--citas', type=int, default=10000)
+    parser.add_argument('--repeticiones', type=int, default=200)
+    parser.add_argument('--repeticiones-vistas', type=int, default=20)
+    parser.add_argument('--filas-tabla', type=int, default=500)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument(
+        '--salida', help="Archivo JSON donde guardar los resultados.")
+    opciones = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory(prefix='bench_citas_') as directorio:
+        console.print(
+            f"[bold]Generando {opciones.pacientes} pacientes, {opciones.medicos} "
+            f"médicos y {opciones.citas} citas (semilla {opciones.semilla})...[/bold]")
+        datos = generador.generar_archivos(
+            directorio, opciones.pacientes, opciones.medicos,
+            opciones.citas, opciones.semilla)
+        resultados = ejecutar(
+            directorio, datos, repeticiones=opciones.repeticiones,
+            repeticiones_vistas=opciones.repeticiones_vistas,
+            filas_tabla=opciones.filas_tabla, semilla=opciones.semilla)
+
+    mostrar_resultados(resultados)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'parametros': vars(opciones),
+                'resultados': resultados,
+            }, archivo, indent=4)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
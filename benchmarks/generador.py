@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Generador de datos sintéticos para las pruebas de rendimiento.
+
+Crea pacientes, médicos y citas con una semilla fija, de modo que la misma
+semilla produce siempre los mismos registros, y los guarda en CSV, JSON y
+JSON-lines con los gestores de datos del proyecto.
+"""
+
+import datetime
+import os
+import random
+from typing import Any, Dict, Iterator, List
+
+from Controlador import gestor_datos_citas, gestor_datos_medico, gestor_datos_pacientes
+
+NOMBRES = [
+    'Ana', 'Luis', 'Camila', 'Andres', 'Sofia', 'Jorge', 'Valentina',
+    'Santiago', 'Daniela', 'Felipe', 'Laura', 'Sebastian', 'Maria', 'Carlos'
+    ]
+APELLIDOS = [
+    'Gonzalez', 'Ramirez', 'Ardila', 'Angarita', 'Bernal', 'Fuentes',
+    'Garcia', 'Sosa', 'Rodriguez', 'Martinez', 'Lopez', 'Perez', 'Torres'
+    ]
+ESPECIALIDADES = [
+    'Medicina General', 'Pediatría', 'Cardiología', 'Dermatología',
+    'Neurología', 'Psiquiatría', 'Oftalmología', 'Odontologia'
+    ]
+ESTADOS_CITA = ['Pendiente', 'Pendiente', 'Completada', 'Cancelada']
+MOTIVOS = ['Control', 'Dolor de cabeza', 'Chequeo general', 'Gripa', 'Examen']
+HORAS = [f"{h:02d}:{m:02d}" for h in range(7, 18) for m in (0, 30)] + ['18:00']
+FORMATOS = ('csv', 'json', 'jsonl')
+
+
+def _persona(rng: random.Random, id_persona: int, documento: int) -> Dict[str, Any]:
+    return {
+        'id': str(id_persona),
+        'tipo_documento': 'C.C',
+        'documento': str(documento),
+        'nombres': rng.choice(NOMBRES),
+        'apellidos': f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}",
+        'direccion': f"Calle {rng.randint(1, 200)} #{rng.randint(1, 99)}-{rng.randint(1, 99)}",
+        'telefono': str(3000000000 + rng.randint(0, 99999999)),
+    }
+
+
+def iterar_pacientes(cantidad: int, semilla: int = 0) -> Iterator[Dict[str, Any]]:
+    """
+        Genera pacientes sintéticos de a uno, sin tenerlos todos en memoria
+        (ej. para escribir archivos de millones de filas).
+        Args:
+            cantidad (int): Número de pacientes.
+            semilla (int): Semilla del generador aleatorio.
+        Returns:
+            Iterator[Dict[str, Any]]: Pacientes con los campos del gestor.
+    """
+    rng = random.Random(f"pacientes-{semilla}")
+    for i in range(1, cantidad + 1):
+        yield _persona(rng, i, 1000000000 + i)
+
+
+def generar_pacientes(cantidad: int, semilla: int = 0) -> List[Dict[str, Any]]:
+    """
+        Genera pacientes sintéticos con documentos únicos.
+        Args:
+            cantidad (int): Número de pacientes.
+            semilla (int): Semilla del generador aleatorio.
+        Returns:
+            List[Dict[str, Any]]: Pacientes con los campos del gestor.
+    """
+    return list(iterar_pacientes(cantidad, semilla))
+
+
+def generar_medicos(cantidad: int, semilla: int = 0) -> List[Dict[str, Any]]:
+    """
+        Genera médicos sintéticos con documentos únicos.
+        Args:
+            cantidad (int): Número de médicos.
+            semilla (int): Semilla del generador aleatorio.
+        Returns:
+            List[Dict[str, Any]]: Médicos con los campos del gestor.
+    """
+    rng = random.Random(f"medicos-{semilla}")
+    medicos = []
+    for i in range(1, cantidad + 1):
+        medico = _persona(rng, i, 2000000000 + i)
+        medico.update({
+            'especialidad': rng.choice(ESPECIALIDADES),
+            'estado': 'Activo' if rng.random() < 0.9 else 'Inactivo',
+            'consultorio': str(rng.randint(100, 599)),
+            'hospital': '',
+        })
+        medicos.append(medico)
+    return medicos
+
+
+def generar_citas(
+    cantidad: int,
+    pacientes: List[Dict[str, Any]],
+    medicos: List[Dict[str, Any]],
+    *,
+    semilla: int = 0,
+    fecha_inicio: datetime.date = datetime.date(2025, 1, 1),
+    dias: int = 365
+    ) -> List[Dict[str, Any]]:
+    """
+        Genera citas sintéticas entre los pacientes y médicos dados,
+        repartidas en un rango de días.
+        Args:
+            cantidad (int): Número de citas.
+            pacientes (List[Dict[str, Any]]): Pacientes existentes.
+            medicos (List[Dict[str, Any]]): Médicos existentes.
+            semilla (int): Semilla del generador aleatorio.
+            fecha_inicio (datetime.date): Primer día del rango.
+            dias (int): Cantidad de días del rango.
+        Returns:
+            List[Dict[str, Any]]: Citas con los campos del gestor.
+    """
+    if cantidad and (not pacientes or not medicos):
+        raise ValueError("Se necesitan pacientes y médicos para generar citas.")
+    rng = random.Random(f"citas-{semilla}")
+    citas = []
+    for i in range(1, cantidad + 1):
+        fecha = fecha_inicio + datetime.timedelta(days=rng.randrange(dias))
+        citas.append({
+            'id': str(i),
+            'documento_paciente': rng.choice(pacientes)['documento'],
+            'documento_medico': rng.choice(medicos)['documento'],
+            'fecha': fecha.isoformat(),
+            'hora': rng.choice(HORAS),
+            'motivo': rng.choice(MOTIVOS),
+            'estado': rng.choice(ESTADOS_CITA),
+        })
+    return citas
+
+
+def generar_archivos(
+    directorio: str,
+    pacientes: int,
+    medicos: int,
+    citas: int,
+    semilla: int = 0
+    ) -> Dict[str, List[Dict[str, Any]]]:
+    """
+        Genera el conjunto de datos y lo guarda en CSV, JSON y JSON-lines
+        dentro de 'directorio' (data/pacientes.csv, data/pacientes.json, ...), con la
+        misma estructura que la carpeta data del proyecto.
+        Args:
+            directorio (str): Carpeta raíz donde se crea la carpeta data.
+            pacientes (int): Número de pacientes.
+            medicos (int): Número de médicos.
+            citas (int): Número de citas.
+            semilla (int): Semilla del generador aleatorio.
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Registros generados por entidad.
+    """
+    datos = {
+        'pacientes': generar_pacientes(pacientes, semilla),
+        'medicos': generar_medicos(medicos, semilla),
+    }
+    datos['citas'] = generar_citas(
+        citas, datos['pacientes'], datos['medicos'], semilla=semilla)
+
+    gestores = {
+        'pacientes': gestor_datos_pacientes,
+        'medicos': gestor_datos_medico,
+        'citas': gestor_datos_citas,
+    }
+    carpeta = os.path.join(directorio, 'data')
+    os.makedirs(carpeta, exist_ok=True)
+    for entidad, gestor in gestores.items():
+        for formato in FORMATOS:
+            ruta = os.path.join(carpeta, f"{entidad}.{formato}")
+            gestor.guardar_datos(ruta, datos[entidad])
+    return datos
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Prueba de escalado de la validación en las importaciones masivas.
+
+Genera un CSV sintético de pacientes (con una fracción de filas inválidas)
+y mide la etapa de validación de Modelo.importacion con 1, 2, 4, ...
+procesos, reportando filas por segundo y la aceleración respecto de un solo
+proceso. Opcionalmente mide también la importación completa a un archivo
+JSON-lines con el mayor número de procesos.
+
+Uso:
+    python -m benchmarks.importacion --filas 1000000 --procesos 1 2 4 8
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks import generador
+from Controlador import gestor_datos_pacientes
+from Modelo import importacion
+
+console = Console()
+
+# Fracción de filas con documento o teléfono inválido.
+FRACCION_INVALIDAS = 0.02
+
+
+def generar_csv(ruta: str, filas: int, semilla: int = 0) -> None:
+    """
+        Escribe un CSV de pacientes para importar, sin cargarlo en memoria.
+        Args:
+            ruta (str): Ruta del CSV a crear.
+            filas (int): Cantidad de filas.
+            semilla (int): Semilla del generador aleatorio.
+        Returns:
+            None
+    """
+    rng = random.Random(f"importacion-{semilla}")
+    campos = [c for c in gestor_datos_pacientes.CAMPOS if c != 'id']
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(campos)
+        for i, persona in enumerate(generador.iterar_pacientes(filas, semilla), start=1):
+            if rng.random() < FRACCION_INVALIDAS:
+                persona['telefono' if i % 2 else 'documento'] = 'x' + str(i)
+            escritor.writerow([persona[c] for c in campos])
+
+
+def ejecutar(
+    origen: str, procesos: List[int], tamano_lote: int, destino: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+    """
+        Mide la validación del CSV con cada cantidad de procesos.
+        Args:
+            origen (str): CSV de entrada.
+            procesos (List[int]): Cantidades de procesos a medir.
+            tamano_lote (int): Filas por lote.
+            destino (Optional[str]): Si se da, se mide también la importación
+            completa a ese archivo con la mayor cantidad de procesos.
+        Returns:
+            List[Dict[str, Any]]: Un resultado por medición.
+    """
+    resultados = []
+    base = None
+    for cantidad in procesos:
+        inicio = time.perf_counter()
+        leidas, _, (validas, rechazadas) = importacion.validar_archivo(
+            origen, gestor_datos_pacientes.CAMPOS, cantidad, tamano_lote)
+        segundos = time.perf_counter() - inicio
+        base = base or segundos
+        resultados.append({
+            'etapa': 'validación',
+            'procesos': cantidad,
+            'filas': leidas,
+            'validas': len(validas),
+            'rechazadas': len(rechazadas),
+            'segundos': segundos,
+            'filas_por_segundo': leidas / segundos if segundos else 0.0,
+            'aceleracion': base / segundos if segundos else 0.0,
+        })
+    if destino:
+        cantidad = max(procesos)
+        inicio = time.perf_counter()
+        resumen = importacion.importar_csv(
+            origen, destino, 'pacientes', tamano_lote=tamano_lote, procesos=cantidad)
+        segundos = time.perf_counter() - inicio
+        resultados.append({
+            'etapa': 'importación',
+            'procesos': cantidad,
+            'filas': resumen['leidas'],
+            'validas': resumen['importadas'],
+            'rechazadas': resumen['rechazadas'],
+            'segundos': segundos,
+            'filas_por_segundo': resumen['leidas'] / segundos if segundos else 0.0,
+            'aceleracion': base / segundos if segundos else 0.0,
+        })
+    return resultados
+
+
+def mostrar_resultados(resultados: List[Dict[str, Any]]) -> None:
+    """
+        Muestra los resultados en una tabla.
+        Args:
+            resultados (List[Dict[str, Any]]): Resultados de ejecutar().
+        Returns:
+            None
+    """
+    tabla = Table(title="⏱️ Importación masiva", header_style="bold magenta")
+    tabla.add_column("Etapa", style="cyan")
+    tabla.add_column("Procesos", justify="right")
+    tabla.add_column("Filas", justify="right")
+    tabla.add_column("Rechazadas", justify="right")
+    tabla.add_column("Segundos", justify="right")
+    tabla.add_column("Filas/s", justify="right")
+    tabla.add_column("Aceleración", justify="right")
+    for r in resultados:
+        tabla.add_row(
+            r['etapa'],
+            str(r['procesos']),
+            f"{r['filas']:,}",
+            f"{r['rechazadas']:,}",
+            f"{r['segundos']:.2f}",
+            f"{r['filas_por_segundo']:,.0f}",
+            f"{r['aceleracion']:.2f}x",
+        )
+    console.print(tabla)
+
+
+def main(argumentos: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+        Punto de entrada por línea de comandos.
+        Args:
+            argumentos (Optional[List[str]]): Argumentos (por defecto sys.argv).
+        Returns:
+            List[Dict[str, Any]]: Resultados de las mediciones.
+    """
+    parser = argparse.ArgumentParser(
+        description="Escalado de la validación de importaciones masivas.")
+    parser.add_argument('--filas', type=int, default=1000000)
+    parser.add_argument(
+        '--procesos', type=int, nargs='+',
+        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--tamano-lote', type=int, default=importacion.TAMANO_LOTE)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument(
+        '--importar', action='store_true',
+        help="Medir también la importación completa a JSON-lines.")
+    parser.add_argument(
+        '--salida', help="Archivo JSON donde guardar los resultados.")
+    opciones = parser.parse_args(argumentos)
+
+    with tempfile.TemporaryDirectory(prefix='bench_importacion_') as directorio:
+        origen = os.path.join(directorio, 'pacientes_nuevos.csv')
+        console.print(
+            f"[bold]Generando {opciones.filas:,} filas (semilla {opciones.semilla}); "
+            f"{os.cpu_count()} núcleos disponibles...[/bold]")
+        generar_csv(origen, opciones.filas, opciones.semilla)
+        destino = os.path.join(directorio, 'pacientes.jsonl') if opciones.importar else None
+        resultados = ejecutar(
+            origen, opciones.procesos, opciones.tamano_lote, destino)
+
+    mostrar_resultados(resultados)
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'parametros': vars(opciones),
+                'resultados': resultados,
+            }, archivo, indent=4)
+    return resultados
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import pytest
+
+from Controlador import (
+    almacen,
+    cache_datos,
+    gestor_datos_citas,
+    gestor_datos_medico,
+    gestor_datos_pacientes,
+    )
+
+ESQUEMA = almacen.esquema(
+    "Consultorio", ["id", "numero", "piso"], "consultorios", [("numero",)]
+    )
+agregar = almacen.ligar(ESQUEMA, almacen.agregar_registro)
+buscar = almacen.ligar(ESQUEMA, almacen.buscar_registro)
+actualizar = almacen.ligar(ESQUEMA, almacen.actualizar_registro)
+eliminar = almacen.ligar(ESQUEMA, almacen.eliminar_registro)
+cargar = almacen.ligar(ESQUEMA, almacen.cargar_datos)
+
+
+@pytest.mark.parametrize("extension", ["csv", "json", "jsonl", "db"])
+def test_valores_refleja_el_archivo(tmp_path, extension):
+    filepath = str(tmp_path / f"consultorios.{extension}")
+    numeros = almacen.valores(ESQUEMA, filepath, "numero")
+    assert "101" not in numeros
+    agregar(filepath, {"id": "1", "numero": "101", "piso": "1"})
+    assert "101" in numeros and " 101 " in numeros
+    eliminar(filepath, "numero", "101")
+    assert "101" not in numeros
+
+
+@pytest.mark.parametrize("extension", ["csv", "json", "jsonl", "db"])
+def test_entidad_nueva_con_su_esquema(tmp_path, extension):
+    # Una entidad nueva solo declara su esquema: todos los formatos funcionan.
+    filepath = str(tmp_path / f"consultorios.{extension}")
+    agregar(filepath, {"id": "1", "numero": "101", "piso": "1"})
+    agregar(filepath, {"id": "2", "numero": "202", "piso": "2"})
+
+    assert buscar(filepath, "numero", "202")["piso"] == "2"
+    assert actualizar(filepath, "id", "1", {"piso": "3"})["piso"] == "3"
+    assert eliminar(filepath, "numero", "202")
+    assert [(c["numero"], c["piso"]) for c in cargar(filepath)] == [("101", "3")]
+
+
+def test_ligar_conserva_nombre_y_documentacion():
+    assert gestor_datos_medico.cargar_datos.__name__ == "cargar_datos"
+    assert "Args:" in gestor_datos_medico.cargar_datos.__doc__
+    assert "esquema (Esquema)" not in gestor_datos_medico.cargar_datos.__doc__
+    assert gestor_datos_citas.Cita is gestor_datos_citas.ESQUEMA["tipo"]
+
+
+def test_derivados_de_medicos_se_mantienen(tmp_path):
+    # Lo que antes solo tenían las citas (derivados mantenidos al modificar)
+    # ahora lo tienen todas las entidades.
+    filepath = str(tmp_path / "medicos.json")
+    gestor_datos_medico.agregar_registro(filepath, {"id": "1", "documento": "10", "especialidad": "Pediatría"})
+    construidos = []
+
+    def construir(medicos):
+        construidos.append(1)
+        conteo = {}
+        for medico in medicos:
+            conteo[medico["especialidad"]] = conteo.get(medico["especialidad"], 0) + 1
+        return conteo
+
+    def sumar(conteo, medico):
+        conteo[medico["especialidad"]] = conteo.get(medico["especialidad"], 0) + 1
+
+    def restar(conteo, medico):
+        conteo[medico["especialidad"]] -= 1
+
+    def por_especialidad():
+        return gestor_datos_medico.derivado(
+            filepath, "por_especialidad", construir, sumar, retirador=restar
+            )
+
+    assert por_especialidad() == {"Pediatría": 1}
+    gestor_datos_medico.agregar_registro(filepath, {"id": "2", "documento": "20", "especialidad": "Pediatría"})
+    gestor_datos_medico.actualizar_registro(filepath, "id", "1", {"especialidad": "Neurología"})
+    assert por_especialidad() == {"Pediatría": 1, "Neurología": 1}
+    assert len(construidos) == 1
+
+
+def test_leer_no_crea_archivos(tmp_path):
+    filepath = tmp_path / "no_existe.json"
+    assert almacen.leer(filepath) == []
+    assert not filepath.exists()
+    filepath.write_text("{no es json", encoding="utf-8")
+    cache_datos.invalidar()
+    assert almacen.leer(filepath) == []
+
+
+def test_leer_indice_solo_consulta(tmp_path):
+    filepath = tmp_path / "medicos.jsonl"
+    assert almacen.leer_indice(filepath) == {}
+    assert not filepath.exists()
+    filepath.write_text('{"documento": " 9 ", "nombres": "Rosa"}\n', encoding="utf-8")
+    cache_datos.invalidar()
+    assert [m["nombres"] for m in almacen.leer_indice(filepath)["9"]] == ["Rosa"]
+    danado = tmp_path / "medicos.json"
+    danado.write_text("[{", encoding="utf-8")
+    assert almacen.leer_indice(danado) == {}
+
+
+@pytest.mark.parametrize("recorte", [5, 1])
+def test_json_danado_no_se_reemplaza_al_agregar(tmp_path, recorte):
+    # Un anexo interrumpido deja el JSON cortado: agregar no debe
+    # reescribirlo con solo el registro nuevo.
+    filepath = tmp_path / "pacientes.json"
+    for i in range(1, 4):
+        gestor_datos_pacientes.agregar_registro(str(filepath), {"id": str(i), "documento": str(100 + i)})
+    original = filepath.read_bytes()
+    filepath.write_bytes(original[:-recorte])
+    danado = filepath.read_bytes()
+
+    with pytest.raises(almacen.ArchivoDanado):
+        gestor_datos_pacientes.agregar_registro(str(filepath), {"id": "4", "documento": "104"})
+    with pytest.raises(almacen.ArchivoDanado):
+        gestor_datos_pacientes.eliminar_registro(str(filepath), "id", "1")
+    assert filepath.read_bytes() == danado
+
+
+def test_json_vacio_se_escribe_completo(tmp_path):
+    filepath = tmp_path / "pacientes.json"
+    filepath.write_text("  \n", encoding="utf-8")
+    gestor_datos_pacientes.agregar_registro(str(filepath), {"id": "1", "documento": "101"})
+    assert [p["documento"] for p in gestor_datos_pacientes.cargar_datos(str(filepath))] == ["101"]
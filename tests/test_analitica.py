@@ -0,0 +1,96 @@
+import pandas as pd
+
+from Controlador import gestor_datos_citas as gestor
+from Modelo import analitica, estadisticas
+
+CITAS = [
+    {"id": "1", "documento_medico": " 100 ", "fecha": "2025-11-03", "hora": "08:00", "estado": "Pendiente"},
+    {"id": "2", "documento_medico": "100", "fecha": "06/11/2025", "hora": "09:30", "estado": "Completada"},
+    {"id": "3", "documento_medico": "100", "fecha": "2025-11-10", "hora": "08:00", "estado": "Cancelada"},
+    {"id": "4", "documento_medico": "200", "fecha": "2025-11-11", "hora": "10:00", "estado": "No asistio"},
+    {"id": "5", "documento_medico": "200", "fecha": "sin fecha", "hora": "", "estado": "Pendiente"},
+]
+MEDICOS = [
+    {"documento": "100", "nombres": "Ana", "apellidos": "Ruiz", "especialidad": "Pediatría"},
+    {"documento": "200", "nombres": "Luis", "apellidos": "Gil", "especialidad": "Pediatría"},
+    {"documento": "300", "nombres": "Eva", "apellidos": "Paz", "especialidad": ""},
+]
+
+
+def test_tipos_de_la_tabla_de_citas():
+    tabla = analitica.tabla_citas(CITAS)
+    assert isinstance(tabla["estado"].dtype, pd.CategoricalDtype)
+    assert tabla["fecha"].dtype.kind == "M"
+    assert tabla.loc[1, "fecha_hora"] == pd.Timestamp("2025-11-06 09:30")
+    assert pd.isna(tabla.loc[4, "fecha"])
+    assert tabla.loc[0, "documento_medico"] == "100"
+
+
+def test_conteos_coinciden_con_los_materializados():
+    tabla = analitica.tabla_citas(CITAS)
+    esperado = analitica.tabla_conteos(estadisticas._construir(CITAS))
+    pd.testing.assert_frame_equal(analitica.conteos(tabla), esperado.sort_index())
+
+    por_medico = analitica.por_medico(analitica.conteos(tabla), analitica.tabla_medicos(MEDICOS))
+    assert por_medico.to_dict("records")[0] == {
+        "nombre": "Ana Ruiz", "especialidad": "Pediatría",
+        "total": 3, "pendientes": 1, "aprobadas": 1, "canceladas": 1}
+    assert por_medico.loc[2, "especialidad"] == "N/A"
+    assert por_medico.loc[2, "total"] == 0
+
+
+def test_reportes():
+    tabla = analitica.tabla_citas(CITAS)
+    medicos = analitica.tabla_medicos(MEDICOS)
+
+    uso = analitica.uso_por_hora(tabla)
+    assert uso["citas"].to_dict() == {8: 1, 9: 1, 10: 1}
+
+    tasas = analitica.tasas_por_especialidad(tabla, medicos)
+    assert tasas.loc["Pediatría", "total"] == 5
+    assert tasas.loc["Pediatría", "tasa_cancelacion"] == 20.0
+    assert tasas.loc["Pediatría", "tasa_inasistencia"] == 20.0
+
+    semanas = analitica.tendencia_semanal(tabla)
+    assert semanas["total"].to_dict() == {
+        pd.Timestamp("2025-11-03"): 2, pd.Timestamp("2025-11-10"): 2}
+    assert semanas.loc[pd.Timestamp("2025-11-10"), "canceladas"] == 1
+
+
+def test_tabla_de_citas_por_version_del_archivo(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    gestor.guardar_datos(filepath, CITAS)
+    tabla = analitica.citas(filepath)
+    assert analitica.citas(filepath) is tabla
+    gestor.eliminar_registro(filepath, "id", "1")
+    assert len(analitica.citas(filepath)) == 4
+
+
+def test_tabla_de_citas_se_pone_al_dia_sin_reconstruirse(tmp_path, monkeypatch):
+    filepath = str(tmp_path / "citas.json")
+    gestor.guardar_datos(filepath, CITAS)
+    analitica.citas(filepath)
+    construidas = []
+    original = analitica.tabla_citas
+
+    def contar(registros):
+        registros = list(registros)
+        construidas.append(len(registros))
+        return original(registros)
+
+    monkeypatch.setattr(analitica, "tabla_citas", contar)
+    gestor.agregar_registro(filepath, {
+        "id": "6", "documento_medico": "300", "fecha": "2025-11-12", "hora": "07:30", "estado": "Raro"})
+    gestor.agregar_registro(filepath, {
+        "id": "7", "documento_medico": "300", "fecha": "2025-11-12", "hora": "08:00", "estado": "Pendiente"})
+    gestor.eliminar_registro(filepath, "id", "7")
+    gestor.eliminar_registro(filepath, "id", "2")
+    gestor.actualizar_registro(filepath, "id", "3", {"estado": "Pendiente"})
+
+    tabla = analitica.citas(filepath).sort_values("id", ignore_index=True)
+    assert construidas == [2]  # solo las citas nuevas
+    esperada = original(gestor.cargar_datos(filepath)).sort_values("id", ignore_index=True)
+    pd.testing.assert_frame_equal(tabla, esperada, check_categorical=False)
+    assert list(tabla["id"]) == ["1", "3", "4", "5", "6"]
+    assert isinstance(tabla["estado"].dtype, pd.CategoricalDtype)
+    assert tabla.loc[1, "grupo"] == "pendientes"
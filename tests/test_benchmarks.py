@@ -0,0 +1,35 @@
+from benchmarks import ejecutar, generador
+from Controlador import gestor_datos_citas
+
+
+def test_generador_reproducible(tmp_path):
+    datos = generador.generar_archivos(str(tmp_path), 20, 5, 50, semilla=7)
+    otra = generador.generar_archivos(str(tmp_path / "otra"), 20, 5, 50, semilla=7)
+    assert datos == otra
+
+    documentos = {p["documento"] for p in datos["pacientes"]}
+    assert len(documentos) == 20
+    assert all(c["documento_paciente"] in documentos for c in datos["citas"])
+
+    for formato in generador.FORMATOS:
+        ruta = str(tmp_path / "data" / f"citas.{formato}")
+        assert gestor_datos_citas.cargar_datos(ruta) == datos["citas"]
+
+
+def test_percentil():
+    valores = [float(v) for v in range(1, 101)]
+    assert ejecutar.percentil(valores, 50) == 50.0
+    assert ejecutar.percentil(valores, 99) == 99.0
+    assert ejecutar.percentil([], 50) == 0.0
+
+
+def test_ejecutar_reporta_todas_las_pruebas(tmp_path):
+    datos = generador.generar_archivos(str(tmp_path), 10, 3, 20)
+    resultados = ejecutar.ejecutar(
+        str(tmp_path), datos, repeticiones=2, repeticiones_vistas=1, filas_tabla=5)
+
+    pruebas = {(r["prueba"].split()[0], r["formato"]) for r in resultados}
+    assert ("crear_cita", "csv") in pruebas
+    assert ("actualizar_medico", "json") in pruebas
+    assert ("mostrar_tabla_citas", "json+csv") in pruebas
+    assert all(r["ops_por_segundo"] > 0 for r in resultados)
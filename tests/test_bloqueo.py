@@ -0,0 +1,54 @@
+import pytest
+
+from benchmarks import concurrencia
+from Controlador import bloqueo
+from Controlador import gestor_datos_citas as gestor
+
+
+def test_version_obsoleta_no_sobrescribe(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    gestor.guardar_datos(filepath, [{"id": "1", "estado": "Pendiente"}])
+    version = bloqueo.version(filepath)
+    datos = gestor.cargar_datos(filepath)
+
+    # Otra terminal escribe entre la lectura y la escritura
+    gestor.agregar_registro(filepath, {"id": "2", "estado": "Pendiente"})
+
+    datos[0]["estado"] = "Completada"
+    with pytest.raises(bloqueo.VersionObsoleta):
+        gestor.guardar_datos(filepath, datos, version_esperada=version)
+    assert [c["id"] for c in gestor.cargar_datos(filepath)] == ["1", "2"]
+
+
+def test_reintentar_termina_con_bloqueo_exclusivo(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    intentos = []
+
+    def operacion():
+        intentos.append(1)
+        if len(intentos) <= bloqueo.REINTENTOS:
+            raise bloqueo.VersionObsoleta("cambió")
+        return "ok"
+
+    assert bloqueo.reintentar(filepath, operacion) == "ok"
+    assert len(intentos) == bloqueo.REINTENTOS + 1
+
+
+def test_bloqueo_reentrante(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    with bloqueo.exclusivo(filepath):
+        with bloqueo.exclusivo(filepath), bloqueo.compartido(filepath):
+            gestor.agregar_registro(filepath, {"id": "1"})
+    with bloqueo.compartido(filepath):
+        with pytest.raises(RuntimeError):
+            with bloqueo.exclusivo(filepath):
+                pass
+
+
+@pytest.mark.parametrize("formato", ["csv", "json"])
+def test_varios_procesos_no_pierden_citas(tmp_path, formato):
+    resultado = concurrencia.ejecutar(
+        str(tmp_path), procesos=4, citas_por_proceso=5, formato=formato)
+    assert resultado["citas_perdidas"] == 0
+    assert resultado["ids_repetidos"] == 0
+    assert resultado["actualizaciones_perdidas"] == 0
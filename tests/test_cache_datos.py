@@ -0,0 +1,103 @@
+import json
+import os
+
+from Controlador import almacen, cache_datos
+from Controlador import gestor_datos_pacientes as gestor
+
+
+def _paciente(id_, documento):
+    return {"id": str(id_), "tipo_documento": "C.C", "documento": documento,
+            "nombres": "Ana", "apellidos": "Pérez", "direccion": "Calle 1",
+            "telefono": "3001234567"}
+
+
+def test_cache_acierta_si_el_archivo_no_cambia(tmp_path):
+    filepath = str(tmp_path / "pacientes.json")
+    gestor.guardar_datos(filepath, [_paciente(1, "100")])
+    cache_datos.reiniciar_estadisticas()
+
+    gestor.cargar_datos(filepath)
+    gestor.cargar_datos(filepath)
+    gestor.cargar_datos(filepath)
+
+    stats = cache_datos.estadisticas()
+    assert stats["fallos"] == 1
+    assert stats["aciertos"] == 2
+
+
+def test_cache_devuelve_copias(tmp_path):
+    filepath = str(tmp_path / "pacientes.json")
+    gestor.guardar_datos(filepath, [_paciente(1, "100")])
+
+    datos = gestor.cargar_datos(filepath)
+    datos[0]["nombres"] = "Modificado"
+    datos.append(_paciente(2, "200"))
+
+    otra = gestor.cargar_datos(filepath)
+    assert len(otra) == 1
+    assert otra[0]["nombres"] == "Ana"
+
+
+def test_cache_detecta_cambios_externos(tmp_path):
+    filepath = str(tmp_path / "pacientes.json")
+    gestor.guardar_datos(filepath, [_paciente(1, "100")])
+    assert len(gestor.cargar_datos(filepath)) == 1
+
+    # Otro proceso reescribe el archivo sin pasar por guardar_datos
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump([_paciente(1, "100"), _paciente(2, "200")], f)
+    os.utime(filepath, ns=(0, 1))
+
+    assert len(gestor.cargar_datos(filepath)) == 2
+
+
+def test_guardar_datos_invalida(tmp_path):
+    filepath = str(tmp_path / "pacientes.csv")
+    gestor.guardar_datos(filepath, [_paciente(1, "100")])
+    gestor.cargar_datos(filepath)
+
+    gestor.guardar_datos(filepath, [])
+    assert gestor.cargar_datos(filepath) == []
+
+
+def test_desalojo_lru(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_datos, "MAX_REGISTROS", 2)
+    cache_datos.invalidar()
+    cache_datos.reiniciar_estadisticas()
+
+    rutas = [str(tmp_path / f"p{i}.json") for i in range(3)]
+    for i, ruta in enumerate(rutas):
+        gestor.guardar_datos(ruta, [_paciente(1, str(i))])
+        gestor.cargar_datos(ruta)
+
+    stats = cache_datos.estadisticas()
+    assert stats["desalojos"] == 1
+    assert stats["archivos"] == 2
+    assert stats["registros"] == 2
+
+    # El primero fue desalojado: volver a leerlo es un fallo
+    gestor.cargar_datos(rutas[0])
+    assert cache_datos.estadisticas()["fallos"] == 4
+    cache_datos.invalidar()
+
+
+def test_indice_se_mantiene_al_modificar_y_eliminar(tmp_path, monkeypatch):
+    filepath = str(tmp_path / "pacientes.json")
+    gestor.guardar_datos(filepath, [_paciente(i, str(100 + i)) for i in range(1, 4)])
+    por_documento = gestor.indice(filepath, "documento")
+    por_nombre = gestor.indice(filepath, "nombres")
+
+    # Desde aquí no se vuelve a leer el archivo ni a reconstruir el índice.
+    def sin_releer(filepath):
+        raise AssertionError("se releyó el archivo")
+
+    monkeypatch.setattr(almacen, "_leer_archivo", sin_releer)
+    gestor.actualizar_registro(filepath, "id", "1", {"documento": "999", "nombres": "Eva"})
+    gestor.eliminar_registro(filepath, "id", "2")
+
+    assert gestor.indice(filepath, "documento") is por_documento
+    assert gestor.indice(filepath, "nombres") is por_nombre
+    assert sorted(por_documento) == ["103", "999"]
+    assert [p["id"] for p in por_nombre["Ana"]] == ["3"]
+    assert [p["id"] for p in por_nombre["Eva"]] == ["1"]
+    assert gestor.buscar_registro(filepath, "documento", "999")["nombres"] == "Eva"
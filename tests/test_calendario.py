@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from Controlador import gestor_datos_citas as gestor
+from Modelo import calendario, cita
+
+
+@pytest.mark.parametrize("nombre", ["citas.csv", "citas.json", "citas.jsonl", "citas/"])
+def test_resumen_mes_se_actualiza_al_anexar(tmp_path, monkeypatch, nombre):
+    filepath = os.path.join(str(tmp_path), nombre)
+    cita.crear_cita(filepath, "1", "50", "2025-11-03", "07:00", "Chequeo", "Pendiente")
+    cita.crear_cita(filepath, "2", "50", "2025-11-03", "08:00", "Chequeo", "Cancelada")
+    cita.crear_cita(filepath, "3", "50", "2025-12-01", "08:00", "Chequeo", "Pendiente")
+
+    resumen = calendario.resumen_mes(filepath, 2025, 11)
+    assert resumen == {
+        "total": 2, "dias": {3: 2}, "estados": {"pendiente": 1, "cancelada": 1}}
+
+    # Las citas nuevas se suman al índice sin reconstruirlo
+    def construir_prohibido(_):
+        raise AssertionError("no debe reconstruir el índice")
+
+    monkeypatch.setattr(calendario, "_construir", construir_prohibido)
+    cita.crear_cita(filepath, "4", "51", "2025-11-20", "09:00", "Chequeo", "Pendiente")
+    resumen = calendario.resumen_mes(filepath, 2025, 11)
+    assert resumen["total"] == 3
+    assert resumen["dias"] == {3: 2, 20: 1}
+    assert calendario.resumen_mes(filepath, 2026, 1) == calendario.resumen_vacio()
+
+
+def test_reescritura_reconstruye_el_indice(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    gestor.guardar_datos(filepath, [
+        {"id": "1", "fecha": "06/11/2025", "estado": "Pendiente"},
+        {"id": "2", "fecha": "sin fecha", "estado": "Pendiente"},
+    ])
+    assert calendario.resumen_mes(filepath, 2025, 11)["dias"] == {6: 1}
+
+    gestor.eliminar_registro(filepath, "id", "1")
+    assert calendario.resumen_mes(filepath, 2025, 11)["total"] == 0
+
+
+def test_combinar_resumenes():
+    total = calendario.combinar([
+        {"total": 1, "dias": {3: 1}, "estados": {"pendiente": 1}},
+        {"total": 2, "dias": {3: 1, 4: 1}, "estados": {"pendiente": 2}},
+    ])
+    assert total == {"total": 3, "dias": {3: 2, 4: 1}, "estados": {"pendiente": 3}}
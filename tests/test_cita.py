@@ -102,3 +102,28 @@ def test_eliminar_cita_por_documento(tmp_path, monkeypatch):
 
     restantes = cita.leer_todas_las_citas(str(filepath))
     assert len(restantes) == 0
+
+# TEST: OCUPACIÓN DE FRANJAS
+def test_ocupacion_por_franja(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    cita.crear_cita(filepath, "1", "50", "2025-10-31", "09:00", "Chequeo", "Pendiente")
+
+    # Mismo día, otra hora: permitido
+    assert cita.crear_cita(filepath, "1", "50", "2025-10-31", "10:00", "Control", "Pendiente")
+
+    # El médico o el paciente ya están ocupados a esa hora
+    assert cita.crear_cita(filepath, "2", "50", "2025-10-31", "09:00", "Otro", "Pendiente") is None
+    assert cita.crear_cita(filepath, "1", "60", "2025-10-31", "09:00", "Otro", "Pendiente") is None
+
+    assert not cita.medico_disponible(filepath, "50", "2025-10-31", "09:00")
+    assert cita.medico_disponible(filepath, "50", "2025-10-31", "11:00")
+    assert cita.paciente_disponible(filepath, "2", "2025-10-31", "09:00")
+    assert cita.conflicto_de_franja(filepath, "2", "50", "2025-10-31", "09:00") == "medico"
+    assert cita.conflicto_de_franja(filepath, "1", "60", "2025-10-31", "09:00") == "paciente"
+    assert cita.conflicto_de_franja(filepath, "2", "60", "2025-10-31", "09:00") is None
+
+    # Una cita cancelada libera su franja
+    primera = cita.citas_en_franja(
+        filepath, cita.FRANJA_MEDICO, "50", "2025-10-31", "09:00")[0]
+    cita.actualizar_cita(filepath, primera["id"], {"estado": "Cancelada"})
+    assert cita.medico_disponible(filepath, "50", "2025-10-31", "09:00")
@@ -0,0 +1,80 @@
+import pickle
+import tracemalloc
+
+import pytest
+
+from Controlador import cache_datos, compactos
+from Controlador import gestor_datos_citas as gestor
+
+
+def _filas(cantidad):
+    return [
+        {"id": str(i), "documento_paciente": str(100000 + i % 500),
+         "documento_medico": str(900 + i % 20), "fecha": f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+         "hora": f"{7 + i % 10:02d}:00", "motivo": "Control general",
+         "estado": ["Pendiente", "Completada"][i % 2]}
+        for i in range(cantidad)
+    ]
+
+
+def test_se_lee_como_diccionario():
+    fila = {"id": "1", "get": "x", "campo raro": None}
+    compacto = compactos.compactar([fila])[0]
+    assert compacto == fila
+    assert compacto["get"] == "x" and compacto.get("falta", 0) == 0
+    assert list(compacto) == ["id", "get", "campo raro"]
+    assert compactos.a_dict(compacto) == fila
+    assert pickle.loads(pickle.dumps(compacto)) == fila
+    with pytest.raises(TypeError):
+        compacto["id"] = "2"
+    with pytest.raises(AttributeError):
+        compacto.otro = 1
+
+
+def test_misma_disposicion_mismo_tipo():
+    convertidos = compactos.compactar([{"a": 1, "b": 2}, {"a": 3, "b": 4}, {"b": 1}])
+    assert type(convertidos[0]) is type(convertidos[1])
+    assert type(convertidos[2]) is not type(convertidos[0])
+    assert type(compactos.compactar([_filas(1)[0]])[0]) is gestor.Cita
+
+
+def test_ocupa_al_menos_tres_veces_menos():
+    tracemalloc.start()
+    filas = _filas(20_000)
+    como_diccionarios = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    filas = _filas(20_000)
+    tracemalloc.start()
+    convertidos = compactos.compactar(filas)
+    del filas
+    como_registros = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(convertidos) == 20_000
+    assert como_diccionarios > 3 * como_registros
+
+
+def test_la_cache_guarda_registros_compactos(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    gestor.guardar_datos(filepath, _filas(3))
+    leidas = gestor.cargar_datos(filepath)
+    assert all(type(fila) is dict for fila in leidas)
+    assert all(isinstance(fila, gestor.Cita) for fila in cache_datos.vigentes(filepath))
+
+    gestor.agregar_registro(filepath, {**_filas(4)[3], "id": "9"})
+    en_cache = cache_datos.vigentes(filepath)
+    assert isinstance(en_cache[-1], compactos.Registro) and en_cache[-1]["id"] == "9"
+    assert gestor.buscar_registro(filepath, "id", "9")["motivo"] == "Control general"
+
+
+def test_tipos_no_declarados_acotados(monkeypatch):
+    monkeypatch.setattr(compactos, "MAX_TIPOS_DINAMICOS", 3)
+    monkeypatch.setattr(compactos, "_dinamicos", compactos.collections.OrderedDict())
+    # Cabeceras arbitrarias (ej. archivos sucios): cada una, una disposición.
+    convertidos = [compactos.compactar([{"id": "1", f"extra{i}": i}])[0] for i in range(10)]
+
+    assert len(compactos._dinamicos) == 3
+    assert all(c["id"] == "1" for c in convertidos)
+    assert convertidos[0] == {"id": "1", "extra0": 0}
+    # Los tipos declarados no se desalojan.
+    assert type(compactos.compactar([_filas(1)[0]])[0]) is gestor.Cita
@@ -0,0 +1,61 @@
+import datetime
+
+from Modelo import cita, disponibilidad
+
+LUNES = datetime.date(2025, 11, 3)
+MARTES = datetime.date(2025, 11, 4)
+
+
+def test_franja_de_hora():
+    assert disponibilidad.franja_de_hora("07:00") == 0
+    assert disponibilidad.franja_de_hora("09:45") == 5
+    assert disponibilidad.franja_de_hora("18:00") == disponibilidad.TOTAL_FRANJAS - 1
+    assert disponibilidad.franja_de_hora("06:30") is None
+    assert disponibilidad.franja_de_hora("18:30") is None
+    assert disponibilidad.franja_de_hora("hora") is None
+    assert disponibilidad.hora_de_franja(5) == "09:30"
+
+
+# TEST: FRANJAS LIBRES DE UN MÉDICO
+def test_franjas_libres_medico(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    cita.crear_cita(filepath, "1", "50", "2025-11-03", "07:00", "Chequeo", "Pendiente")
+    cita.crear_cita(filepath, "2", "50", "2025-11-03", "08:00", "Chequeo", "Pendiente")
+
+    libres = disponibilidad.franjas_libres(filepath, "50", LUNES, MARTES, limite=3)
+    assert libres == [
+        ("2025-11-03", "07:30"), ("2025-11-03", "08:30"), ("2025-11-03", "09:00")]
+
+    # Las citas nuevas se reflejan sin releer el archivo
+    cita.crear_cita(filepath, "3", "50", "2025-11-03", "07:30", "Chequeo", "Pendiente")
+    assert disponibilidad.franjas_libres(filepath, "50", LUNES, LUNES, limite=1) == [
+        ("2025-11-03", "08:30")]
+
+    # Con hora mínima, el primer día empieza desde esa hora
+    assert disponibilidad.franjas_libres(
+        filepath, "50", LUNES, MARTES, limite=1, hora_minima="17:45") == [
+        ("2025-11-03", "18:00")]
+    assert disponibilidad.franjas_libres(
+        filepath, "50", LUNES, MARTES, limite=1, hora_minima="19:00") == [
+        ("2025-11-04", "07:00")]
+
+
+# TEST: FRANJAS LIBRES POR ESPECIALIDAD
+def test_franjas_libres_especialidad(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    medicos = [
+        {"documento": "50", "especialidad": "Dermatología", "estado": "Activo"},
+        {"documento": "60", "especialidad": "dermatología", "estado": "Activo"},
+        {"documento": "70", "especialidad": "Dermatología", "estado": "Inactivo"},
+        {"documento": "80", "especialidad": "Pediatría", "estado": "Activo"},
+    ]
+    cita.crear_cita(filepath, "1", "50", "2025-11-03", "07:00", "Chequeo", "Pendiente")
+    cita.crear_cita(filepath, "2", "60", "2025-11-03", "07:00", "Chequeo", "Cancelada")
+
+    libres = disponibilidad.franjas_libres_especialidad(
+        filepath, medicos, "Dermatología", LUNES, MARTES, limite=3)
+    assert [(x["hora"], x["documento_medico"]) for x in libres] == [
+        ("07:00", "60"), ("07:30", "50"), ("07:30", "60")]
+
+    assert disponibilidad.franjas_libres_especialidad(
+        filepath, medicos, "Cardiología", LUNES, MARTES) == []
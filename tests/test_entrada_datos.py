@@ -67,3 +67,9 @@ def test_validar_existencia_relacion_csv(tmp_path):
     os.chdir(tmp_path)
     assert val.validar_existencia_relacion("777", [], "Paciente") is True
     assert val.validar_existencia_relacion("999", [], "Paciente") is False
+
+
+def test_validar_documento_unico_con_indice():
+    indice = {"123": [{"documento": "123"}]}
+    assert val.validar_documento_unico("123", indice, "Paciente") is False
+    assert val.validar_documento_unico(" 777 ", indice, "Paciente") is True
@@ -0,0 +1,52 @@
+import json
+import os
+
+import pytest
+
+from Controlador import escritura
+from Controlador import gestor_datos_pacientes as gestor
+
+
+def test_escritura_interrumpida_conserva_el_archivo(tmp_path):
+    filepath = tmp_path / "datos.json"
+    escritura.guardar_json(str(filepath), [{"id": "1"}])
+
+    def escritor_que_falla(archivo):
+        archivo.write('[{"id": ')
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        escritura.escribir_atomico(str(filepath), escritor_que_falla)
+
+    # El archivo original sigue completo y no quedan temporales
+    assert json.loads(filepath.read_text(encoding="utf-8")) == [{"id": "1"}]
+    assert os.listdir(tmp_path) == ["datos.json"]
+
+
+def test_guardar_datos_conserva_permisos(tmp_path):
+    filepath = tmp_path / "pacientes.csv"
+    gestor.guardar_datos(str(filepath), [])
+    os.chmod(filepath, 0o600)
+    gestor.guardar_datos(str(filepath), [{"id": "1", "documento": "100"}])
+    assert os.stat(filepath).st_mode & 0o777 == 0o600
+    assert gestor.cargar_datos(str(filepath))[0]["documento"] == "100"
+
+
+def test_agrupar_sincronizacion_un_fsync_por_archivo(tmp_path, monkeypatch):
+    llamadas = []
+    fsync_original = os.fsync
+    monkeypatch.setattr(os, "fsync", lambda fd: llamadas.append(fd) or fsync_original(fd))
+
+    filepath = str(tmp_path / "pacientes.csv")
+    gestor.inicializar_archivo(filepath)
+    llamadas.clear()
+    with escritura.agrupar_sincronizacion():
+        for i in range(5):
+            gestor.agregar_registro(filepath, {"id": i, "documento": str(i)})
+        gestor.guardar_datos(filepath, gestor.cargar_datos(filepath))
+        # Dentro del grupo los cambios ya son visibles, pero sin fsync
+        assert len(gestor.cargar_datos(filepath)) == 5
+        assert llamadas == []
+
+    # Al cerrar: un fsync del archivo y uno de la carpeta
+    assert len(llamadas) == (2 if os.name != "nt" else 1)
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+from Controlador import cache_datos
+from Controlador import gestor_datos_citas as gestor
+from Modelo import calendario, cita, estadisticas
+
+
+@pytest.mark.parametrize("nombre", ["citas.csv", "citas.json", "citas.jsonl", "citas/"])
+def test_conteos_se_ajustan_sin_recontar(tmp_path, monkeypatch, nombre):
+    filepath = os.path.join(str(tmp_path), nombre)
+    cita.crear_cita(filepath, "1", "50", "2025-11-03", "07:00", "Chequeo", "Pendiente")
+    cita.crear_cita(filepath, "2", "50", "2025-11-03", "08:00", "Chequeo", "Cancelada")
+    cita.crear_cita(filepath, "3", "60", "2025-12-01", "08:00", "Chequeo", "Pendiente")
+    assert estadisticas.conteos_por_medico(filepath)["50"] == {
+        "total": 2, "pendientes": 1, "aprobadas": 0, "canceladas": 1}
+    calendario.resumen_mes(filepath, 2025, 11)
+
+    def construir_prohibido(_):
+        raise AssertionError("no debe recontar las citas")
+
+    monkeypatch.setattr(estadisticas, "_construir", construir_prohibido)
+    monkeypatch.setattr(calendario, "_construir", construir_prohibido)
+
+    cita.crear_cita(filepath, "4", "60", "2025-12-02", "09:00", "Chequeo", "Pendiente")
+    gestor.actualizar_registro(filepath, "id", "1", {"estado": "Completada"})
+    gestor.actualizar_registro(filepath, "id", "3", {"fecha": "2025-11-20"})
+    assert gestor.eliminar_registro(filepath, "id", "2")
+
+    conteos = estadisticas.conteos_por_medico(filepath)
+    assert conteos == {
+        "50": {"total": 1, "pendientes": 0, "aprobadas": 1, "canceladas": 0},
+        "60": {"total": 2, "pendientes": 2, "aprobadas": 0, "canceladas": 0},
+    }
+    assert calendario.resumen_mes(filepath, 2025, 11) == {
+        "total": 2, "dias": {3: 1, 20: 1}, "estados": {"completada": 1, "pendiente": 1}}
+    assert calendario.resumen_mes(filepath, 2025, 12)["dias"] == {2: 1}
+
+
+def test_eliminar_el_ultimo_quita_al_medico(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    cita.crear_cita(filepath, "1", "50", "2025-11-03", "07:00", "Chequeo", "Pendiente")
+    assert "50" in estadisticas.conteos_por_medico(filepath)
+    gestor.eliminar_registro(filepath, "id", "1")
+    assert estadisticas.conteos_por_medico(filepath) == {}
+
+
+def test_registrar_cambio_con_otra_version_invalida(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    gestor.guardar_datos(filepath, [{"id": "1", "documento_medico": "50", "estado": "Pendiente"}])
+    conteos = estadisticas.conteos_por_medico(filepath)
+    # La firma dada no es la de la caché: la entrada se descarta
+    cache_datos.registrar_cambio(filepath, ("otra",), 0, None)
+    assert estadisticas.conteos_por_medico(filepath) is not conteos
+
+
+def test_por_especialidad():
+    conteos = {
+        "1": {"total": 2, "pendientes": 1, "aprobadas": 1, "canceladas": 0},
+        "2": {"total": 1, "pendientes": 0, "aprobadas": 0, "canceladas": 1},
+    }
+    medicos = [
+        {"documento": "1", "especialidad": "Pediatría"},
+        {"documento": "2", "especialidad": "Pediatría"},
+        {"documento": "3", "especialidad": ""},
+    ]
+    assert estadisticas.por_especialidad(conteos, medicos) == {
+        "Pediatría": {"medicos": 2, "total": 3, "pendientes": 1, "aprobadas": 1, "canceladas": 1},
+        "N/A": {"medicos": 1, "total": 0, "pendientes": 0, "aprobadas": 0, "canceladas": 0},
+    }
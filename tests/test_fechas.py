@@ -0,0 +1,31 @@
+import pytest
+
+from Controlador import fechas
+
+
+@pytest.mark.parametrize("texto, esperado", [
+    ("2025-11-06", "2025-11-06"),
+    (" 2025-11-06 ", "2025-11-06"),
+    ("06/11/2025", "2025-11-06"),
+    ("06-11-2025", "2025-11-06"),
+    ("2025/11/06", "2025-11-06"),
+    ("2025-1-5", "2025-01-05"),
+    ("2025-30-01", "2025-01-30"),
+    ("06/11/25", "2025-11-06"),
+    ("2025-02-30", "2025-02-30"),
+    ("06_11_25", "06_11_25"),
+    ("", ""),
+    (None, ""),
+])
+def test_normalizar(texto, esperado):
+    assert fechas.normalizar(texto) == esperado
+
+
+def test_formas_no_canonicas_se_interpretan_una_vez():
+    fechas._interpretar.cache_clear()
+    for _ in range(3):
+        assert fechas.partes("06/11/2025") == (2025, 11, 6)
+        # La forma canónica no pasa por el intérprete
+        assert fechas.partes("2025-11-06") == (2025, 11, 6)
+    informacion = fechas._interpretar.cache_info()
+    assert (informacion.misses, informacion.hits) == (1, 2)
@@ -0,0 +1,64 @@
+from Controlador import cache_datos, fusion
+from Controlador import gestor_datos_citas as gestor
+
+
+def _cita(id_cita, motivo, fecha="2025-11-06"):
+    return {"id": id_cita, "fecha": fecha, "hora": "10:00", "motivo": motivo, "estado": "pendiente"}
+
+
+def test_fusion_sin_repetidos_con_precedencia(tmp_path):
+    ruta_base = str(tmp_path / "citas")
+    gestor.guardar_datos(ruta_base + ".json", [_cita("1", "json"), _cita("2", "json")])
+    gestor.guardar_datos(ruta_base + ".csv", [_cita("2", "csv"), _cita("3", "csv"), _cita("3", "csv v2")])
+
+    resultado = fusion.cargar(ruta_base)
+    assert [(c["id"], c["motivo"]) for c in resultado["citas"]] == [
+        ("1", "json"), ("2", "json"), ("3", "csv v2")]
+    assert resultado["fuentes"] == ["json", "json", "csv"]
+    assert resultado["ubicaciones"]["2"] == ["json", "csv"]
+    assert resultado["estadisticas"] == {
+        "leidas": {"json": 2, "csv": 3}, "total": 3, "repetidas": 1, "descartadas": 2}
+
+    # Con otra precedencia gana el CSV
+    resultado = fusion.cargar(ruta_base, precedencia=("csv", "json"))
+    assert [c["motivo"] for c in resultado["citas"] if c["id"] == "2"] == ["csv"]
+
+
+def test_eliminar_y_actualizar_solo_reescriben_su_archivo(tmp_path):
+    ruta_base = str(tmp_path / "citas")
+    gestor.guardar_datos(ruta_base + ".json", [_cita("1", "json")])
+    gestor.guardar_datos(ruta_base + ".csv", [_cita("2", "csv")])
+    antes = cache_datos.firma_archivo(ruta_base + ".json")
+
+    assert fusion.actualizar(ruta_base, "2", {"estado": "cancelada"})["estado"] == "cancelada"
+    assert fusion.eliminar(ruta_base, "2") == {
+        "mensual": False, "json": False, "csv": True, "jsonl": False, "db": False}
+    assert cache_datos.firma_archivo(ruta_base + ".json") == antes
+    assert fusion.actualizar(ruta_base, "2", {"estado": "pendiente"}) is None
+    assert [c["id"] for c in fusion.cargar(ruta_base)["citas"]] == ["1"]
+
+
+def test_fusion_por_mes_con_carpeta_mensual(tmp_path):
+    ruta_base = str(tmp_path / "citas")
+    gestor.guardar_datos(ruta_base + "/", [_cita("1", "mensual"), _cita("5", "dic", "2025-12-01")])
+    gestor.guardar_datos(ruta_base + ".json", [_cita("1", "json"), _cita("4", "json")])
+
+    resultado = fusion.cargar(ruta_base, mes=(2025, 11))
+    assert [(c["id"], origen) for c, origen in zip(resultado["citas"], resultado["fuentes"])] == [
+        ("1", "mensual"), ("4", "json")]
+
+
+def test_fusion_incluye_jsonl_y_sqlite(tmp_path):
+    # Todos los almacenamientos que ofrece el menú de citas entran en la vista.
+    ruta_base = str(tmp_path / "citas")
+    gestor.guardar_datos(ruta_base + ".csv", [_cita("1", "csv")])
+    gestor.agregar_registro(ruta_base + ".jsonl", _cita("1", "jsonl"))
+    gestor.agregar_registro(ruta_base + ".jsonl", _cita("2", "jsonl"))
+    gestor.agregar_registro(ruta_base + ".db", _cita("3", "db", "2025-12-01"))
+
+    resultado = fusion.cargar(ruta_base)
+    assert [(c["id"], origen) for c, origen in zip(resultado["citas"], resultado["fuentes"])] == [
+        ("1", "csv"), ("2", "jsonl"), ("3", "db")]
+    assert [c["id"] for c in fusion.cargar(ruta_base, mes=(2025, 12))["citas"]] == ["3"]
+    assert fusion.eliminar(ruta_base, "3")["db"]
+    assert fusion.actualizar(ruta_base, "2", {"estado": "cancelada"})["estado"] == "cancelada"
@@ -89,3 +89,78 @@ def test_crud_citas_csv(tmp_path):
 
     citas = gestor.cargar_datos(str(filepath))
     assert len(citas) == 0
+
+
+# TEST AGREGAR REGISTRO (SOLO ANEXAR) JSON
+def test_agregar_registro_json(tmp_path):
+    filepath = str(tmp_path / "citas.json")
+    gestor.inicializar_archivo(filepath)
+
+    citas = [
+        {"id": "1", "documento_paciente": "111", "documento_medico": "222",
+         "fecha": "2025-10-28", "hora": "08:00", "motivo": "Chequeo",
+         "estado": "Pendiente"},
+        {"id": "2", "documento_paciente": "333", "documento_medico": "222",
+         "fecha": "2025-10-28", "hora": "09:00", "motivo": "Control",
+         "estado": "Pendiente"},
+    ]
+    for c in citas:
+        gestor.agregar_registro(filepath, c)
+
+    assert gestor.cargar_datos(filepath) == citas
+
+    # El archivo anexado es idéntico al que produce una reescritura completa
+    with open(filepath, encoding="utf-8") as f:
+        anexado = f.read()
+    gestor.guardar_datos(filepath, citas)
+    with open(filepath, encoding="utf-8") as f:
+        assert f.read() == anexado
+
+
+# TEST AGREGAR REGISTRO (SOLO ANEXAR) CSV
+def test_agregar_registro_csv(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+
+    gestor.agregar_registro(filepath, {
+        "id": "1", "documento_paciente": "111", "documento_medico": "222",
+        "fecha": "2025-10-28", "hora": "08:00", "motivo": "Chequeo",
+        "estado": "Pendiente"})
+    gestor.agregar_registro(filepath, {
+        "id": "2", "documento_paciente": "333", "documento_medico": "222",
+        "fecha": "2025-10-29", "hora": "10:00", "motivo": "Control",
+        "estado": "Pendiente"})
+
+    citas = gestor.cargar_datos(filepath)
+    assert [c["id"] for c in citas] == ["1", "2"]
+    assert citas[1]["motivo"] == "Control"
+
+
+# TEST COMPACTAR: conserva la última versión de cada id
+def test_compactar_datos(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    base = {"documento_paciente": "111", "documento_medico": "222",
+            "fecha": "2025-10-28", "hora": "08:00", "motivo": "Chequeo"}
+
+    gestor.agregar_registro(filepath, {"id": "1", **base, "estado": "Pendiente"})
+    gestor.agregar_registro(filepath, {"id": "2", **base, "estado": "Pendiente"})
+    gestor.agregar_registro(filepath, {"id": "1", **base, "estado": "Cancelada"})
+
+    descartados = gestor.compactar_datos(filepath)
+    citas = gestor.cargar_datos(filepath)
+
+    assert descartados == 1
+    assert [c["id"] for c in citas] == ["1", "2"]
+    assert citas[0]["estado"] == "Cancelada"
+
+
+def test_normalizar_fechas_migra_una_sola_vez(tmp_path):
+    filepath = str(tmp_path / "citas.csv")
+    gestor.guardar_datos(filepath, [
+        {"id": "1", "fecha": "06/11/2025"},
+        {"id": "2", "fecha": "2025-11-07"},
+        {"id": "3", "fecha": "sin fecha"},
+    ])
+    assert gestor.normalizar_fechas(filepath) == 1
+    assert [c["fecha"] for c in gestor.cargar_datos(filepath)] == [
+        "2025-11-06", "2025-11-07", "sin fecha"]
+    assert gestor.normalizar_fechas(filepath) == 0
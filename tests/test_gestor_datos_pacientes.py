@@ -1,5 +1,8 @@
 # tests/test_gestor_datos_pacientes.py
 # -*- coding: utf-8 -*-
+import pytest
+
+from Controlador import almacen, cache_datos
 from Controlador import gestor_datos_pacientes as gestor
 
 
@@ -80,3 +83,89 @@ def test_crud_pacientes_csv(tmp_path):
     gestor.guardar_datos(str(filepath), actualizado)
     final = gestor.cargar_datos(str(filepath))
     assert final == []
+
+
+# TEST ÍNDICE POR DOCUMENTO E ID
+def test_indice_por_documento(tmp_path):
+    filepath = str(tmp_path / "pacientes.csv")
+    gestor.guardar_datos(filepath, [
+        {"id": "1", "tipo_documento": "C.C", "documento": "100",
+         "nombres": "Ana", "apellidos": "Ruiz", "direccion": "", "telefono": ""},
+    ])
+
+    assert gestor.buscar_registro(filepath, "documento", "100")["nombres"] == "Ana"
+    assert gestor.buscar_registro(filepath, "id", 1)["documento"] == "100"
+    assert gestor.buscar_registro(filepath, "documento", "999") is None
+
+    # El índice se mantiene al anexar, sin reconstruirse
+    indice = gestor.indice(filepath, "documento")
+    gestor.agregar_registro(filepath, {
+        "id": "2", "tipo_documento": "C.C", "documento": "200",
+        "nombres": "Luis", "apellidos": "Gil", "direccion": "", "telefono": ""})
+    assert gestor.indice(filepath, "documento") is indice
+    assert gestor.existe_valor(filepath, "documento", "200")
+
+    # Tras una reescritura completa se reconstruye
+    gestor.guardar_datos(filepath, [])
+    assert not gestor.existe_valor(filepath, "documento", "100")
+
+
+# TEST SQLITE
+def test_crud_pacientes_sqlite(tmp_path):
+    filepath = str(tmp_path / "pacientes.db")
+    gestor.inicializar_archivo(filepath)
+    assert gestor.cargar_datos(filepath) == []
+
+    for i, nombre in enumerate(["Ana", "Luis", "Eva"], start=1):
+        gestor.agregar_registro(filepath, {
+            "id": i, "tipo_documento": "C.C", "documento": str(100 * i),
+            "nombres": nombre, "apellidos": "Ruiz", "direccion": None,
+            "telefono": "300"})
+
+    # Los registros se leen como en un CSV: texto y en orden de inserción
+    lista = gestor.cargar_datos(filepath)
+    assert [p["nombres"] for p in lista] == ["Ana", "Luis", "Eva"]
+    assert lista[0]["id"] == "1" and lista[0]["direccion"] == ""
+
+    # Actualizar y eliminar tocan una sola fila
+    actualizado = gestor.actualizar_registro(
+        filepath, "documento", "200", {"direccion": "Calle 9"})
+    assert actualizado["direccion"] == "Calle 9"
+    assert gestor.buscar_registro(filepath, "documento", "200")["direccion"] == "Calle 9"
+    assert gestor.buscar_registro(filepath, "documento", "100")["direccion"] == ""
+    assert gestor.actualizar_registro(filepath, "documento", "999", {}) is None
+
+    assert gestor.eliminar_registro(filepath, "documento", "100")
+    assert not gestor.eliminar_registro(filepath, "documento", "100")
+    assert not gestor.existe_valor(filepath, "documento", "100")
+    assert [p["documento"] for p in gestor.cargar_datos(filepath)] == ["200", "300"]
+
+    # guardar_datos reemplaza la tabla completa
+    gestor.guardar_datos(filepath, [])
+    assert gestor.cargar_datos(filepath) == []
+
+
+def test_jsonl_anexa_y_busca_por_posicion(tmp_path, monkeypatch):
+    filepath = str(tmp_path / "pacientes.jsonl")
+    gestor.inicializar_archivo(filepath)
+    for i in range(1, 6):
+        gestor.agregar_registro(filepath, {"id": str(i), "documento": str(100 + i),
+                                           "nombres": "Sofía"})
+    # Una línea por registro, sin reescribir el archivo
+    with open(filepath, encoding="utf-8") as archivo:
+        lineas = archivo.read().splitlines()
+    assert len(lineas) == 5 and '"Sofía"' in lineas[0]
+
+    # Sin caché, la búsqueda lee solo la línea del registro
+    cache_datos.invalidar()
+    monkeypatch.setattr(almacen, "_leer_archivo", lambda _: pytest.fail("no debe parsear todo"))
+    assert gestor.buscar_registro(filepath, "documento", 103)["id"] == "3"
+    gestor.agregar_registro(filepath, {"id": "6", "documento": "106"})
+    assert gestor.existe_valor(filepath, "documento", "106")
+    assert gestor.buscar_registro(filepath, "documento", "999") is None
+    monkeypatch.undo()
+
+    gestor.actualizar_registro(filepath, "id", "2", {"nombres": "Ana"})
+    assert [p.get("nombres") for p in gestor.cargar_datos(filepath)][:2] == ["Sofía", "Ana"]
+    assert gestor.eliminar_registro(filepath, "id", "1")
+    assert len(gestor.cargar_datos(filepath)) == 5
@@ -0,0 +1,129 @@
+import csv
+
+import pytest
+
+from Controlador import gestor_datos_medico, gestor_datos_pacientes
+from Modelo import importacion, paciente
+
+
+def _escribir_csv(ruta, filas):
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        csv.writer(archivo).writerows(filas)
+
+
+def _leer_csv(ruta):
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        return list(csv.DictReader(archivo))
+
+
+def test_importar_pacientes_con_rechazos(tmp_path):
+    destino = str(tmp_path / "pacientes.json")
+    paciente.crear_paciente(destino, "C.C", 1234567, "Ana", "Ruiz", "Calle 1", 3001234567)
+    origen = tmp_path / "nuevos.csv"
+    _escribir_csv(origen, [
+        ["tipo_documento", "documento", "nombres", "apellidos", "telefono", "otra"],
+        ["C.C", " 7654321 ", "Luis", "Mora", "3007654321", "x"],
+        ["C.C", "12ab", "Eva", "Sosa", "3001112222", ""],
+        ["C.C", "1234567", "Ana", "Ruiz", "3001234567", ""],
+        ["C.C", "8888888", "Leo", "", "3001234567", ""],
+        ["C.C", "9999999", "Rita", "Paz", "12", ""],
+        ["C.C", "7654321", "Luis", "Mora", "3007654321", ""],
+        ["T.I", "5555555", "Sara", "Gil", "6012345", "", "celda de más"],
+        ])
+
+    resumen = importacion.importar_csv(str(origen), destino, tamano_lote=2)
+
+    assert resumen == {
+        "leidas": 7, "importadas": 2, "rechazadas": 5,
+        "rechazos": str(tmp_path / "nuevos_rechazos.csv"),
+        }
+    importados = gestor_datos_pacientes.cargar_datos(destino)
+    assert [(p["id"], p["documento"]) for p in importados] == [
+        ("1", "1234567"), ("2", "7654321"), ("3", "5555555")]
+    assert "otra" not in importados[1]
+    rechazos = _leer_csv(resumen["rechazos"])
+    assert [r["fila"] for r in rechazos] == ["3", "4", "5", "6", "7"]
+    assert "documento" in rechazos[0]["motivo"]
+    assert "ya está registrada" in rechazos[1]["motivo"]
+    assert "apellidos" in rechazos[2]["motivo"]
+    assert "teléfono" in rechazos[3]["motivo"]
+    assert "ya está registrada" in rechazos[4]["motivo"]
+    # Los ids siguen la secuencia del archivo.
+    assert paciente.generar_id(destino) == 4
+
+
+def test_importar_medicos_sqlite_sin_rechazos(tmp_path):
+    destino = str(tmp_path / "medicos.db")
+    origen = tmp_path / "medicos.csv"
+    _escribir_csv(origen, [
+        ["documento", "nombres", "apellidos", "telefono", "especialidad", "estado"],
+        *[[str(1000000 + i), "Laura", "Mora", "3001234567", "Pediatría", "Activo"]
+          for i in range(50)],
+        ])
+
+    resumen = importacion.main(["medicos", str(origen), destino])
+
+    assert resumen["importadas"] == 50 and resumen["rechazos"] is None
+    assert not (tmp_path / "medicos_rechazos.csv").exists()
+    medico = gestor_datos_medico.buscar_registro(destino, "documento", "1000049")
+    assert medico["id"] == "50" and medico["especialidad"] == "Pediatría"
+
+
+def test_entidad_no_importable(tmp_path):
+    with pytest.raises(ValueError):
+        importacion.importar_csv(str(tmp_path / "x.csv"), str(tmp_path / "citas.json"), "citas")
+
+
+def test_validacion_en_paralelo_igual_que_en_serie(tmp_path):
+    origen = tmp_path / "nuevos.csv"
+    filas = [["documento", "nombres", "apellidos", "direccion", "telefono"]]
+    for i in range(60):
+        documento = str(2000000 + i) if i % 7 else "malo"
+        # Direcciones entre comillas que ocupan dos líneas del archivo.
+        direccion = "Calle 1\nApto 2" if i % 5 == 0 else "Calle 3"
+        filas.append([documento, "Ana", "Ruiz", direccion, "3001234567"])
+    _escribir_csv(origen, filas)
+    campos = gestor_datos_pacientes.CAMPOS
+
+    en_serie = importacion.validar_archivo(str(origen), campos, 1, tamano_lote=4)
+    en_paralelo = importacion.validar_archivo(str(origen), campos, 2, tamano_lote=4)
+
+    assert en_paralelo == en_serie
+    leidas, _, (validas, rechazos) = en_serie
+    assert leidas == 60 and len(rechazos) == 9
+    assert validas[4] == (8, {**validas[4][1], "direccion": "Calle 1\nApto 2"})
+    # Cada fila indica la línea del archivo en que empieza.
+    assert [r["fila"] for r in rechazos[:2]] == [2, 11]
+
+
+def test_rechazos_conservan_la_fila_original(tmp_path):
+    destino = str(tmp_path / "pacientes.csv")
+    paciente.crear_paciente(destino, "C.C", 1234567, "Ana", "Ruiz", "Calle 1", 3001234567)
+    origen = tmp_path / "nuevos.csv"
+    filas = [
+        '1234567, Ana ,Ruiz,3001234567,x,celda de más\r\n',
+        '" 7654321 ",Luis,Mora,3007654321,\r\n',
+        '7654321,Luis,"Mora\nSosa",3007654321\r\n',
+        '12ab,Eva,Sosa,3001112222,y',
+        ]
+    origen.write_bytes(
+        ("documento,nombres,apellidos,telefono,otra\r\n" + "".join(filas)).encode("utf-8"))
+
+    resumen = importacion.importar_csv(str(origen), destino, tamano_lote=2)
+
+    assert (resumen["importadas"], resumen["rechazadas"]) == (1, 3)
+    with open(resumen["rechazos"], newline="", encoding="utf-8") as archivo:
+        contenido = archivo.read()
+    assert contenido == (
+        "fila,motivo,documento,nombres,apellidos,telefono,otra\r\n"
+        "2,documento: La cédula 1234567 ya está registrada.," + filas[0]
+        + "4,documento: La cédula 7654321 ya está registrada.," + filas[2]
+        + "6,documento: La cédula debe tener entre 6 y 10 dígitos numéricos.," + filas[3] + "\n"
+        )
+
+    # Corregido, el archivo de rechazos se vuelve a importar tal cual.
+    corregido = tmp_path / "corregido.csv"
+    corregido.write_text(contenido.replace("12ab", "5555555"), encoding="utf-8", newline="")
+    resumen = importacion.importar_csv(str(corregido), destino)
+    assert (resumen["importadas"], resumen["rechazadas"]) == (1, 2)
+    assert gestor_datos_pacientes.buscar_registro(destino, "documento", "5555555")["nombres"] == "Eva"
@@ -0,0 +1,96 @@
+import csv
+import json
+
+import pytest
+
+from Controlador import cache_datos, lectura
+from Controlador import gestor_datos_citas as gestor
+from Vista import vista_estadisticas_medico
+
+REGISTROS = [
+    {"id": str(i), "documento_medico": str(100 + i % 3),
+     "motivo": "Pediatría \"control\"" if i % 2 else "línea\nnueva", "estado": "Pendiente"}
+    for i in range(300)
+]
+
+
+@pytest.mark.parametrize("indent", [4, None])
+def test_iterar_json_por_bloques(tmp_path, monkeypatch, indent):
+    filepath = tmp_path / "citas.json"
+    filepath.write_text(json.dumps(REGISTROS, indent=indent), encoding="utf-8")
+    # Bloques pequeños: los registros quedan partidos entre lecturas
+    monkeypatch.setattr(lectura, "TAMANO_BLOQUE", 31)
+    assert list(lectura.iterar(str(filepath))) == REGISTROS
+    assert list(lectura.iterar(str(filepath), {"documento_medico": 101})) == [
+        r for r in REGISTROS if r["documento_medico"] == "101"]
+
+
+def test_iterar_json_danado_o_vacio(tmp_path):
+    filepath = tmp_path / "citas.json"
+    filepath.write_text('[{"id": "1"}, {"id": ', encoding="utf-8")
+    assert list(lectura.iterar(str(filepath))) == [{"id": "1"}]
+    filepath.write_text('{"id": "1"}', encoding="utf-8")
+    assert list(lectura.iterar(str(filepath))) == []
+    assert list(lectura.iterar(str(tmp_path / "no_existe.json"))) == []
+
+
+def test_iterar_csv_igual_a_dictreader(tmp_path):
+    filepath = tmp_path / "citas.csv"
+    with open(filepath, "w", newline="", encoding="utf-8") as archivo:
+        writer = csv.DictWriter(archivo, fieldnames=list(REGISTROS[0]))
+        writer.writeheader()
+        writer.writerows(REGISTROS)
+        archivo.write("999,102\n")
+    with open(filepath, newline="", encoding="utf-8") as archivo:
+        esperado = list(csv.DictReader(archivo))
+
+    assert list(lectura.iterar(str(filepath))) == esperado
+    assert list(lectura.iterar(str(filepath), {"documento_medico": "102"})) == [
+        r for r in esperado if r["documento_medico"] == "102"]
+    assert list(lectura.iterar(str(filepath), {"columna": "x"})) == []
+
+
+def test_iterar_jsonl_con_filtros(tmp_path):
+    filepath = tmp_path / "citas.jsonl"
+    filepath.write_text(
+        "".join(json.dumps(r) + "\n" for r in REGISTROS) + "dañada\n", encoding="utf-8")
+    resultado = list(lectura.iterar(
+        str(filepath), {"documento_medico": "100", "motivo": "Pediatría \"control\""}))
+    assert resultado == [
+        r for r in REGISTROS if r["documento_medico"] == "100"
+        and int(r["id"]) % 2]
+
+
+@pytest.mark.parametrize("extension", ["csv", "json", "db"])
+def test_iterar_datos_del_gestor(tmp_path, extension):
+    filepath = str(tmp_path / f"citas.{extension}")
+    gestor.guardar_datos(filepath, REGISTROS[:30])
+    cache_datos.invalidar()
+    esperado = [r["id"] for r in REGISTROS[:30] if r["documento_medico"] == "100"]
+
+    leidos = gestor.iterar_datos(filepath, {"documento_medico": "100"})
+    assert [r["id"] for r in leidos] == esperado
+    # Con el archivo en caché se recorre la caché, con el mismo resultado
+    gestor.cargar_datos(filepath)
+    leidos = gestor.iterar_datos(filepath, predicado=lambda r: r["documento_medico"] == "100")
+    assert [r["id"] for r in leidos] == esperado
+
+
+def test_estadisticas_en_una_pasada(tmp_path):
+    medicos = tmp_path / "medicos.json"
+    medicos.write_text(json.dumps([
+        {"documento": "100", "nombres": "Ana", "apellidos": "Ruiz", "especialidad": "X"},
+        {"documento": "200", "nombres": "Luis", "apellidos": "Gil", "especialidad": "Y"},
+    ]), encoding="utf-8")
+    citas = tmp_path / "citas.json"
+    citas.write_text(json.dumps([
+        {"documento_medico": "100", "estado": "Pendiente"},
+        {"documento_medico": " 100 ", "estado": "Completada"},
+        {"documento_medico": "100", "estado": "Cancelada"},
+    ]), encoding="utf-8")
+
+    estadisticas = vista_estadisticas_medico.estadisticas_citas_por_medico(
+        ruta_medicos_csv=str(tmp_path / "no.csv"), ruta_medicos_json=str(medicos),
+        ruta_citas_csv=str(tmp_path / "no.csv"), ruta_citas_json=str(citas), mostrar=False)
+    assert [(e["total"], e["pendientes"], e["aprobadas"], e["canceladas"])
+            for e in estadisticas] == [(3, 1, 1, 1), (0, 0, 0, 0)]
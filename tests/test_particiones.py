@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from Controlador import gestor_datos_citas as gestor
+from Controlador import particiones
+from Modelo import cita
+
+
+def _cita(id_cita, fecha, hora="08:00"):
+    return {
+        "id": str(id_cita), "documento_paciente": f"p{id_cita}", "documento_medico": "m1",
+        "fecha": fecha, "hora": hora, "motivo": "Control", "estado": "pendiente",
+    }
+
+
+@pytest.mark.parametrize("formato", ["csv", "json", "jsonl"])
+def test_cargar_mes_lee_solo_su_segmento(tmp_path, formato):
+    ruta = os.path.join(str(tmp_path / "citas"), "")
+    particiones.inicializar(ruta, formato)
+    for id_cita, fecha in [(1, "2025-01-10"), (2, "2025-02-03"), (3, "2025-01-20")]:
+        gestor.agregar_registro(ruta, _cita(id_cita, fecha))
+
+    assert particiones.meses(ruta) == ["2025-01", "2025-02"]
+    assert os.path.exists(os.path.join(ruta, f"2025-01.{formato}"))
+    assert [c["id"] for c in gestor.cargar_mes(ruta, 2025, 1)] == ["1", "3"]
+    assert [c["id"] for c in gestor.iterar_datos(ruta, {"fecha": "2025-02-03"})] == ["2"]
+    assert len(gestor.cargar_datos(ruta)) == 3
+
+
+def test_archivar_y_seguir_leyendo(tmp_path):
+    ruta = os.path.join(str(tmp_path / "citas"), "")
+    gestor.guardar_datos(ruta, [_cita(1, "2024-12-01"), _cita(2, "2025-01-05")])
+
+    assert particiones.archivar(ruta, "2024-12")
+    assert os.path.exists(os.path.join(ruta, "2024-12.jsonl.gz"))
+    assert not os.path.exists(os.path.join(ruta, "2024-12.jsonl"))
+    assert gestor.buscar_registro(ruta, "id", "1")["fecha"] == "2024-12-01"
+
+    # Escribir en un mes archivado lo descomprime
+    gestor.agregar_registro(ruta, _cita(3, "2024-12-02"))
+    assert not particiones.esta_archivado(ruta, "2024-12")
+    assert [c["id"] for c in gestor.cargar_mes(ruta, 2024, 12)] == ["1", "3"]
+
+
+def test_actualizar_fecha_mueve_la_cita_de_mes(tmp_path):
+    ruta = os.path.join(str(tmp_path / "citas"), "")
+    gestor.guardar_datos(ruta, [_cita(1, "2025-03-01"), _cita(2, "2025-03-02")])
+
+    gestor.actualizar_registro(ruta, "id", "2", {"fecha": "2025-04-10"})
+    assert [c["id"] for c in gestor.cargar_mes(ruta, 2025, 3)] == ["1"]
+    assert [c["id"] for c in gestor.cargar_mes(ruta, 2025, 4)] == ["2"]
+
+    assert gestor.eliminar_registro(ruta, "id", "1")
+    assert particiones.meses(ruta) == ["2025-04"]
+
+
+def test_crear_cita_particionada(tmp_path):
+    ruta = os.path.join(str(tmp_path / "citas"), "")
+    creada = cita.crear_cita(ruta, "p1", "m1", "2025-05-06", "08:00", "Control", "pendiente")
+    assert creada["id"] == "1"
+    # Mismo médico, fecha y hora: la disponibilidad se consulta en el mes
+    assert cita.crear_cita(ruta, "p2", "m1", "2025-05-06", "08:00", "Control", "pendiente") is None
+    assert cita.crear_cita(ruta, "p2", "m1", "2025-06-06", "08:00", "Control", "pendiente")["id"] == "2"
+    assert particiones.meses(ruta) == ["2025-05", "2025-06"]
+
+
+def test_particionar_migra_un_archivo(tmp_path):
+    origen = str(tmp_path / "citas.csv")
+    gestor.guardar_datos(origen, [_cita(1, "2025-01-01"), _cita(2, "06/02/2025")])
+    destino = os.path.join(str(tmp_path / "mensual"), "")
+
+    assert gestor.particionar(origen, destino) == 2
+    assert particiones.meses(destino) == ["2025-01", "2025-02"]
+    assert gestor.siguiente_id(destino) == 3
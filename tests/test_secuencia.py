@@ -0,0 +1,35 @@
+import os
+
+from Controlador import gestor_datos_medico as gestor
+from Controlador import secuencia
+from Modelo import medico
+
+
+def test_secuencia_se_reconstruye_desde_el_maximo(tmp_path):
+    filepath = str(tmp_path / "medicos.csv")
+    gestor.guardar_datos(filepath, [{"id": "7"}, {"id": "x"}, {"id": "3"}])
+    assert gestor.siguiente_id(filepath) == 8
+    assert gestor.siguiente_id(filepath) == 9
+
+    # Secuencia dañada: se vuelve a calcular desde los registros
+    with open(secuencia.ruta_secuencia(filepath), "w", encoding="utf-8") as archivo:
+        archivo.write("basura")
+    assert gestor.siguiente_id(filepath) == 8
+
+
+def test_reservar_bloque_de_ids(tmp_path):
+    filepath = str(tmp_path / "medicos.json")
+    assert list(gestor.reservar_ids(filepath, 3)) == [1, 2, 3]
+    assert gestor.siguiente_id(filepath) == 4
+    assert os.path.exists(secuencia.ruta_secuencia(filepath))
+
+
+def test_crear_medico_no_recorre_los_registros(tmp_path, monkeypatch):
+    filepath = str(tmp_path / "medicos.csv")
+    medico.crear_medico(filepath, "C.C", 1, "Ana", "Ruiz", "Pediatría", 300, "Activo", "101")
+
+    def cargar_prohibido(_):
+        raise AssertionError("no debe leer todos los registros")
+
+    monkeypatch.setattr(gestor, "cargar_datos", cargar_prohibido)
+    assert medico.generar_id(filepath) == 2
@@ -0,0 +1,47 @@
+import csv
+import json
+
+from Controlador import cache_datos, utils
+
+
+def test_obtener_nombres_por_documentos_lee_cada_archivo_una_vez(tmp_path):
+    base = tmp_path / "pacientes"
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump([
+            {"documento": "1", "nombres": "Ana", "apellidos": "Pérez"},
+            {"documento": "2", "nombres": "Luis", "apellidos": ""},
+        ], f)
+    with open(f"{base}.csv", "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["documento", "nombres", "apellidos"])
+        writer.writeheader()
+        writer.writerow({"documento": "3", "nombres": "Eva", "apellidos": "Gil"})
+
+    cache_datos.invalidar()
+    cache_datos.reiniciar_estadisticas()
+    documentos = ["1", "2", "3", "4"] * 500
+
+    nombres = utils.obtener_nombres_por_documentos(str(base), documentos)
+
+    assert nombres == {"1": "Ana Pérez", "2": "Luis", "3": "Eva Gil"}
+    assert cache_datos.estadisticas()["fallos"] == 2  # un parseo por archivo
+
+
+def test_obtener_nombre_por_documento_usa_el_lote(tmp_path):
+    ruta = tmp_path / "medicos.json"
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump([{"documento": "9", "nombres": "Rosa", "apellidos": "Díaz"}], f)
+
+    assert utils.obtener_nombre_por_documento(str(ruta), " 9 ") == "Rosa Díaz"
+    assert utils.obtener_nombre_por_documento(str(ruta), "0") == "No encontrado"
+
+
+def test_obtener_nombres_por_documentos_incluye_jsonl(tmp_path):
+    base = tmp_path / "medicos"
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump([{"documento": "1", "nombres": "Ana", "apellidos": "Pérez"}], f)
+    with open(f"{base}.jsonl", "w", encoding="utf-8") as f:
+        f.write(json.dumps({"documento": "2", "nombres": "Luis", "apellidos": "Mora"}) + "\n")
+
+    assert utils.obtener_nombres_por_documentos(str(base), ["1", "2"]) == {
+        "1": "Ana Pérez", "2": "Luis Mora"}
+    assert utils.obtener_nombre_por_documento(f"{base}.jsonl", "2") == "Luis Mora"
@@ -0,0 +1,71 @@
+import functools
+
+from Modelo import disponibilidad
+from Validaciones import validadores
+
+
+def _codigo(error):
+    return None if error is None else error["codigo"]
+
+
+def test_texto_y_numero():
+    assert validadores.texto(" Ana ") is None
+    assert _codigo(validadores.texto("   ")) == "vacio"
+    error = validadores.texto("abcdef", max_len=5)
+    assert error["codigo"] == "longitud" and "entre 1 y 5" in error["mensaje"]
+    assert validadores.numero("25", 1, 99) is None
+    assert _codigo(validadores.numero("2a")) == "no_numerico"
+    assert _codigo(validadores.numero("0", minimo=1)) == "minimo"
+    assert _codigo(validadores.numero("100", maximo=99)) == "maximo"
+
+
+def test_telefono_y_cedula():
+    assert validadores.telefono("3124567890") is None
+    assert _codigo(validadores.telefono("312-4567")) == "formato"
+    assert _codigo(validadores.telefono("123456")) == "formato"
+    assert validadores.cedula("123456") is None
+    assert _codigo(validadores.cedula("12345")) == "formato"
+    assert _codigo(validadores.cedula("", registrados={"123456"})) == "vacio"
+    error = validadores.cedula(" 123456 ", registrados={"123456"})
+    assert error["codigo"] == "duplicado" and "123456" in error["mensaje"]
+
+
+def test_hora_en_horario_de_atencion():
+    for valida in ("07:00", "9:30", "17:30", "18:00"):
+        assert validadores.hora(valida) is None
+    for fuera in ("06:59", "18:01", "20:00"):
+        assert _codigo(validadores.hora(fuera)) == "fuera_de_horario"
+    for fuera in ("07:15", "07:20", "17:59"):
+        assert _codigo(validadores.hora(fuera)) == "fuera_de_franja"
+    # Toda hora válida es el inicio de su franja en el mapa de ocupación.
+    assert validadores.MINUTOS_POR_FRANJA == disponibilidad.MINUTOS_POR_FRANJA
+    for invalida in ("", "9", "24:00", "10:60", "10:30:00", "ab:cd"):
+        assert _codigo(validadores.hora(invalida)) == "formato"
+
+
+def test_validar_valores_una_vez_por_valor_distinto():
+    llamadas = []
+
+    def contar(valor):
+        llamadas.append(valor)
+        return validadores.hora(valor)
+
+    errores = validadores.validar_valores(contar, ["08:00", "21:00", "08:00", "21:00"])
+    assert [_codigo(e) for e in errores] == [None, "fuera_de_horario", None, "fuera_de_horario"]
+    assert llamadas == ["08:00", "21:00"]
+
+
+def test_validar_registros():
+    reglas = {
+        "documento": functools.partial(validadores.cedula, registrados={"123456"}),
+        "telefono": validadores.telefono,
+        }
+    errores = validadores.validar_registros([
+        {"documento": "654321", "telefono": "3001234567"},
+        {"documento": "123456", "telefono": "12"},
+        {"telefono": "3001234567"},
+        ], reglas)
+    assert errores[0] == {}
+    assert {c: e["codigo"] for c, e in errores[1].items()} == {
+        "documento": "duplicado", "telefono": "formato"}
+    assert list(errores[2]) == ["documento"]
@@ -1,5 +1,6 @@
 import builtins
 
+from Modelo import paciente
 from Validaciones import validar_campos
 
 
@@ -46,11 +47,14 @@ def test_validar_telefono(monkeypatch):
 # VALIDAR CÉDULA (sin duplicado)
 # ===========================================================
 def test_validar_cedula_json(tmp_path, monkeypatch):
-    filepath = tmp_path / "personas.json"
-    filepath.write_text("[]", encoding="utf-8")
+    filepath = str(tmp_path / "pacientes.json")
+    paciente.crear_paciente(filepath, "C.C", 123456, "Ana", "Ruiz", "Calle 1", 3001234567)
 
-    monkeypatch.setattr(validar_campos.Prompt, "ask", lambda *a, **k: "123456")
-    assert validar_campos.validar_cedula("Cédula", str(filepath)) == "123456"
+    # La primera cédula ya está registrada; se vuelve a pedir.
+    respuestas = iter(["123456", "654321"])
+    monkeypatch.setattr(validar_campos.Prompt, "ask", lambda *a, **k: next(respuestas))
+    registrados = paciente.documentos_registrados(filepath)
+    assert validar_campos.validar_cedula("Cédula", registrados) == "654321"
 
 
 # ===========================================================
@@ -63,7 +67,7 @@ def test_validar_hora_valida(monkeypatch):
 
 
 def test_validar_hora_invalida(monkeypatch):
-    # Responde primero "20:00" (fuera de rango), luego "07:15"
-    respuestas = iter(["20:00", "07:15"])
+    # Responde "20:00" (fuera de rango), "07:15" (fuera de franja) y "07:30"
+    respuestas = iter(["20:00", "07:15", "07:30"])
     monkeypatch.setattr(builtins, "input", lambda *a, **k: next(respuestas))
-    assert validar_campos.validar_hora("hora") == "07:15"
+    assert validar_campos.validar_hora("hora") == "07:30"
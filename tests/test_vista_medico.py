@@ -28,6 +28,8 @@ def archivo_csv(tmp_path):
 @pytest.mark.parametrize("opcion, esperado", [
     (0, "medicos.csv"),
     (1, "medicos.json"),
+    (2, "medicos.db"),
+    (3, "medicos.jsonl"),
 ])
 def test_elegir_almacenamiento(monkeypatch, opcion, esperado):
     """Debe retornar la ruta del archivo correcto"""
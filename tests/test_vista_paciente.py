@@ -37,6 +37,8 @@ def test_solicitar_tipo_documento(monkeypatch):
 @pytest.mark.parametrize("opcion, esperado", [
     (0, "pacientes.csv"),
     (1, "pacientes.json"),
+    (2, "pacientes.db"),
+    (3, "pacientes.jsonl"),
 ])
 def test_elegir_almacenamiento(monkeypatch, opcion, esperado):
     """Debe retornar la ruta del archivo según selección"""
@@ -128,3 +130,23 @@ def test_menu_eliminar_paciente_cancelado(mock_paciente, archivo_csv, monkeypatc
     vista_paciente.menu_eliminar_paciente(str(archivo_csv))
     mock_paciente.buscar_paciente_por_documento.assert_called_once()
     mock_paciente.eliminar_paciente.assert_not_called()
+
+
+def test_main_vista_pacientes_avisa_archivo_danado(monkeypatch, tmp_path, capsys):
+    """Un JSON dañado se informa en pantalla y no se modifica."""
+    archivo = tmp_path / "pacientes.json"
+    archivo.write_text('[{"id": "1", "documento": "123456"', encoding="utf-8")
+    selecciones = iter([0, 4])
+    monkeypatch.setattr(vista_paciente, "limpiar", lambda: None)
+    monkeypatch.setattr(vista_paciente, "elegir_almacenamiento", lambda: str(archivo))
+    monkeypatch.setattr(vista_paciente, "selector_interactivo", lambda *a: next(selecciones))
+    monkeypatch.setattr(vista_paciente, "solicitar_tipo_documento", lambda: "C.C")
+    monkeypatch.setattr(
+        vista_paciente.validar_campos, "validar_cedula",
+        lambda etiqueta, registrados: "654321" if "654321" not in registrados else None)
+    monkeypatch.setattr(builtins, "input", lambda *a, **kw: "")
+
+    vista_paciente.main_vista_pacientes()
+
+    assert "Archivo de datos dañado" in capsys.readouterr().out
+    assert archivo.read_text(encoding="utf-8") == '[{"id": "1", "documento": "123456"'
@@ -54,7 +54,9 @@ def test_cargar_y_eliminar_cita(tmp_path):
 
     # Cargar citas combinadas
     cargadas = vista_principal.cargar_citas(str(ruta_base))
-    assert len(cargadas) == 2  # json + csv
+    # El mismo id en JSON y CSV se muestra una sola vez (gana JSON)
+    assert len(cargadas) == 1
+    assert cargadas[0]["_source"] == "json"
     assert all("fecha" in c for c in cargadas)
 
     # Eliminar la cita
@@ -67,3 +69,41 @@ def test_cargar_json_inexistente(tmp_path):
     """Debe devolver lista vacía si el archivo no existe."""
     ruta = tmp_path / "no_existe.json"
     assert vista_principal.cargar_json(ruta) == []
+
+
+def test_cargar_citas_mes_con_carpeta_mensual(tmp_path):
+    """Las citas del mes salen del segmento mensual y de los archivos planos."""
+    from Controlador import gestor_datos_citas
+
+    ruta_base = str(tmp_path / "citas")
+    gestor_datos_citas.guardar_datos(ruta_base + "/", [
+        {"id": "1", "fecha": "2025-11-06", "hora": "10:00", "estado": "pendiente"},
+        {"id": "2", "fecha": "2025-12-01", "hora": "10:00", "estado": "pendiente"},
+    ])
+    vista_principal.guardar_json(ruta_base + ".json", [
+        {"id": "3", "fecha": "06/11/2025", "hora": "11:00", "estado": "pendiente"},
+    ])
+
+    citas = vista_principal.cargar_citas_mes(2025, 11, ruta_base)
+    assert sorted((c["id"], c["_source"]) for c in citas) == [("1", "mensual"), ("3", "json")]
+
+    resultado = vista_principal.eliminar_cita_por_id("2", ruta_base)
+    assert resultado["mensual"] is True
+    assert len(vista_principal.cargar_citas(ruta_base)) == 2
+
+
+def test_resumen_calendario_fusiona_formatos(tmp_path):
+    """El resumen del calendario cuenta una vez la cita que está en JSON y en CSV."""
+    ruta_base = tmp_path / "citas"
+    citas = [
+        {"id": "1", "documento_paciente": "123", "documento_medico": "456", "fecha": "2025-11-06", "hora": "10:00", "motivo": "Dolor", "estado": "pendiente"}
+    ]
+    vista_principal.guardar_json(ruta_base.with_suffix(".json"), citas)
+    vista_principal.guardar_citas_csv(ruta_base.with_suffix(".csv"), citas)
+
+    resumen, formatos = vista_principal.resumen_calendario(2025, 11, str(ruta_base))
+    assert resumen["total"] == 1
+    assert resumen["dias"] == {6: 1}
+    assert formatos == ["csv", "json"]
+    assert resumen["total"] == len(vista_principal.cargar_citas_mes(2025, 11, str(ruta_base)))
+    assert vista_principal.resumen_calendario(2025, 10, str(ruta_base))[0]["total"] == 0